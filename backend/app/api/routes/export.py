@@ -0,0 +1,90 @@
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+import re
+from typing import List
+from app.services.session_store import session_store
+from app.services.calendar_export import (
+    ICSWriter, iter_ics, iter_csv, iter_sessions, parse_sections,
+    EXPORT_MAX_SESSIONS, EXPORT_SCHEDULE_WEEKS
+)
+from app.models.syllabus import BulkExportRequest
+
+router = APIRouter()
+
+# format -> media type
+EXPORT_FORMATS = {
+    "ics": "text/calendar",
+    "csv": "text/csv",
+}
+
+def _export_options(format: str, sections: List[str] | None, schedule_weeks: int | None) -> tuple:
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported format. Use one of: {', '.join(EXPORT_FORMATS)}")
+    try:
+        sections = parse_sections(sections)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    schedule_weeks = EXPORT_SCHEDULE_WEEKS if schedule_weeks is None else schedule_weeks
+    if not 1 <= schedule_weeks <= 52:
+        raise HTTPException(status_code=400, detail="schedule_weeks must be between 1 and 52")
+    return sections, schedule_weeks
+
+def _export_response(session_ids: List[str], format: str, sections: tuple, schedule_weeks: int,
+                     name: str) -> StreamingResponse:
+    """
+    Stream the export; sessions are loaded and written one at a time, so
+    memory does not grow with the number of sessions
+    """
+    sessions = iter_sessions(session_ids, session_store.get, sections)
+    if format == "ics":
+        body = iter_ics(sessions, ICSWriter(name, schedule_weeks))
+    else:
+        body = iter_csv(sessions)
+    filename = re.sub(r'[^A-Za-z0-9._-]+', "_", name).strip("_") or "syllabus_export"
+    return StreamingResponse(
+        body,
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{format}"'}
+    )
+
+@router.get("/export/{session_id}")
+async def export_session(
+    session_id: str,
+    format: str = "ics",
+    sections: List[str] = Query(None),
+    schedule_weeks: int = None
+):
+    """
+    Export a session's assignments, schedule and important dates as
+    iCalendar (``format=ics``) or CSV (``format=csv``). ``sections`` limits
+    the export; ``schedule_weeks`` is how many weeks class meetings repeat.
+    """
+    sections, schedule_weeks = _export_options(format, sections, schedule_weeks)
+    session_data = session_store.get(session_id)
+    if session_data is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    course_info = session_data["parsed_data"].get("course_info") or {}
+    name = course_info.get("course_code") or course_info.get("course_name") or session_id
+    return _export_response([session_id], format, sections, schedule_weeks, name)
+
+@router.post("/export")
+async def export_sessions(request: BulkExportRequest):
+    """
+    Export many sessions as one iCalendar or CSV stream, in the order given.
+    Every session must exist when the request arrives; one that expires
+    while the export is being written is left out.
+    """
+    sections, schedule_weeks = _export_options(request.format, request.sections, request.schedule_weeks)
+    # Duplicates are exported once
+    session_ids = list(dict.fromkeys(request.session_ids))
+    if not session_ids:
+        raise HTTPException(status_code=400, detail="No session_ids given")
+    if len(session_ids) > EXPORT_MAX_SESSIONS:
+        raise HTTPException(status_code=400, detail=f"At most {EXPORT_MAX_SESSIONS} sessions per export")
+
+    missing = [session_id for session_id in session_ids if not session_store.exists(session_id)]
+    if missing:
+        raise HTTPException(status_code=404, detail={"message": "Sessions not found", "session_ids": missing})
+
+    return _export_response(session_ids, request.format, sections, schedule_weeks, "syllabus_export")
@@ -1,60 +1,248 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, Form
-from fastapi.responses import JSONResponse
-from pdf2image import convert_from_bytes
-from io import BytesIO
+from fastapi import APIRouter, UploadFile, File, HTTPException, Form, Request
+from fastapi.responses import ORJSONResponse, StreamingResponse, FileResponse, Response
+from starlette.concurrency import run_in_threadpool
 import base64
+import orjson
 import os
+import re
 import uuid
 from datetime import datetime
+from app.api.uploads import save_pdf_upload, SavedUpload
+from app.services.metrics import RENDER_PAGES, RENDER_BYTES, request_stages
+from app.services.image_renderer import (
+    RenderOptions, count_pages, page_range, FORMATS,
+    DEFAULT_DPI, DEFAULT_RENDER_THREADS
+)
+from app.services.render_cache import render_cache, CACHE_NAME_RE
 
 router = APIRouter()
 
+# Rendered pages never change once cached, so clients may keep them
+RENDERED_CACHE_CONTROL = "public, max-age=31536000, immutable"
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+MIME_TYPES = {ext: mime for _, mime, ext in FORMATS.values()}
+
+def _render_options(dpi: int, format: str, quality: int, max_dimension: int | None,
+                    grayscale: bool) -> RenderOptions:
+    try:
+        return RenderOptions(dpi=dpi, fmt=format, quality=quality,
+                             max_dimension=max_dimension, grayscale=grayscale)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+async def _prepare_conversion(file: UploadFile, first_page: int | None, last_page: int | None):
+    """
+    Save the upload and resolve the requested page range
+    """
+    upload = await save_pdf_upload(file)
+    try:
+        total_pages = render_cache.page_count(upload.sha256)
+        if total_pages is None:
+            total_pages = await run_in_threadpool(count_pages, upload.path)
+            render_cache.set_page_count(upload.sha256, total_pages)
+        pages = page_range(total_pages, first_page, last_page)
+    except ValueError as e:
+        upload.discard()
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        upload.discard()
+        raise HTTPException(status_code=500, detail=str(e))
+    RENDER_PAGES.observe(len(pages))
+    RENDER_BYTES.observe(upload.size)
+    return upload, total_pages, pages
+
+def _page_entry(request: Request, page_number: int, name: str, cached: bool,
+                save_to_folder: bool, inline: bool) -> dict:
+    """
+    Response entry for one page: its URL in the render cache, and the
+    encoded image itself when ``inline`` is set
+    """
+    path = render_cache.path(name)
+    entry = {
+        "page": page_number,
+        "url": request.app.url_path_for("get_rendered_page", name=name),
+        "cached": cached,
+        "file_path": path if save_to_folder else None
+    }
+    if inline:
+        with open(path, "rb") as image_file:
+            img_str = base64.b64encode(image_file.read()).decode("utf-8")
+        entry["data"] = f"data:{MIME_TYPES[name.rsplit('.', 1)[1]]};base64,{img_str}"
+    return entry
+
 @router.post("/convert-pdf-to-images")
 async def convert_pdf(
+    request: Request,
     file: UploadFile = File(...),
-    save_to_folder: bool = Form(False)
+    save_to_folder: bool = Form(False),
+    dpi: int = Form(DEFAULT_DPI),
+    format: str = Form("png"),
+    quality: int = Form(85),
+    max_dimension: int = Form(None),
+    grayscale: bool = Form(False),
+    first_page: int = Form(None),
+    last_page: int = Form(None),
+    thread_count: int = Form(DEFAULT_RENDER_THREADS),
+    inline: bool = Form(False)
 ):
-    if not file.filename.endswith(".pdf"):
-        raise HTTPException(status_code=400, detail="Only PDF files are supported.")
+    """
+    Convert PDF pages to images. DPI, format (png/jpeg/webp), quality,
+    max_dimension (longest side in pixels), grayscale and a 1-based page
+    range are configurable; pages render on up to thread_count threads.
     
+    Pages are served from the render cache: each entry has the page's
+    ``url`` (and with ``inline``, the base64 image as before). Pages already
+    rendered with the same options are not rendered again.
+    """
+    options = _render_options(dpi, format, quality, max_dimension, grayscale)
+    upload, total_pages, pages = await _prepare_conversion(file, first_page, last_page)
+
     try:
-        pdf_bytes = await file.read()
-        images = convert_from_bytes(pdf_bytes)
-        result = []
-        
-        # Create unique folder for this conversion
         conversion_id = str(uuid.uuid4())
-        folder_path = f"converted_images/{conversion_id}"
-        
-        if save_to_folder:
-            os.makedirs(folder_path, exist_ok=True)
-        
-        for i, image in enumerate(images):
-            buffered = BytesIO()
-            image.save(buffered, format="PNG")
-            img_str = base64.b64encode(buffered.getvalue()).decode("utf-8")
-            
-            # Save to file if requested
-            if save_to_folder:
-                image_path = f"{folder_path}/page_{i+1}.png"
-                image.save(image_path, "PNG")
-            
-            result.append({
-                "page": i + 1,
-                "data": f"data:image/png;base64,{img_str}",
-                "file_path": f"{folder_path}/page_{i+1}.png" if save_to_folder else None
-            })
-
-        return JSONResponse(content={
+        stages = request_stages()
+
+        def render_all():
+            return [
+                _page_entry(request, page_number, name, cached, save_to_folder, inline)
+                for page_number, name, cached in render_cache.iter_pages(
+                    upload.path, upload.sha256, pages, options, thread_count, stages)
+            ]
+
+        result = await run_in_threadpool(render_all)
+
+        return ORJSONResponse(content={
             "conversion_id": conversion_id,
-            "folder_path": folder_path if save_to_folder else None,
-            "total_pages": len(images),
+            "folder_path": render_cache.cache_dir if save_to_folder else None,
+            "total_pages": total_pages,
             "images_folder": {
                 "folder_name": f"syllabus_images_{conversion_id}",
-                "total_pages": len(images),
+                "total_pages": total_pages,
                 "pages": result
             }
         })
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        upload.discard()
+
+def _stream_pages(request: Request, upload: SavedUpload, total_pages: int, pages: range,
+                  options: RenderOptions, thread_count: int, conversion_id: str,
+                  save_to_folder: bool, inline: bool):
+    """
+    Render and emit one NDJSON line per page as soon as it is ready
+    """
+    try:
+        yield orjson.dumps({
+            "conversion_id": conversion_id,
+            "total_pages": total_pages,
+            "first_page": pages.start,
+            "last_page": pages.stop - 1
+        }) + b"\n"
+
+        for page_number, name, cached in render_cache.iter_pages(upload.path, upload.sha256, pages,
+                                                                 options, thread_count):
+            yield orjson.dumps(_page_entry(request, page_number, name, cached, save_to_folder, inline)) + b"\n"
+
+        yield orjson.dumps({"done": True, "total_pages": total_pages}) + b"\n"
+
+    except Exception as e:
+        # Headers are already sent, so report failures in-band
+        yield orjson.dumps({"error": str(e)}) + b"\n"
+    finally:
+        upload.discard()
+
+@router.post("/convert-pdf-to-images/stream")
+async def convert_pdf_stream(
+    request: Request,
+    file: UploadFile = File(...),
+    save_to_folder: bool = Form(False),
+    dpi: int = Form(DEFAULT_DPI),
+    format: str = Form("png"),
+    quality: int = Form(85),
+    max_dimension: int = Form(None),
+    grayscale: bool = Form(False),
+    first_page: int = Form(None),
+    last_page: int = Form(None),
+    thread_count: int = Form(DEFAULT_RENDER_THREADS),
+    inline: bool = Form(False)
+):
+    """
+    Convert a PDF to images, streamed as NDJSON: a header line with the
+    page count, one line per page as it is rendered, then a final line.
+    Accepts the same rendering options as /convert-pdf-to-images.
+    """
+    options = _render_options(dpi, format, quality, max_dimension, grayscale)
+    upload, total_pages, pages = await _prepare_conversion(file, first_page, last_page)
+
+    conversion_id = str(uuid.uuid4())
+
+    return StreamingResponse(
+        _stream_pages(request, upload, total_pages, pages, options, thread_count, conversion_id,
+                      save_to_folder, inline),
+        media_type="application/x-ndjson"
+    )
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+def _byte_range(range_header: str, size: int) -> tuple[int, int] | None:
+    """
+    (start, end inclusive) of a single "bytes=" range; None when the header
+    should be ignored (multiple ranges, other units). Raises ValueError for
+    an unsatisfiable range.
+    """
+    match = RANGE_RE.match(range_header.strip())
+    if not match or not any(match.groups()):
+        return None
+    first, last = match.groups()
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            raise ValueError("Empty suffix range")
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        raise ValueError("Range not satisfiable")
+    return start, end
+
+@router.get("/rendered/{name}")
+async def get_rendered_page(name: str, request: Request):
+    """
+    Serve a rendered page from the render cache. Names are content
+    addresses, so the name is the ETag and responses may be cached forever;
+    supports If-None-Match (304) and single byte ranges (206).
+    """
+    match = CACHE_NAME_RE.match(name)
+    path = render_cache.get(name) if match else None
+    if path is None:
+        raise HTTPException(status_code=404, detail="Rendered page not found")
+
+    etag = f'"{match.group(1)}"'
+    headers = {"ETag": etag, "Cache-Control": RENDERED_CACHE_CONTROL, "Accept-Ranges": "bytes"}
+    media_type = MIME_TYPES[match.group(2)]
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (not if_range or if_range.strip() == etag):
+        size = os.path.getsize(path)
+        try:
+            byte_range = _byte_range(range_header, size)
+        except ValueError:
+            return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+        if byte_range is not None:
+            start, end = byte_range
+            with open(path, "rb") as image_file:
+                image_file.seek(start)
+                content = image_file.read(end - start + 1)
+            headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+            return Response(content, status_code=206, media_type=media_type, headers=headers)
+
+    return FileResponse(path, media_type=media_type, headers=headers)
@@ -0,0 +1,23 @@
+from fastapi import APIRouter
+from app.services.parse_pool import parse_pool
+from app.services.parse_cache import parse_cache
+from app.services.render_cache import render_cache
+from app.services.session_store import session_store
+from app.services.jobs import job_manager
+from app.services.warmup import startup_report
+
+router = APIRouter()
+
+@router.get("/stats")
+async def get_stats():
+    """
+    Runtime statistics for capacity planning
+    """
+    return {
+        "parse_pool": parse_pool.stats(),
+        "parse_cache": parse_cache.stats(),
+        "render_cache": render_cache.stats(),
+        "sessions": session_store.stats(),
+        "jobs": job_manager.stats(),
+        "startup": startup_report.snapshot()
+    }
@@ -1,72 +1,179 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException, Form
-from fastapi.responses import JSONResponse, FileResponse
+from starlette.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, FileResponse, StreamingResponse
+import asyncio
+import orjson
 import uuid
-import tempfile
 import os
+import time
 from datetime import datetime
-from app.services.pdf_parser import PDFParser
-from app.models.syllabus import SyllabusData
+from typing import Callable, List
+from app.api.uploads import (
+    save_pdf_upload, save_zip_upload, is_zip_upload, extract_zip_pdfs, SavedUpload, MAX_BATCH_FILES
+)
+from app.services.parse_pool import parse_pool, PoolBusyError
+from app.services.parse_cache import parse_cache, make_cache_key
+from app.services.session_store import session_store
+from app.services.jobs import job_manager, Job, JobsBusyError, DONE, FAILED
+from app.services.pdf_parser import EARLY_STOP_PATIENCE, PageRangeError
+from app.services.date_resolver import with_semester_start
+from app.services.metrics import request_stages, observe_parse, add_stage
+from app.models.syllabus import inline_descriptions
 
 router = APIRouter()
 
-# In-memory storage for demo (use database in production)
-sessions = {}
+# Seconds between keep-alive comments on idle job event streams
+JOB_EVENTS_KEEPALIVE = 15
+
+def _validate_semester_start_date(semester_start_date: str | None):
+    if semester_start_date:
+        try:
+            datetime.strptime(semester_start_date, "%Y-%m-%d")
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+
+def _page_limits(first_page: int | None, last_page: int | None, max_pages: int | None,
+                 adaptive: bool, patience: int | None) -> dict | None:
+    """
+    Validate the page range / cap / early-stop form fields into parse_pdf
+    keyword arguments (None when nothing is limited)
+    """
+    if patience is not None and not adaptive:
+        raise HTTPException(status_code=400, detail="patience requires adaptive=true")
+    limits = {
+        "first_page": first_page,
+        "last_page": last_page,
+        "max_pages": max_pages,
+        "early_stop_patience": (EARLY_STOP_PATIENCE if patience is None else patience) if adaptive else None
+    }
+    for name, value in limits.items():
+        if value is not None and value < 1:
+            raise HTTPException(status_code=400, detail=f"{name} must be at least 1")
+    if first_page and last_page and last_page < first_page:
+        raise HTTPException(status_code=400, detail="last_page must not be before first_page")
+    limits = {name: value for name, value in limits.items() if value is not None}
+    return limits or None
+
+def _page_info(result: dict) -> dict:
+    """
+    Pages actually read, out of the document's total, and how many of them
+    came from the page cache rather than being extracted
+    """
+    stats = result.get("stats", {})
+    return {
+        "pages_read": stats.get("pages"),
+        "total_pages": stats.get("page_count", stats.get("pages")),
+        "stopped_early": stats.get("stopped_early", False),
+        "pages_reused": stats.get("pages_reused", 0),
+        "pages_extracted": (stats.get("pages") or 0) - stats.get("pages_reused", 0)
+    }
+
+def _store_session(session_id: str, upload: SavedUpload, filename: str | None,
+                   parsed_data: dict, semester_start_date: str | None, page_info: dict | None = None):
+    """
+    Store a parsed upload; the store owns the temp file from here on and
+    deletes it when the session goes
+    """
+    session_store.put(session_id, {
+        "file_path": upload.path,
+        "parsed_data": parsed_data,
+        "filename": filename or "syllabus.pdf",
+        "semester_start_date": semester_start_date,
+        "raw_pdf_path": upload.path,  # Keep reference to raw PDF
+        "pdf_sha256": upload.sha256,
+        "page_info": page_info
+    })
+
+async def _parse_cached(file_path: str, content_hash: str, semester_start_date: str | None = None,
+                        sections: tuple[str, ...] | None = None,
+                        progress: Callable[[int, int], None] | None = None,
+                        wait: bool = False,
+                        page_limits: dict | None = None):
+    """
+    Parse a saved upload, reusing the cached result for identical PDF bytes
+    (and the same sections and page limits). With ``wait``, a full parser
+    pool is waited out instead of raising PoolBusyError.
+    """
+    extra = () if sections is None else (",".join(sorted(sections)),)
+    if page_limits:
+        extra += ("pages:" + orjson.dumps(page_limits, option=orjson.OPT_SORT_KEYS).decode(),)
+    key = make_cache_key(content_hash, semester_start_date, *extra)
+    stages = request_stages()
+    
+    async def parse():
+        result = await parse_pool.parse(file_path, semester_start_date, sections, progress, wait, page_limits)
+        # Only fresh parses feed the parser histograms, not cache hits
+        observe_parse(result["stats"], stages)
+        return result
+    
+    start = time.perf_counter()
+    try:
+        return await parse_cache.get_or_compute(key, parse)
+    finally:
+        # Wall time including any wait for a pool worker
+        add_stage(stages, "parse", time.perf_counter() - start)
 
 @router.post("/upload-syllabus")
 async def upload_syllabus(
     file: UploadFile = File(...),
-    semester_start_date: str = Form(None)
+    semester_start_date: str = Form(None),
+    first_page: int = Form(None),
+    last_page: int = Form(None),
+    max_pages: int = Form(None),
+    adaptive: bool = Form(False),
+    patience: int = Form(None)
 ):
     """
-    Upload and parse a syllabus PDF file with semester start date
+    Upload and parse a syllabus PDF file with semester start date.
+    Parsing can be limited to a 1-based page range and/or a page cap; with
+    ``adaptive`` it stops once every section has content and ``patience``
+    more pages add nothing new.
     """
     try:
-        # Validate file type
-        if not file.filename or not file.filename.lower().endswith('.pdf'):
-            raise HTTPException(status_code=400, detail="Only PDF files are allowed")
-        
-        # Validate file size (max 10MB)
-        if file.size and file.size > 10 * 1024 * 1024:
-            raise HTTPException(status_code=400, detail="File size too large. Maximum 10MB allowed")
-        
-        # Validate semester start date
-        if semester_start_date:
-            try:
-                datetime.strptime(semester_start_date, "%Y-%m-%d")
-            except ValueError:
-                raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+        # Validate semester start date and page limits
+        _validate_semester_start_date(semester_start_date)
+        page_limits = _page_limits(first_page, last_page, max_pages, adaptive, patience)
         
         # Create session ID
         session_id = str(uuid.uuid4())
         
-        # Save file temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
-            content = await file.read()
-            temp_file.write(content)
-            temp_file_path = temp_file.name
+        # Stream the upload to a temp file (validates PDF header and size)
+        upload = await save_pdf_upload(file)
+        temp_file_path = upload.path
         
         try:
-            # Parse PDF with semester start date context
-            parser = PDFParser()
-            parsed_data = parser.parse_pdf(temp_file_path, semester_start_date)
+            # Parse PDF with semester start date context (cached by content hash)
+            result = await _parse_cached(temp_file_path, upload.sha256, semester_start_date,
+                                         page_limits=page_limits)
+            parsed_data = result["parsed_data"]
+            page_info = _page_info(result)
             
             # Store session data including raw PDF path
-            sessions[session_id] = {
-                "file_path": temp_file_path,
-                "parsed_data": parsed_data,
-                "filename": file.filename,
-                "semester_start_date": semester_start_date,
-                "raw_pdf_path": temp_file_path  # Keep reference to raw PDF
-            }
+            _store_session(session_id, upload, file.filename, parsed_data, semester_start_date, page_info)
             
-            return JSONResponse(content={
+            return ORJSONResponse(content={
                 "success": True,
                 "session_id": session_id,
                 "message": "Syllabus parsed successfully",
                 "data": parsed_data,
-                "semester_start_date": semester_start_date
+                "semester_start_date": semester_start_date,
+                **page_info
             })
             
+        except PoolBusyError as e:
+            # Parser pool is saturated; tell the client when to retry
+            if os.path.exists(temp_file_path):
+                os.unlink(temp_file_path)
+            raise HTTPException(
+                status_code=503,
+                detail="Parser is busy. Please retry shortly",
+                headers={"Retry-After": str(e.retry_after)}
+            )
+        except PageRangeError as e:
+            # Same answer the page image endpoints give for pages not in the document
+            if os.path.exists(temp_file_path):
+                os.unlink(temp_file_path)
+            raise HTTPException(status_code=400, detail=str(e))
         except Exception as e:
             # Clean up temp file on error
             if os.path.exists(temp_file_path):
@@ -78,50 +185,300 @@ async def upload_syllabus(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
 
+async def _run_parse_job(job: Job, upload: SavedUpload, filename: str | None,
+                         semester_start_date: str | None, page_limits: dict | None = None):
+    """
+    Parse a job's upload in the background and store the result in the
+    session with the job's id
+    """
+    try:
+        # Jobs wait for a free worker instead of failing
+        result = await _parse_cached(upload.path, upload.sha256, semester_start_date,
+                                     progress=job.set_progress, wait=True, page_limits=page_limits)
+        page_info = _page_info(result)
+        _store_session(job.job_id, upload, filename, result["parsed_data"], semester_start_date, page_info)
+    except BaseException:
+        upload.discard()
+        raise
+    job.finish(total_pages=page_info["pages_read"])
+
+def _job_payload(job_id: str, job: Job | None) -> dict | None:
+    """
+    Job status, plus the parsed data once it is done. Jobs started by
+    another worker process are only visible once their session exists.
+    """
+    if job is None:
+        session_data = session_store.get(job_id)
+        if session_data is None:
+            return None
+        payload = {"job_id": job_id, "status": DONE, "pages_done": None, "total_pages": None, "error": None}
+    else:
+        payload = job.snapshot()
+        if payload["status"] != DONE:
+            return payload
+        session_data = session_store.get(job_id)
+        if session_data is None:
+            payload["error"] = "Session expired"
+            return payload
+    
+    payload["session_id"] = job_id
+    payload["data"] = session_data["parsed_data"]
+    payload["semester_start_date"] = session_data.get("semester_start_date")
+    payload.update(session_data.get("page_info") or {})
+    return payload
+
+@router.post("/jobs")
+async def create_parse_job(
+    file: UploadFile = File(...),
+    semester_start_date: str = Form(None),
+    first_page: int = Form(None),
+    last_page: int = Form(None),
+    max_pages: int = Form(None),
+    adaptive: bool = Form(False),
+    patience: int = Form(None)
+):
+    """
+    Upload a syllabus and parse it in the background. Returns a job id at
+    once; poll /api/jobs/{job_id} or follow /api/jobs/{job_id}/events. The
+    result is stored as the session with the same id.
+    """
+    _validate_semester_start_date(semester_start_date)
+    page_limits = _page_limits(first_page, last_page, max_pages, adaptive, patience)
+    job_id = str(uuid.uuid4())
+    upload = await save_pdf_upload(file)
+    
+    try:
+        job_manager.start(job_id, lambda job: _run_parse_job(job, upload, file.filename,
+                                                             semester_start_date, page_limits))
+    except JobsBusyError:
+        upload.discard()
+        raise HTTPException(
+            status_code=503,
+            detail="Too many pending jobs. Please retry shortly",
+            headers={"Retry-After": str(parse_pool.retry_after)}
+        )
+    
+    return ORJSONResponse(status_code=202, content={
+        "success": True,
+        "job_id": job_id,
+        "session_id": job_id,
+        "status_url": f"/api/jobs/{job_id}",
+        "events_url": f"/api/jobs/{job_id}/events"
+    })
+
+@router.get("/jobs/{job_id}")
+async def get_parse_job(job_id: str):
+    """
+    Status and page progress of a parse job, with the parsed data once done
+    """
+    payload = _job_payload(job_id, job_manager.get(job_id))
+    if payload is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return payload
+
+async def _job_events(job_id: str, job: Job | None):
+    """
+    Server-sent events: a "progress" event per update, then a final
+    "done" or "failed" event carrying the same body as GET /api/jobs/{id}
+    """
+    while True:
+        seen_version = job.version if job is not None else 0
+        payload = _job_payload(job_id, job)
+        if payload is None:
+            # Finished in another process and its session expired since
+            # the route checked for it
+            payload = {"job_id": job_id, "status": FAILED, "pages_done": None, "total_pages": None,
+                       "error": "Session expired"}
+        event = payload["status"] if payload["status"] in ("done", "failed") else "progress"
+        yield b"event: " + event.encode() + b"\ndata: " + orjson.dumps(payload) + b"\n\n"
+        if event != "progress":
+            return
+        
+        while not await job.wait_for_change(seen_version, JOB_EVENTS_KEEPALIVE):
+            # Comment line so proxies keep the idle connection open
+            yield b": keepalive\n\n"
+
+@router.get("/jobs/{job_id}/events")
+async def stream_parse_job(job_id: str):
+    """
+    Follow a parse job as a server-sent event stream
+    """
+    job = job_manager.get(job_id)
+    if job is None and session_store.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    return StreamingResponse(
+        _job_events(job_id, job),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+class _BatchFile:
+    """
+    One file of a batch upload: its saved PDF, or why it was rejected
+    """
+    __slots__ = ("index", "filename", "upload", "error", "stored")
+
+    def __init__(self, index: int, filename: str, upload: SavedUpload | None = None,
+                 error: str | None = None):
+        self.index = index
+        self.filename = filename
+        self.upload = upload
+        self.error = error
+        self.stored = False
+
+async def _save_batch_files(files: List[UploadFile]) -> List[_BatchFile]:
+    """
+    Save every PDF of a batch (unpacking zips) to temp files. Bad files
+    become error entries instead of failing the whole batch.
+    """
+    batch = []
+    try:
+        for file in files:
+            filename = file.filename or "syllabus.pdf"
+            if is_zip_upload(file):
+                archive = await save_zip_upload(file)
+                try:
+                    members = await run_in_threadpool(extract_zip_pdfs, archive.path)
+                except ValueError as e:
+                    raise HTTPException(status_code=400, detail=f"{filename}: {e}")
+                finally:
+                    archive.discard()
+                for member in members:
+                    batch.append(_BatchFile(len(batch), member.name, member.upload, member.error))
+            else:
+                try:
+                    batch.append(_BatchFile(len(batch), filename, await save_pdf_upload(file)))
+                except HTTPException as e:
+                    if e.status_code not in (400, 413):
+                        raise
+                    batch.append(_BatchFile(len(batch), filename, error=e.detail))
+            if len(batch) > MAX_BATCH_FILES:
+                raise HTTPException(status_code=413, detail=f"Too many files. Maximum {MAX_BATCH_FILES} allowed")
+    except BaseException:
+        _discard_batch(batch)
+        raise
+    return batch
+
+def _discard_batch(batch: List[_BatchFile]):
+    for item in batch:
+        if item.upload is not None and not item.stored:
+            item.upload.discard()
+
+def _batch_line(payload: dict) -> bytes:
+    return orjson.dumps(payload) + b"\n"
+
+async def _stream_batch(batch: List[_BatchFile], semester_start_date: str | None):
+    """
+    Parse each distinct PDF once, concurrently, and emit one NDJSON line
+    per file (duplicates included) as its parse finishes
+    """
+    groups: dict[str, List[_BatchFile]] = {}
+    for item in batch:
+        if item.upload is not None:
+            groups.setdefault(item.upload.sha256, []).append(item)
+    
+    async def parse_group(content_hash: str):
+        first = groups[content_hash][0]
+        try:
+            result = await _parse_cached(first.upload.path, content_hash, semester_start_date, wait=True)
+            return content_hash, result, None
+        except Exception as e:
+            return content_hash, None, f"Error parsing PDF: {str(e)}"
+    
+    tasks = [asyncio.create_task(parse_group(content_hash)) for content_hash in groups]
+    succeeded = failed = 0
+    try:
+        yield _batch_line({"total_files": len(batch), "unique_files": len(groups)})
+        
+        for item in batch:
+            if item.error is not None:
+                failed += 1
+                yield _batch_line({"index": item.index, "filename": item.filename,
+                                   "success": False, "error": item.error})
+        
+        for next_done in asyncio.as_completed(tasks):
+            content_hash, result, error = await next_done
+            items = groups[content_hash]
+            for item in items:
+                line = {"index": item.index, "filename": item.filename, "sha256": content_hash,
+                        "duplicate_of": items[0].index if item is not items[0] else None}
+                if error is None:
+                    session_id = str(uuid.uuid4())
+                    _store_session(session_id, item.upload, item.filename, result["parsed_data"],
+                                   semester_start_date, _page_info(result))
+                    item.stored = True
+                    succeeded += 1
+                    line.update({"success": True, "session_id": session_id, "data": result["parsed_data"]})
+                else:
+                    item.upload.discard()
+                    failed += 1
+                    line.update({"success": False, "error": error})
+                yield _batch_line(line)
+        
+        yield _batch_line({"done": True, "succeeded": succeeded, "failed": failed})
+    finally:
+        # Client went away or something failed: stop parsing, drop unstored files
+        for task in tasks:
+            task.cancel()
+        _discard_batch(batch)
+
+@router.post("/upload-syllabi")
+async def upload_syllabi(
+    files: List[UploadFile] = File(...),
+    semester_start_date: str = Form(None)
+):
+    """
+    Upload and parse many syllabus PDFs (or zips of PDFs) in one request.
+    Identical files are parsed once. Streams NDJSON: a header line, one
+    line per file with its own session id as soon as it is parsed, then a
+    summary line.
+    """
+    _validate_semester_start_date(semester_start_date)
+    batch = await _save_batch_files(files)
+    return StreamingResponse(_stream_batch(batch, semester_start_date), media_type="application/x-ndjson")
+
 @router.post("/extract-text")
 async def extract_text(file: UploadFile = File(...)):
     """
     Extract text from a PDF file
     """
     try:
-        # Validate file type
-        if not file.filename or not file.filename.lower().endswith('.pdf'):
-            raise HTTPException(status_code=400, detail="Only PDF files are allowed")
-        
-        # Validate file size (max 10MB)
-        if file.size and file.size > 10 * 1024 * 1024:
-            raise HTTPException(status_code=400, detail="File size too large. Maximum 10MB allowed")
-        
         # Create session ID
         session_id = str(uuid.uuid4())
         
-        # Save file temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
-            content = await file.read()
-            temp_file.write(content)
-            temp_file_path = temp_file.name
+        # Stream the upload to a temp file (validates PDF header and size)
+        upload = await save_pdf_upload(file)
+        temp_file_path = upload.path
         
         try:
-            # Extract text using the PDF parser
-            parser = PDFParser()
-            parsed_data = parser.parse_pdf(temp_file_path)
+            # Extract text only: no tables and no section extractors
+            result = await _parse_cached(temp_file_path, upload.sha256, sections=())
             
             # Get the raw text content
-            extracted_text = parser.text_content
+            extracted_text = result["text_content"]
             
-            return JSONResponse(content={
+            return ORJSONResponse(content={
                 "success": True,
                 "session_id": session_id,
-                "total_pages": len(parsed_data.get("raw_text", "").split("...")),
+                "total_pages": _page_info(result)["total_pages"],
                 "extracted_text": extracted_text,
                 "file_name": file.filename
             })
             
+        except PoolBusyError as e:
+            # Parser pool is saturated; tell the client when to retry
+            raise HTTPException(
+                status_code=503,
+                detail="Parser is busy. Please retry shortly",
+                headers={"Retry-After": str(e.retry_after)}
+            )
         except Exception as e:
-            # Clean up temp file on error
+            raise HTTPException(status_code=500, detail=f"Error extracting text: {str(e)}")
+        finally:
+            # No session keeps this upload, so always clean up the temp file
             if os.path.exists(temp_file_path):
                 os.unlink(temp_file_path)
-            raise HTTPException(status_code=500, detail=f"Error extracting text: {str(e)}")
             
     except HTTPException:
         raise
@@ -133,10 +490,10 @@ async def export_raw_pdf(session_id: str):
     """
     Export the raw PDF file for n8n automation
     """
-    if session_id not in sessions:
+    session_data = session_store.get(session_id)
+    if session_data is None:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    session_data = sessions[session_id]
     pdf_path = session_data.get("raw_pdf_path")
     filename = session_data.get("filename", "syllabus.pdf")
     
@@ -150,16 +507,50 @@ async def export_raw_pdf(session_id: str):
     )
 
 @router.get("/session/{session_id}")
-async def get_session_data(session_id: str):
+async def get_session_data(session_id: str, inline: bool = False):
+    """
+    Get parsed data for a session. Items reference their source line by
+    index into ``source_lines``; ``inline=true`` returns the older shape with
+    a ``description`` copy on every item instead.
+    """
+    session_data = session_store.get(session_id)
+    if session_data is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    
+    parsed_data = session_data["parsed_data"]
+    return {
+        "success": True,
+        "session_id": session_id,
+        "data": inline_descriptions(parsed_data) if inline else parsed_data,
+        "semester_start_date": session_data.get("semester_start_date")
+    }
+
+@router.patch("/session/{session_id}")
+async def update_session_semester_start(session_id: str, semester_start_date: str = Form(None)):
     """
-    Get parsed data for a session
+    Change a session's semester start date (empty clears it). Only the date
+    resolution is re-run, on the stored result, so the PDF is not parsed
+    again; the updated data is returned as GET /session/{id} would.
     """
-    if session_id not in sessions:
+    semester_start_date = semester_start_date or None
+    _validate_semester_start_date(semester_start_date)
+    session_data = session_store.get(session_id)
+    if session_data is None:
         raise HTTPException(status_code=404, detail="Session not found")
     
+    stages = request_stages()
+    start = time.perf_counter()
+    parsed_data = with_semester_start(session_data["parsed_data"], semester_start_date)
+    add_stage(stages, "resolve_dates", time.perf_counter() - start)
+    
+    session_store.put(session_id, {
+        **session_data,
+        "parsed_data": parsed_data,
+        "semester_start_date": semester_start_date
+    })
     return {
         "success": True,
         "session_id": session_id,
-        "data": sessions[session_id]["parsed_data"],
-        "semester_start_date": sessions[session_id].get("semester_start_date")
-    } 
\ No newline at end of file
+        "data": parsed_data,
+        "semester_start_date": semester_start_date
+    }
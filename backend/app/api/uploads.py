@@ -0,0 +1,246 @@
+import hashlib
+import os
+import tempfile
+import zipfile
+from typing import List, Optional
+from fastapi import HTTPException, UploadFile
+from fastapi.responses import ORJSONResponse
+
+# Upload limits
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Batch upload limits: PDFs per request and size of an uploaded zip
+MAX_BATCH_FILES = int(os.getenv("MAX_BATCH_FILES", "100"))
+MAX_ZIP_UPLOAD_BYTES = int(os.getenv("MAX_ZIP_UPLOAD_BYTES", str(100 * 1024 * 1024)))
+MAX_BATCH_REQUEST_BYTES = int(os.getenv(
+    "MAX_BATCH_REQUEST_BYTES", str(max(MAX_BATCH_FILES * MAX_UPLOAD_BYTES, MAX_ZIP_UPLOAD_BYTES))))
+
+# Room in a multipart body for boundaries, part headers and form fields
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+# Routes (by path suffix) taking many files per request
+BATCH_UPLOAD_PATHS = ("/upload-syllabi",)
+
+# PDF header; readers accept it anywhere in the first 1 KB
+PDF_MAGIC = b"%PDF"
+PDF_MAGIC_WINDOW = 1024
+ZIP_MAGIC = b"PK\x03\x04"
+ZIP_CONTENT_TYPES = ("application/zip", "application/x-zip-compressed")
+
+
+class SavedUpload:
+    """
+    An upload streamed to a temp file, with its size and SHA-256
+    """
+    __slots__ = ("path", "size", "sha256")
+
+    def __init__(self, path: str, size: int, sha256: str):
+        self.path = path
+        self.size = size
+        self.sha256 = sha256
+
+    def discard(self):
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+
+def _limit_detail(max_bytes: int) -> str:
+    if max_bytes >= 1024 * 1024:
+        return f"File size too large. Maximum {max_bytes // (1024 * 1024)}MB allowed"
+    return f"File size too large. Maximum {max_bytes} bytes allowed"
+
+
+async def save_pdf_upload(file: UploadFile, max_bytes: int = MAX_UPLOAD_BYTES) -> SavedUpload:
+    """
+    Copy an uploaded PDF to a temp file in chunks, checking the PDF header
+    on the first chunk and the size as it goes, and hashing it.
+
+    The multipart parser has already spooled the whole part by the time
+    this runs, so this check alone cannot stop a large body from being
+    received; UploadLimitMiddleware enforces the request size while the
+    body is still arriving. The caller owns the returned file.
+    """
+    return await _save_upload(file, max_bytes, PDF_MAGIC, ".pdf", "Only PDF files are allowed")
+
+
+async def save_zip_upload(file: UploadFile, max_bytes: int = MAX_ZIP_UPLOAD_BYTES) -> SavedUpload:
+    """
+    Stream an uploaded zip archive to a temp file, as save_pdf_upload does
+    """
+    return await _save_upload(file, max_bytes, ZIP_MAGIC, ".zip", "Only zip archives of PDFs are allowed")
+
+
+def is_zip_upload(file: UploadFile) -> bool:
+    return (file.filename or "").lower().endswith(".zip") or file.content_type in ZIP_CONTENT_TYPES
+
+
+async def _save_upload(file: UploadFile, max_bytes: int, magic: bytes, suffix: str,
+                       magic_detail: str) -> SavedUpload:
+    limit_detail = _limit_detail(max_bytes)
+
+    # Reject early when the client declared the size
+    if file.size and file.size > max_bytes:
+        raise HTTPException(status_code=413, detail=limit_detail)
+
+    digest = hashlib.sha256()
+    size = 0
+    fd, temp_path = tempfile.mkstemp(suffix=suffix)
+    try:
+        with os.fdopen(fd, "wb") as temp_file:
+            first = True
+            while True:
+                chunk = await file.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                if first:
+                    if magic not in chunk[:PDF_MAGIC_WINDOW]:
+                        raise HTTPException(status_code=400, detail=magic_detail)
+                    first = False
+                size += len(chunk)
+                if size > max_bytes:
+                    raise HTTPException(status_code=413, detail=limit_detail)
+                digest.update(chunk)
+                temp_file.write(chunk)
+        if size == 0:
+            raise HTTPException(status_code=400, detail="Uploaded file is empty")
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+    return SavedUpload(temp_path, size, digest.hexdigest())
+
+
+def request_body_limit(path: str) -> int:
+    """
+    Largest multipart body accepted for a route path
+    """
+    files_bytes = MAX_BATCH_REQUEST_BYTES if path.endswith(BATCH_UPLOAD_PATHS) else MAX_UPLOAD_BYTES
+    return files_bytes + MULTIPART_OVERHEAD_BYTES
+
+
+class UploadLimitMiddleware:
+    """
+    Rejects oversize multipart uploads with 413 before they are parsed: at
+    once when Content-Length is over the limit, otherwise as soon as the
+    streamed body crosses it, so the rest is never read or spooled to disk
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        headers = dict(scope["headers"])
+        if not headers.get(b"content-type", b"").startswith(b"multipart/form-data"):
+            return await self.app(scope, receive, send)
+
+        limit = request_body_limit(scope["path"])
+        detail = _limit_detail(limit - MULTIPART_OVERHEAD_BYTES)
+        try:
+            declared = int(headers.get(b"content-length", b"0"))
+        except ValueError:
+            declared = 0
+        if declared > limit:
+            response = ORJSONResponse({"detail": detail}, status_code=413, headers={"Connection": "close"})
+            return await response(scope, receive, send)
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # Raised inside form parsing, so the route answers 413
+                    raise HTTPException(status_code=413, detail=detail)
+            return message
+
+        return await self.app(scope, limited_receive, send)
+
+
+class ZipMember:
+    """
+    A PDF extracted from an uploaded zip: the saved file, or why it was not
+    """
+    __slots__ = ("name", "upload", "error")
+
+    def __init__(self, name: str, upload: Optional[SavedUpload] = None, error: Optional[str] = None):
+        self.name = name
+        self.upload = upload
+        self.error = error
+
+
+def extract_zip_pdfs(zip_path: str, max_bytes: int = MAX_UPLOAD_BYTES,
+                     max_files: int = MAX_BATCH_FILES) -> List[ZipMember]:
+    """
+    Extract the ``.pdf`` members of a zip to temp files, applying the same
+    header and size checks as single uploads. Members are streamed, and
+    sizes are counted as they decompress rather than trusted from the
+    archive. Raises ValueError for an unreadable archive or too many PDFs.
+    The caller owns the returned files.
+    """
+    try:
+        archive = zipfile.ZipFile(zip_path)
+    except zipfile.BadZipFile:
+        raise ValueError("Invalid zip archive")
+
+    members = []
+    try:
+        with archive:
+            infos = [
+                info for info in archive.infolist()
+                if not info.is_dir() and info.filename.lower().endswith(".pdf")
+                and not info.filename.startswith("__MACOSX/")
+            ]
+            if len(infos) > max_files:
+                raise ValueError(f"Too many PDFs in archive. Maximum {max_files} allowed")
+
+            for info in infos:
+                name = os.path.basename(info.filename)
+                if info.file_size > max_bytes:
+                    members.append(ZipMember(name, error=_limit_detail(max_bytes)))
+                    continue
+                try:
+                    members.append(ZipMember(name, _extract_member(archive, info, max_bytes)))
+                except ValueError as e:
+                    members.append(ZipMember(name, error=str(e)))
+    except BaseException:
+        for member in members:
+            if member.upload is not None:
+                member.upload.discard()
+        raise
+    return members
+
+
+def _extract_member(archive: zipfile.ZipFile, info: zipfile.ZipInfo, max_bytes: int) -> SavedUpload:
+    digest = hashlib.sha256()
+    size = 0
+    fd, temp_path = tempfile.mkstemp(suffix=".pdf")
+    try:
+        with os.fdopen(fd, "wb") as temp_file, archive.open(info) as member:
+            first = True
+            while True:
+                chunk = member.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                if first:
+                    if PDF_MAGIC not in chunk[:PDF_MAGIC_WINDOW]:
+                        raise ValueError("Only PDF files are allowed")
+                    first = False
+                size += len(chunk)
+                if size > max_bytes:
+                    raise ValueError(_limit_detail(max_bytes))
+                digest.update(chunk)
+                temp_file.write(chunk)
+        if size == 0:
+            raise ValueError("Uploaded file is empty")
+    except (zipfile.BadZipFile, RuntimeError, NotImplementedError) as e:
+        # Corrupt, encrypted or unsupported compression
+        os.unlink(temp_path)
+        raise ValueError(f"Unreadable archive member: {e}")
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+    return SavedUpload(temp_path, size, digest.hexdigest())
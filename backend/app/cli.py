@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Offline batch parser for directories of syllabus PDFs.
+
+Walks a directory tree, parses every PDF in a process pool and writes one
+record per file as JSON Lines or Parquet. A checkpoint manifest records each
+processed content hash, so an interrupted run can be resumed and files that
+were already parsed (or are byte-identical copies) are skipped.
+
+Usage:
+  python3 -m app.cli archive/ --output results.jsonl
+  python3 -m app.cli archive/ --output results.jsonl --resume
+  python3 -m app.cli archive/ --output results.parquet --workers 8
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Set
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.parse_pool import run_parser
+from app.services.pdf_parser import SECTIONS
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Parquet rows buffered per row group
+PARQUET_ROW_GROUP = 500
+
+
+def find_pdfs(root: str) -> Iterator[str]:
+    """
+    Every .pdf under root, in a stable (sorted) order
+    """
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            if filename.lower().endswith(".pdf"):
+                yield os.path.join(dirpath, filename)
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def parse_file(path: str, semester_start_date: Optional[str], sections: Optional[List[str]]) -> Dict:
+    """
+    Parse one PDF in a worker process; failures become an error record
+    """
+    start = time.perf_counter()
+    try:
+        result = run_parser(path, semester_start_date, sections)
+    except Exception as e:
+        return {"error": str(e), "pages": 0, "seconds": time.perf_counter() - start}
+    return {
+        "parsed_data": result["parsed_data"],
+        "pages": result["stats"].get("pages", 0),
+        "seconds": time.perf_counter() - start
+    }
+
+
+def read_manifest(path: str) -> Set[str]:
+    """
+    Content hashes the manifest records as successfully parsed
+    """
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path) as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # A line cut short by an interrupted run
+                continue
+            if entry.get("status") == "ok":
+                done.add(entry["sha256"])
+    return done
+
+
+class JsonlWriter:
+    def __init__(self, path: str, append: bool):
+        self.path = path
+        self._file = open(path, "a" if append else "w")
+
+    def write(self, record: Dict):
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetWriter:
+    """
+    Parquet output (requires pyarrow). ``parsed_data`` is stored as a JSON
+    string because its shape varies between documents.
+    """
+    def __init__(self, path: str, append: bool):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit("Parquet output requires pyarrow: pip install pyarrow")
+
+        # Parquet files cannot be appended to; a resumed run writes a new part
+        if append and os.path.exists(path):
+            stem, ext = os.path.splitext(path)
+            part = 1
+            while os.path.exists(f"{stem}.part{part}{ext}"):
+                part += 1
+            path = f"{stem}.part{part}{ext}"
+        self.path = path
+        self._pa = pa
+        self._schema = pa.schema([
+            ("path", pa.string()), ("sha256", pa.string()), ("size", pa.int64()),
+            ("pages", pa.int64()), ("seconds", pa.float64()), ("error", pa.string()),
+            ("parsed_data", pa.string())
+        ])
+        self._writer = pq.ParquetWriter(path, self._schema)
+        self._rows: List[Dict] = []
+
+    def write(self, record: Dict):
+        row = dict(record)
+        row["parsed_data"] = json.dumps(row["parsed_data"]) if row.get("parsed_data") is not None else None
+        self._rows.append(row)
+        if len(self._rows) >= PARQUET_ROW_GROUP:
+            self._flush()
+
+    def _flush(self):
+        if self._rows:
+            self._writer.write_table(self._pa.Table.from_pylist(self._rows, schema=self._schema))
+            self._rows = []
+
+    def close(self):
+        self._flush()
+        self._writer.close()
+
+
+def open_writer(path: str, fmt: Optional[str], append: bool):
+    fmt = fmt or ("parquet" if path.lower().endswith(".parquet") else "jsonl")
+    if fmt == "parquet":
+        return ParquetWriter(path, append)
+    return JsonlWriter(path, append)
+
+
+def run(root: str, output: str, fmt: Optional[str] = None, workers: int = os.cpu_count() or 2,
+        manifest_path: Optional[str] = None, resume: bool = False,
+        semester_start_date: Optional[str] = None, sections: Optional[List[str]] = None,
+        progress_every: int = 50) -> Dict:
+    """
+    Parse every PDF under root and return the throughput summary
+    """
+    manifest_path = manifest_path or output + ".manifest.jsonl"
+    done_hashes = read_manifest(manifest_path) if resume else set()
+    writer = open_writer(output, fmt, append=resume)
+    manifest = open(manifest_path, "a" if resume else "w")
+
+    summary = {"found": 0, "parsed": 0, "failed": 0, "skipped": 0, "duplicates": 0,
+               "pages": 0, "bytes": 0, "parse_seconds": 0.0}
+    seen_hashes: Set[str] = set()
+    start = time.perf_counter()
+
+    def record(path: str, sha256: str, size: int, result: Dict):
+        status = "error" if "error" in result else "ok"
+        writer.write({
+            "path": path, "sha256": sha256, "size": size, "pages": result["pages"],
+            "seconds": round(result["seconds"], 4), "error": result.get("error"),
+            "parsed_data": result.get("parsed_data")
+        })
+        manifest.write(json.dumps({"sha256": sha256, "path": path, "status": status}) + "\n")
+        manifest.flush()
+
+        summary["parsed" if status == "ok" else "failed"] += 1
+        summary["pages"] += result["pages"]
+        summary["bytes"] += size
+        summary["parse_seconds"] += result["seconds"]
+        processed = summary["parsed"] + summary["failed"]
+        if progress_every and processed % progress_every == 0:
+            elapsed = time.perf_counter() - start
+            print(f"{processed} processed, {summary['skipped'] + summary['duplicates']} skipped, "
+                  f"{processed / elapsed:.1f} files/s", file=sys.stderr)
+
+    try:
+        with ProcessPoolExecutor(max_workers=max(1, workers)) as executor:
+            # Keep a bounded window of submissions so huge trees are not
+            # queued (and hashed) all at once
+            pending = deque()
+            for path in find_pdfs(root):
+                summary["found"] += 1
+                try:
+                    sha256 = file_sha256(path)
+                    size = os.path.getsize(path)
+                except OSError as e:
+                    record(path, "", 0, {"error": str(e), "pages": 0, "seconds": 0.0})
+                    continue
+                if sha256 in done_hashes:
+                    summary["skipped"] += 1
+                    continue
+                if sha256 in seen_hashes:
+                    summary["duplicates"] += 1
+                    continue
+                seen_hashes.add(sha256)
+
+                pending.append((path, sha256, size,
+                                executor.submit(parse_file, path, semester_start_date, sections)))
+                while len(pending) >= workers * 2:
+                    path, sha256, size, future = pending.popleft()
+                    record(path, sha256, size, future.result())
+            while pending:
+                path, sha256, size, future = pending.popleft()
+                record(path, sha256, size, future.result())
+    finally:
+        writer.close()
+        manifest.close()
+
+    elapsed = time.perf_counter() - start
+    summary.update({
+        "output": writer.path,
+        "manifest": manifest_path,
+        "elapsed_seconds": round(elapsed, 3),
+        "parse_seconds": round(summary["parse_seconds"], 3),
+        "files_per_second": round(summary["parsed"] / elapsed, 2) if elapsed else 0.0,
+        "pages_per_second": round(summary["pages"] / elapsed, 2) if elapsed else 0.0,
+        "mb_per_second": round(summary["bytes"] / (1024 * 1024) / elapsed, 2) if elapsed else 0.0
+    })
+    return summary
+
+
+def print_summary(summary: Dict):
+    print(f"Found {summary['found']} PDFs: {summary['parsed']} parsed, {summary['failed']} failed, "
+          f"{summary['skipped']} already in manifest, {summary['duplicates']} duplicates", file=sys.stderr)
+    print(f"{summary['pages']} pages, {summary['bytes'] / (1024 * 1024):.1f} MB in {summary['elapsed_seconds']:.1f}s "
+          f"({summary['parse_seconds']:.1f}s of worker time)", file=sys.stderr)
+    print(f"Throughput: {summary['files_per_second']} files/s, {summary['pages_per_second']} pages/s, "
+          f"{summary['mb_per_second']} MB/s", file=sys.stderr)
+    print(f"Results: {summary['output']}  Manifest: {summary['manifest']}", file=sys.stderr)
+
+
+def main(argv: Optional[List[str]] = None):
+    arg_parser = argparse.ArgumentParser(description="Parse a directory tree of syllabus PDFs")
+    arg_parser.add_argument("root", help="directory to search for PDFs")
+    arg_parser.add_argument("--output", "-o", required=True, help="results file (.jsonl or .parquet)")
+    arg_parser.add_argument("--format", choices=["jsonl", "parquet"],
+                            help="output format (default: from the output extension)")
+    arg_parser.add_argument("--workers", "-j", type=int, default=os.cpu_count() or 2,
+                            help="parser processes (default: CPU count)")
+    arg_parser.add_argument("--manifest", help="checkpoint manifest (default: <output>.manifest.jsonl)")
+    arg_parser.add_argument("--resume", action="store_true",
+                            help="append to the output, skipping hashes the manifest marks as parsed")
+    arg_parser.add_argument("--semester-start-date", help="YYYY-MM-DD passed to the parser")
+    arg_parser.add_argument("--sections", help=f"comma-separated subset of: {', '.join(SECTIONS)}")
+    arg_parser.add_argument("--progress-every", type=int, default=50,
+                            help="print progress every N files (0 disables)")
+    arg_parser.add_argument("--summary-json", action="store_true", help="print the summary as JSON on stdout")
+    args = arg_parser.parse_args(argv)
+
+    if not os.path.isdir(args.root):
+        arg_parser.error(f"not a directory: {args.root}")
+    sections = None
+    if args.sections:
+        sections = [section.strip() for section in args.sections.split(",") if section.strip()]
+        unknown = set(sections) - set(SECTIONS)
+        if unknown:
+            arg_parser.error(f"unknown sections: {', '.join(sorted(unknown))}")
+
+    summary = run(args.root, args.output, args.format, args.workers, args.manifest, args.resume,
+                  args.semester_start_date, sections, args.progress_every)
+    print_summary(summary)
+    if args.summary_json:
+        print(json.dumps(summary, indent=2))
+    sys.exit(1 if summary["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
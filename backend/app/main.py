@@ -1,13 +1,72 @@
-from fastapi import FastAPI
+import time
+IMPORT_START = time.perf_counter()
+
+import asyncio
+import logging
+import os
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.routes import upload, image_conversion
+from fastapi.responses import ORJSONResponse, PlainTextResponse
+from app.api.routes import upload, image_conversion, stats, export
+from app.api.uploads import UploadLimitMiddleware
+from app.services.metrics import registry, Counter, CallbackCounter, Gauge, REQUEST_SECONDS, start_request_stages
+from app.services.parse_cache import parse_cache
+from app.services.parse_pool import parse_pool
+from app.services.render_cache import render_cache
+from app.services.jobs import job_manager
+from app.services.session_store import session_store
+from app.services.warmup import WARMUP_ENABLED, preload_rendering, startup_report
+
+# Requests slower than this are logged with their stage breakdown (0 disables)
+SLOW_REQUEST_SECONDS = float(os.getenv("SLOW_REQUEST_SECONDS", "5"))
+
+logger = logging.getLogger("syllabus_parser.requests")
+startup_logger = logging.getLogger("syllabus_parser.startup")
+
+SLOW_REQUESTS = registry.register(Counter(
+    "syllabus_slow_requests_total", "Requests slower than SLOW_REQUEST_SECONDS", labels=("path",)))
+registry.register(Gauge(
+    "syllabus_parse_pool_busy_workers", "Parse pool workers currently parsing",
+    lambda: {(): parse_pool.stats()["busy_workers"]}))
+registry.register(Gauge(
+    "syllabus_parse_pool_queue_depth", "Parse jobs waiting for a worker",
+    lambda: {(): parse_pool.stats()["queue_depth"]}))
+registry.register(CallbackCounter(
+    "syllabus_parse_cache_lookups_total", "Parse cache lookups since startup by result",
+    lambda: _cache_lookups(parse_cache.stats()), labels=("result",)))
+registry.register(CallbackCounter(
+    "syllabus_render_cache_lookups_total", "Render cache lookups since startup by result",
+    lambda: {("hit",): render_cache.hits, ("miss",): render_cache.misses}, labels=("result",)))
+registry.register(Gauge(
+    "syllabus_sessions", "Sessions currently stored",
+    lambda: {(): session_store.stats()["entries"]}))
+registry.register(Gauge(
+    "syllabus_startup_seconds", "Cold start timings of this process by phase",
+    lambda: _startup_phases(startup_report.snapshot()), labels=("phase",)))
+
+def _cache_lookups(cache_stats: dict) -> dict:
+    return {
+        ("memory_hit",): cache_stats["memory_hits"],
+        ("disk_hit",): cache_stats["disk_hits"],
+        ("miss",): cache_stats["misses"]
+    }
+
+def _startup_phases(report: dict) -> dict:
+    phases = {("import",): report["import_seconds"], ("ready",): report["ready_seconds"]}
+    phases.update({(f"warmup_{stage}",): seconds for stage, seconds in report["warmup_seconds"].items()})
+    return {phase: seconds for phase, seconds in phases.items() if seconds is not None}
 
 app = FastAPI(
     title="Syllabus Parser API",
     description="API for parsing syllabus PDFs and exporting to various platforms",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
+# Enforce upload size limits while the request body is still arriving
+# (added before CORS, so its 413 responses still get CORS headers)
+app.add_middleware(UploadLimitMiddleware)
+
 # CORS middleware for frontend integration
 app.add_middleware(
     CORSMiddleware,
@@ -28,6 +87,70 @@ app.add_middleware(
 # Include routers
 app.include_router(upload.router, prefix="/api", tags=["upload"])
 app.include_router(image_conversion.router, prefix="/api", tags=["image_conversion"])
+app.include_router(stats.router, prefix="/api", tags=["stats"])
+app.include_router(export.router, prefix="/api", tags=["export"])
+
+@app.middleware("http")
+async def time_requests(request: Request, call_next):
+    stages = start_request_stages()
+    start = time.perf_counter()
+    response = await call_next(request)
+    elapsed = time.perf_counter() - start
+
+    # Label by route template, not the raw URL, to keep cardinality bounded
+    route = request.scope.get("route")
+    path = route.path if route is not None else "unmatched"
+    REQUEST_SECONDS.observe(elapsed, method=request.method, path=path, status=str(response.status_code))
+    startup_report.observe_request(path, elapsed)
+
+    if SLOW_REQUEST_SECONDS and elapsed > SLOW_REQUEST_SECONDS:
+        SLOW_REQUESTS.inc(path=path)
+        breakdown = " ".join(f"{stage}={seconds:.3f}s" for stage, seconds in
+                             sorted(stages.items(), key=lambda item: -item[1]))
+        logger.warning("Slow request %s %s %s in %.3fs: %s", request.method, path,
+                       response.status_code, elapsed, breakdown or "no stages recorded")
+    return response
+
+@app.on_event("startup")
+async def start_session_sweeper():
+    session_store.start_sweeper()
+
+@app.on_event("startup")
+async def start_warm_up():
+    if WARMUP_ENABLED:
+        asyncio.create_task(_warm_up())
+    else:
+        startup_report.mark_ready({})
+
+async def _warm_up():
+    """
+    Pre-import the rendering stack and start the (self-warming) parse
+    workers; /ready reports 503 until both are done
+    """
+    loop = asyncio.get_running_loop()
+    warmup = {}
+    try:
+        warmup["rendering"], warmup["parse_pool"] = await asyncio.gather(
+            loop.run_in_executor(None, preload_rendering), parse_pool.warm_up())
+    except Exception:
+        startup_logger.exception("Warm-up failed; serving cold")
+    startup_report.mark_ready(warmup)
+    report = startup_report.snapshot()
+    startup_logger.info("Ready in %.3fs (import %.3fs, warm-up %s)", report["ready_seconds"],
+                        report["import_seconds"],
+                        " ".join(f"{stage}={seconds:.3f}s" for stage, seconds in warmup.items()) or "skipped")
+
+@app.on_event("shutdown")
+async def cancel_parse_jobs():
+    job_manager.cancel_all()
+
+@app.on_event("shutdown")
+async def shutdown_parse_pool():
+    parse_pool.shutdown()
+
+@app.on_event("shutdown")
+async def close_session_store():
+    session_store.close()
 
 @app.get("/")
 async def root():
@@ -35,4 +158,19 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"} 
\ No newline at end of file
+    return {"status": "healthy"} 
+
+@app.get("/ready")
+async def readiness_check():
+    """
+    200 once warm-up has finished, 503 before; both with the startup report
+    """
+    report = startup_report.snapshot()
+    return ORJSONResponse(report, status_code=200 if report["ready"] else 503)
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+# Time to import this module and everything it pulls in
+startup_report.import_seconds = round(time.perf_counter() - IMPORT_START, 4)
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 
 class CourseInfo(BaseModel):
@@ -9,34 +9,66 @@ class CourseInfo(BaseModel):
     semester: str = ""
     year: str = ""
 
+# Raw date strings are kept as written; the *_iso fields hold them resolved
+# to YYYY-MM-DD (None when they could not be resolved).
+#
+# Items point at the line (or table row) they came from by its index in
+# SyllabusData.source_lines instead of carrying their own copy of it
+
 class Assignment(BaseModel):
     title: str
     due_date: Optional[str] = None
-    description: str = ""
+    due_date_iso: Optional[str] = None
+    line: Optional[int] = None
 
 class ScheduleItem(BaseModel):
     day: str = ""
     time: str = ""
     location: str = ""
-    description: str = ""
+    line: Optional[int] = None
 
 class ImportantDate(BaseModel):
     title: str
     date: Optional[str] = None
-    description: str = ""
+    date_iso: Optional[str] = None
+    line: Optional[int] = None
 
 class SyllabusData(BaseModel):
-    course_info: CourseInfo
+    # Sections are absent when a parse was limited to other sections
+    course_info: Optional[CourseInfo] = None
     assignments: List[Assignment] = []
     schedule: List[ScheduleItem] = []
     important_dates: List[ImportantDate] = []
+    source_lines: List[str] = []
     raw_text: str = ""
 
+def inline_descriptions(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Copy of parsed data in the older shape: each item gets a
+    ``description`` holding its source line, and source_lines is dropped
+    """
+    source_lines = data.get("source_lines", [])
+    inlined = {key: value for key, value in data.items() if key != "source_lines"}
+    for section in ("assignments", "schedule", "important_dates"):
+        if section in data:
+            inlined[section] = [
+                {**{k: v for k, v in item.items() if k != "line"},
+                 "description": source_lines[item["line"]] if item.get("line") is not None else ""}
+                for item in data[section]
+            ]
+    return inlined
+
 class ExportRequest(BaseModel):
     session_id: str
     calendar_id: Optional[str] = "primary"
     database_id: Optional[str] = None
 
+class BulkExportRequest(BaseModel):
+    session_ids: List[str]
+    format: str = "ics"  # ics or csv
+    sections: Optional[List[str]] = None  # default: assignments, schedule, important_dates
+    schedule_weeks: Optional[int] = None  # weeks each class meeting repeats (ics)
+
 class UploadResponse(BaseModel):
     success: bool
     session_id: str
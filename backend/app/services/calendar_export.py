@@ -0,0 +1,257 @@
+import csv
+import io
+import os
+import re
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from app.services.date_resolver import WEEKDAY_NUMBERS, find_date_token, resolve_date
+
+# Weekly schedule items become recurring events for this many weeks from
+# the semester start (override per request)
+EXPORT_SCHEDULE_WEEKS = int(os.getenv("EXPORT_SCHEDULE_WEEKS", "10"))
+# Most sessions one bulk export may name
+EXPORT_MAX_SESSIONS = int(os.getenv("EXPORT_MAX_SESSIONS", "1000"))
+# Length of each class meeting in the calendar; syllabi rarely say
+SCHEDULE_EVENT_DURATION = "PT1H"
+
+EXPORT_SECTIONS = ("assignments", "schedule", "important_dates")
+
+CSV_COLUMNS = ["session_id", "course_code", "course_name", "section", "title", "date", "date_iso",
+               "day", "time", "location", "source_line"]
+
+# "the following Sunday", "next Monday": a one-off, not a weekly meeting
+RELATIVE_DAY_RE = re.compile(r'\b(?:following|next)\s+(?:mon|tue|wed|thu|fri|sat|sun)[a-z]*\b', re.IGNORECASE)
+
+# A bare week reference ("starting in week 2") names no particular day
+BARE_WEEK_RE = re.compile(r'week\s*\d{1,2}', re.IGNORECASE)
+
+TIME_RE = re.compile(r'(?<!\d)(\d{1,2})(?::(\d{2}))?\s*([ap])\.?\s*m\b', re.IGNORECASE)
+
+# RFC 5545 limits content lines to 75 octets, continued with CRLF + space
+ICS_LINE_OCTETS = 75
+
+
+def _ics_escape(value: str) -> str:
+    return (value.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+            .replace("\r\n", "\\n").replace("\n", "\\n"))
+
+
+def _ics_line(name: str, value: str) -> str:
+    line = f"{name}:{value}".encode("utf-8")
+    parts = []
+    while len(line) > ICS_LINE_OCTETS:
+        cut = ICS_LINE_OCTETS if not parts else ICS_LINE_OCTETS - 1
+        # Never split a UTF-8 sequence
+        while cut > 0 and (line[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(line[:cut])
+        line = line[cut:]
+    parts.append(line)
+    return "\r\n ".join(part.decode("utf-8") for part in parts) + "\r\n"
+
+
+def _time_of_day(value: str) -> Optional[tuple[int, int]]:
+    """
+    (hour, minute) of a time such as "10:30 AM", "11:59pm" or "3PM"
+    """
+    match = TIME_RE.search(value or "")
+    if not match:
+        return None
+    hour, minute = int(match.group(1)), int(match.group(2) or 0)
+    if not 1 <= hour <= 12 or minute > 59:
+        return None
+    hour = hour % 12 + (12 if match.group(3).lower() == "p" else 0)
+    return hour, minute
+
+
+def _first_weekday(start: date, weekday: int) -> date:
+    return start + timedelta(days=(weekday - start.weekday()) % 7)
+
+
+class SessionExport:
+    """
+    The exportable items of one stored session, in a flat shape shared by
+    the ICS and CSV writers
+    """
+    def __init__(self, session_id: str, record: Dict[str, Any], sections: Iterable[str]):
+        self.session_id = session_id
+        parsed_data = record.get("parsed_data") or {}
+        course_info = parsed_data.get("course_info") or {}
+        self.course_code = course_info.get("course_code", "")
+        self.course_name = course_info.get("course_name", "")
+        self.semester_start_date = record.get("semester_start_date")
+        self.source_lines = parsed_data.get("source_lines", [])
+        self.sections = {section: parsed_data.get(section) or [] for section in sections}
+
+    @property
+    def label(self) -> str:
+        return self.course_code or self.course_name or self.session_id
+
+    def source_line(self, item: Dict[str, Any]) -> str:
+        line = item.get("line")
+        return self.source_lines[line] if line is not None and line < len(self.source_lines) else ""
+
+    def rows(self) -> Iterator[Dict[str, Any]]:
+        for section, items in self.sections.items():
+            for item in items:
+                yield {
+                    "session_id": self.session_id,
+                    "course_code": self.course_code,
+                    "course_name": self.course_name,
+                    "section": section,
+                    "title": item.get("title", ""),
+                    "date": item.get("due_date") or item.get("date") or "",
+                    "date_iso": item.get("due_date_iso") or item.get("date_iso") or "",
+                    "day": item.get("day", ""),
+                    "time": item.get("time", ""),
+                    "location": item.get("location", ""),
+                    "source_line": self.source_line(item)
+                }
+
+
+class ICSWriter:
+    """
+    Writes sessions as VEVENTs of one VCALENDAR. Dated assignments and
+    important dates become all-day events, as do schedule lines that name a
+    date; other schedule items with a weekday and a time become weekly
+    events, when the session has a semester start.
+    Items that cannot be placed on a calendar are left out (CSV has them).
+    """
+    def __init__(self, name: str = "Syllabus export", schedule_weeks: int = EXPORT_SCHEDULE_WEEKS):
+        self.name = name
+        self.schedule_weeks = schedule_weeks
+        self.stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+    def header(self) -> str:
+        return ("BEGIN:VCALENDAR\r\n" + _ics_line("VERSION", "2.0")
+                + _ics_line("PRODID", "-//Syllabus Parser//Export//EN")
+                + _ics_line("CALSCALE", "GREGORIAN")
+                + _ics_line("X-WR-CALNAME", _ics_escape(self.name)))
+
+    def footer(self) -> str:
+        return "END:VCALENDAR\r\n"
+
+    def session(self, export: SessionExport) -> str:
+        lines = []
+        for section, items in export.sections.items():
+            for index, item in enumerate(items):
+                if section == "schedule":
+                    event = self._schedule_event(export, item)
+                else:
+                    event = self._dated_event(export, section, item)
+                if event is None:
+                    continue
+                lines.append("BEGIN:VEVENT\r\n"
+                             + _ics_line("UID", f"{export.session_id}-{section}-{index}@syllabus-parser")
+                             + _ics_line("DTSTAMP", self.stamp)
+                             + event
+                             + self._description(export, item)
+                             + "END:VEVENT\r\n")
+        return "".join(lines)
+
+    def _dated_event(self, export: SessionExport, section: str, item: Dict[str, Any]) -> Optional[str]:
+        iso = item.get("due_date_iso") if section == "assignments" else item.get("date_iso")
+        title = item.get("title", "")
+        if section == "assignments":
+            title = f"{title} due"
+        return self._all_day_event(iso, f"{export.label}: {title}")
+
+    @staticmethod
+    def _all_day_event(iso: Optional[str], summary: str) -> Optional[str]:
+        if not iso:
+            return None
+        day = date.fromisoformat(iso)
+        return (_ics_line("DTSTART;VALUE=DATE", day.strftime("%Y%m%d"))
+                + _ics_line("DTEND;VALUE=DATE", (day + timedelta(days=1)).strftime("%Y%m%d"))
+                + _ics_line("SUMMARY", _ics_escape(summary)))
+
+    def _schedule_event(self, export: SessionExport, item: Dict[str, Any]) -> Optional[str]:
+        source_line = export.source_line(item)
+        token = find_date_token(source_line)
+        if token and not BARE_WEEK_RE.fullmatch(token):
+            # A dated line ("final exam on Saturday, March 15th, 12-3PM") is a
+            # one-off: a single all-day event on that date, never a weekly one
+            return self._all_day_event(resolve_date(token, export.semester_start_date), export.label)
+        if RELATIVE_DAY_RE.search(source_line):
+            return None
+
+        weekday = WEEKDAY_NUMBERS.get((item.get("day") or "")[:3].lower())
+        time_of_day = _time_of_day(item.get("time", ""))
+        if weekday is None or time_of_day is None or not export.semester_start_date:
+            return None
+        try:
+            start = date.fromisoformat(export.semester_start_date)
+        except ValueError:
+            return None
+        first = datetime.combine(_first_weekday(start, weekday), datetime.min.time()).replace(
+            hour=time_of_day[0], minute=time_of_day[1])
+        event = (_ics_line("DTSTART", first.strftime("%Y%m%dT%H%M%S"))
+                 + _ics_line("DURATION", SCHEDULE_EVENT_DURATION)
+                 + _ics_line("RRULE", f"FREQ=WEEKLY;COUNT={self.schedule_weeks}")
+                 + _ics_line("SUMMARY", _ics_escape(export.label)))
+        if item.get("location"):
+            event += _ics_line("LOCATION", _ics_escape(item["location"]))
+        return event
+
+    @staticmethod
+    def _description(export: SessionExport, item: Dict[str, Any]) -> str:
+        source_line = export.source_line(item)
+        return _ics_line("DESCRIPTION", _ics_escape(source_line)) if source_line else ""
+
+
+def iter_ics(sessions: Iterable[SessionExport], writer: ICSWriter) -> Iterator[bytes]:
+    """
+    One VCALENDAR, yielded a session at a time
+    """
+    yield writer.header().encode("utf-8")
+    for export in sessions:
+        chunk = writer.session(export)
+        if chunk:
+            yield chunk.encode("utf-8")
+    yield writer.footer().encode("utf-8")
+
+
+def iter_csv(sessions: Iterable[SessionExport]) -> Iterator[bytes]:
+    """
+    CSV with a header row and one row per item, yielded a session at a time
+    """
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_COLUMNS)
+    writer.writeheader()
+    for export in sessions:
+        writer.writerows(export.rows())
+        chunk = buffer.getvalue()
+        if chunk:
+            yield chunk.encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    chunk = buffer.getvalue()
+    if chunk:
+        yield chunk.encode("utf-8")
+
+
+def iter_sessions(session_ids: Iterable[str], load: Callable[[str], Optional[Dict[str, Any]]],
+                  sections: Iterable[str] = EXPORT_SECTIONS) -> Iterator[SessionExport]:
+    """
+    Load sessions one at a time, so only the one being written is held.
+    Sessions that expired since the request was accepted are skipped.
+    """
+    sections = tuple(sections)
+    for session_id in session_ids:
+        record = load(session_id)
+        if record is not None:
+            yield SessionExport(session_id, record, sections)
+
+
+def parse_sections(value: Optional[List[str]]) -> tuple:
+    """
+    Requested export sections (default: all); raises ValueError for unknown ones
+    """
+    if not value:
+        return EXPORT_SECTIONS
+    sections = tuple(section.strip() for item in value for section in item.split(",") if section.strip())
+    unknown = set(sections) - set(EXPORT_SECTIONS)
+    if unknown:
+        raise ValueError(f"Unknown sections: {', '.join(sorted(unknown))}")
+    return sections
@@ -0,0 +1,185 @@
+import re
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from app.services.line_scanner import DAYS
+
+# Parsed tokens kept per process; syllabi repeat the same few dates a lot
+DATE_CACHE_SIZE = 4096
+
+MONTHS = ['january', 'february', 'march', 'april', 'may', 'june', 'july',
+          'august', 'september', 'october', 'november', 'december']
+# Month and weekday names by their first three letters ("sept" -> "sep")
+MONTH_NUMBERS = {month[:3]: number for number, month in enumerate(MONTHS, 1)}
+WEEKDAY_NUMBERS = {day[:3]: number for number, day in enumerate(DAYS)}
+
+_MONTH = (r'\b(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?'
+          r'|sep(?:t|tember)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\b\.?')
+_WEEKDAY = (r'\b(?:mon(?:day)?|tue(?:s|sday)?|wed(?:nesday)?|thu(?:rs|rsday)?|fri(?:day)?'
+            r'|sat(?:urday)?|sun(?:day)?)\b\.?')
+
+# The whole date grammar as one alternation, compiled once. Each branch
+# names its groups so a single match says which form it found. Dashed
+# numeric dates need a year ("1-2" is more often a range than a date), a
+# yearless slash date can't be followed by "of" or "%" ("1/3 of the grade"
+# is a fraction), and after a bare number "May"/"Mar" must be capitalized
+# ("Quiz 2 may be dropped" is not May 2; "2nd may" still is).
+DATE_GRAMMAR = re.compile(
+    r'(?<![\d.])(?P<iso_y>\d{4})-(?P<iso_m>\d{1,2})-(?P<iso_d>\d{1,2})(?!\d)'
+    r'|(?<![\d./-])(?P<num_a>\d{1,2})/(?P<num_b>\d{1,2})(?:/(?P<num_y>\d{4}|\d{2}))?(?![\d/])'
+    r'(?(num_y)|(?!\s*(?:of\b|%)))'
+    r'|(?<![\d./-])(?P<dash_a>\d{1,2})-(?P<dash_b>\d{1,2})-(?P<dash_y>\d{4}|\d{2})(?![\d-])'
+    r'|(?P<md_m>' + _MONTH + r')\s*(?P<md_d>\d{1,2})(?:st|nd|rd|th)?(?!\d)(?:,?\s+(?P<md_y>\d{4}))?'
+    r'|(?<![\d.])(?P<dm_d>\d{1,2})(?P<dm_ord>st|nd|rd|th)?\s+(?:of\s+)?'
+    r'(?(dm_ord)|(?!(?-i:ma[ry])\b))(?P<dm_m>' + _MONTH + r')(?:,?\s+(?P<dm_y>\d{4}))?'
+    r'|\bweek\s*(?P<wk_n>\d{1,2})(?!\d)(?:\s*[,:-]?\s*(?:on\s+)?(?P<wk_day>' + _WEEKDAY + r'))?'
+    r'|(?P<dw_day>' + _WEEKDAY + r')\s*(?:of\s+|,\s*|\(\s*)?week\s*(?P<dw_n>\d{1,2})(?!\d)',
+    re.IGNORECASE
+)
+
+
+def _year(value: Optional[str]) -> Optional[int]:
+    if not value:
+        return None
+    year = int(value)
+    return year + 2000 if year < 100 else year
+
+
+def _infer_year(month: int, day: int, semester_start: Optional[date],
+                default_year: Optional[int]) -> Optional[int]:
+    """
+    Year for a date written without one: the semester start's year, or the
+    next year for months well before the start (a Fall term's January)
+    """
+    if semester_start is None:
+        return default_year
+    year = semester_start.year
+    if month < semester_start.month - 1:
+        year += 1
+    return year
+
+
+def _week_date(week: int, weekday: Optional[int], semester_start: Optional[date]) -> Optional[date]:
+    """
+    Date of "Week N [weekday]". Week 1 is the (Monday-based) week holding
+    the semester start; without a weekday, week 1 resolves to the start
+    itself and later weeks to their Monday.
+    """
+    if semester_start is None or week < 1:
+        return None
+    week_monday = semester_start - timedelta(days=semester_start.weekday()) + timedelta(weeks=week - 1)
+    if weekday is None:
+        return max(week_monday, semester_start)
+    return week_monday + timedelta(days=weekday)
+
+
+def _safe_date(year: Optional[int], month: int, day: int) -> Optional[date]:
+    if year is None:
+        return None
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+
+def _resolve_match(match: re.Match, semester_start: Optional[date],
+                   default_year: Optional[int]) -> Optional[date]:
+    groups = match.groupdict()
+    if groups["iso_y"]:
+        return _safe_date(int(groups["iso_y"]), int(groups["iso_m"]), int(groups["iso_d"]))
+
+    if groups["num_a"] or groups["dash_a"]:
+        # US month/day order, unless only day/month makes sense (15/01)
+        month, day = int(groups["num_a"] or groups["dash_a"]), int(groups["num_b"] or groups["dash_b"])
+        if month > 12 >= day:
+            month, day = day, month
+        year = _year(groups["num_y"] or groups["dash_y"]) or _infer_year(month, day, semester_start, default_year)
+        return _safe_date(year, month, day)
+
+    if groups["md_m"] or groups["dm_m"]:
+        name = (groups["md_m"] or groups["dm_m"]).lower()
+        month = MONTH_NUMBERS[name[:3]]
+        day = int(groups["md_d"] or groups["dm_d"])
+        year = _year(groups["md_y"] or groups["dm_y"]) or _infer_year(month, day, semester_start, default_year)
+        return _safe_date(year, month, day)
+
+    week = groups["wk_n"] or groups["dw_n"]
+    day_name = groups["wk_day"] or groups["dw_day"]
+    weekday = WEEKDAY_NUMBERS[day_name[:3].lower()] if day_name else None
+    return _week_date(int(week), weekday, semester_start)
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def resolve_date(token: str, semester_start_date: Optional[str] = None,
+                 default_year: Optional[int] = None) -> Optional[str]:
+    """
+    ISO date (YYYY-MM-DD) for a date token such as "1/15", "2024-01-15",
+    "January 15, 2024" or "Week 3 Tuesday", or None if it does not resolve.
+
+    Dates without a year take it from ``semester_start_date`` (or
+    ``default_year``); week references need ``semester_start_date``.
+    """
+    if not token:
+        return None
+    match = DATE_GRAMMAR.search(token)
+    if not match:
+        return None
+    try:
+        semester_start = date.fromisoformat(semester_start_date) if semester_start_date else None
+    except ValueError:
+        semester_start = None
+    resolved = _resolve_match(match, semester_start, default_year)
+    return resolved.isoformat() if resolved else None
+
+
+def find_date_token(text: str) -> str:
+    """
+    The first date the grammar finds in text, as written, or "". Catches
+    what the extractors' own patterns miss: dates without a year ("1/15",
+    "March 18") and week references ("Week 3 Tuesday").
+    """
+    match = DATE_GRAMMAR.search(text)
+    return match.group(0).strip() if match else ""
+
+
+# Item fields holding a raw date token, and the ISO field resolved from each
+DATE_FIELDS = {
+    "assignments": ("due_date", "due_date_iso"),
+    "important_dates": ("date", "date_iso"),
+}
+
+
+def resolve_dates(parsed_data: Dict[str, Any], semester_start_date: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Fill in the ISO field of every dated item in parsed_data, in place.
+
+    Tokens are collected across all sections first and each distinct one
+    is resolved once. Only the raw tokens and the semester start are read,
+    so this can be re-run on stored results when the start date changes.
+    """
+    course_info = parsed_data.get("course_info") or {}
+    default_year = int(course_info["year"]) if str(course_info.get("year", "")).isdigit() else None
+
+    items: List[tuple] = [
+        (item, raw_field, iso_field)
+        for section, (raw_field, iso_field) in DATE_FIELDS.items()
+        for item in parsed_data.get(section, [])
+    ]
+    tokens = {item.get(raw_field) or "" for item, raw_field, _ in items}
+    resolved = {token: resolve_date(token, semester_start_date, default_year) for token in tokens}
+    for item, raw_field, iso_field in items:
+        item[iso_field] = resolved[item.get(raw_field) or ""]
+    return parsed_data
+
+
+def with_semester_start(parsed_data: Dict[str, Any], semester_start_date: Optional[str]) -> Dict[str, Any]:
+    """
+    Copy of parsed_data with its dates re-resolved against a new semester
+    start. Only the dated items are copied; nothing is re-extracted.
+    """
+    updated = dict(parsed_data)
+    for section in DATE_FIELDS:
+        if section in updated:
+            updated[section] = [dict(item) for item in updated[section]]
+    return resolve_dates(updated, semester_start_date)
@@ -0,0 +1,190 @@
+import os
+import re
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from typing import Dict, Iterable, Iterator, Optional
+from app.services.metrics import RENDER_STAGE_SECONDS, add_stage
+
+# pdf2image (and PIL) are imported on first render, keeping them out of
+# processes that never convert pages
+
+# Rendering defaults and limits (override with environment variables)
+DEFAULT_DPI = int(os.getenv("RENDER_DEFAULT_DPI", "200"))
+MIN_DPI, MAX_DPI = 36, 600
+DEFAULT_RENDER_THREADS = int(os.getenv("RENDER_THREADS", "2"))
+MAX_RENDER_THREADS = int(os.getenv("RENDER_MAX_THREADS", "4"))
+
+# Bump whenever rendering changes the output for the same options, so
+# content-addressed cached pages are not reused
+RENDER_VERSION = "3"
+
+# pdfinfo page size, e.g. "612 x 792 pts (letter)"
+PAGE_SIZE_RE = re.compile(r'([\d.]+)\s*x\s*([\d.]+)\s*pts')
+
+# format name -> (PIL format, MIME type, file extension)
+FORMATS = {
+    "png": ("PNG", "image/png", "png"),
+    "jpeg": ("JPEG", "image/jpeg", "jpg"),
+    "webp": ("WEBP", "image/webp", "webp"),
+}
+
+
+class RenderOptions:
+    """
+    How pages are rasterized and encoded
+    """
+    __slots__ = ("dpi", "fmt", "quality", "max_dimension", "grayscale")
+
+    def __init__(self, dpi: int = DEFAULT_DPI, fmt: str = "png", quality: int = 85,
+                 max_dimension: Optional[int] = None, grayscale: bool = False):
+        fmt = fmt.lower()
+        if fmt == "jpg":
+            fmt = "jpeg"
+        if fmt not in FORMATS:
+            raise ValueError(f"Unsupported format: {fmt}. Use one of {', '.join(FORMATS)}")
+        if not MIN_DPI <= dpi <= MAX_DPI:
+            raise ValueError(f"dpi must be between {MIN_DPI} and {MAX_DPI}")
+        if not 1 <= quality <= 100:
+            raise ValueError("quality must be between 1 and 100")
+        if max_dimension is not None and max_dimension < 1:
+            raise ValueError("max_dimension must be positive")
+        self.dpi = dpi
+        self.fmt = fmt
+        self.quality = quality
+        self.max_dimension = max_dimension
+        self.grayscale = grayscale
+
+    @property
+    def mime_type(self) -> str:
+        return FORMATS[self.fmt][1]
+
+    @property
+    def extension(self) -> str:
+        return FORMATS[self.fmt][2]
+
+
+def count_pages(pdf_path: str) -> int:
+    """
+    Number of pages in a PDF, read from its metadata without rendering
+    """
+    from pdf2image import pdfinfo_from_path
+    return int(pdfinfo_from_path(pdf_path)["Pages"])
+
+
+def page_long_side_points(pdf_path: str, page_number: int) -> Optional[float]:
+    """
+    Longer side of one page (1-based) in points, read by pdfinfo, or None
+    if it cannot be read
+    """
+    from pdf2image import pdfinfo_from_path
+    try:
+        info = pdfinfo_from_path(pdf_path, first_page=page_number, last_page=page_number)
+    except Exception:
+        return None
+    # "Page    3 size" when a page is given, "Page size" otherwise
+    for key, value in info.items():
+        if key.startswith("Page") and key.endswith("size"):
+            match = PAGE_SIZE_RE.match(value)
+            if match:
+                return max(float(match.group(1)), float(match.group(2)))
+    return None
+
+
+def page_range(total_pages: int, first_page: Optional[int] = None,
+               last_page: Optional[int] = None) -> range:
+    """
+    Validate a 1-based inclusive page range against the document
+    """
+    first = first_page or 1
+    last = min(last_page or total_pages, total_pages)
+    if first < 1 or first > total_pages or last < first:
+        raise ValueError(f"Invalid page range {first}-{last_page or total_pages} for {total_pages} pages")
+    return range(first, last + 1)
+
+
+def render_page(pdf_path: str, page_number: int, options: RenderOptions = None) -> bytes:
+    """
+    Rasterize a single page (1-based) and return it encoded
+    """
+    return _render_page_timed(pdf_path, page_number, options)[0]
+
+
+def _render_page_timed(pdf_path: str, page_number: int, options: RenderOptions = None) -> tuple[bytes, float, float]:
+    """
+    render_page, also returning rasterize and encode seconds
+    """
+    from pdf2image import convert_from_path
+    options = options or RenderOptions()
+    start = time.perf_counter()
+    # A cap under this page's size at this dpi is passed to poppler
+    # (-scale-to), so previews never rasterize the full-resolution page.
+    # -scale-to also enlarges, so it is only used when the page's real size
+    # is known and bigger; otherwise the page is rendered at dpi and shrunk.
+    scale_to = None
+    if options.max_dimension:
+        long_side = page_long_side_points(pdf_path, page_number)
+        if long_side and options.max_dimension < long_side / 72 * options.dpi:
+            scale_to = options.max_dimension
+    image = convert_from_path(
+        pdf_path,
+        dpi=options.dpi,
+        first_page=page_number,
+        last_page=page_number,
+        grayscale=options.grayscale,
+        size=scale_to
+    )[0]
+    rendered = time.perf_counter()
+    try:
+        if options.max_dimension:
+            # Only ever shrinks, keeping the aspect ratio; a no-op when
+            # poppler already scaled the page
+            image.thumbnail((options.max_dimension, options.max_dimension))
+
+        pil_format = FORMATS[options.fmt][0]
+        save_args = {} if options.fmt == "png" else {"quality": options.quality}
+        buffered = BytesIO()
+        image.save(buffered, format=pil_format, **save_args)
+        return buffered.getvalue(), rendered - start, time.perf_counter() - rendered
+    finally:
+        image.close()
+
+
+def iter_rendered_pages(pdf_path: str, page_numbers: Iterable[int],
+                        options: RenderOptions = None,
+                        threads: int = DEFAULT_RENDER_THREADS,
+                        stages: Optional[Dict[str, float]] = None) -> Iterator[tuple[int, bytes]]:
+    """
+    Yield (page number, encoded image) in page order.
+
+    Up to ``threads`` pages are rendered concurrently (each by its own
+    poppler process) and at most that many finished pages are held in
+    memory at once, regardless of document length. Per-page rasterize and
+    encode times go to the render histograms and, summed, to ``stages``.
+    """
+    threads = max(1, min(threads, MAX_RENDER_THREADS))
+    pages = iter(page_numbers)
+    with ThreadPoolExecutor(max_workers=threads, thread_name_prefix="render") as executor:
+        pending = deque()
+        for page_number in pages:
+            pending.append((page_number, executor.submit(_render_page_timed, pdf_path, page_number, options)))
+            if len(pending) >= threads:
+                break
+        try:
+            while pending:
+                page_number, future = pending.popleft()
+                data, render_seconds, encode_seconds = future.result()
+                RENDER_STAGE_SECONDS.observe(render_seconds, stage="rasterize")
+                RENDER_STAGE_SECONDS.observe(encode_seconds, stage="encode")
+                if stages is not None:
+                    add_stage(stages, "render.rasterize", render_seconds)
+                    add_stage(stages, "render.encode", encode_seconds)
+                next_page = next(pages, None)
+                if next_page is not None:
+                    pending.append((next_page, executor.submit(_render_page_timed, pdf_path, next_page, options)))
+                yield page_number, data
+        finally:
+            for _, future in pending:
+                future.cancel()
+
@@ -0,0 +1,176 @@
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+# Job limits (override with environment variables)
+JOB_MAX_PENDING = int(os.getenv("JOB_MAX_PENDING", "100"))
+JOB_TTL_SECONDS = int(os.getenv("JOB_TTL_SECONDS", str(60 * 60)))
+JOB_MAX_FINISHED = int(os.getenv("JOB_MAX_FINISHED", "1000"))
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+FINISHED = (DONE, FAILED)
+
+
+class JobsBusyError(Exception):
+    """
+    Raised when JOB_MAX_PENDING jobs are already queued or running
+    """
+
+
+class Job:
+    """
+    Progress of one background parse. Watchers await ``wait_for_change``
+    and re-read the snapshot after every update.
+    """
+    __slots__ = ("job_id", "status", "pages_done", "total_pages", "error",
+                 "created_at", "finished_at", "version", "_changed")
+
+    def __init__(self, job_id: str):
+        self.job_id = job_id
+        self.status = QUEUED
+        self.pages_done = 0
+        self.total_pages: Optional[int] = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        # Bumped on every update so watchers can tell what they have seen
+        self.version = 0
+        self._changed = asyncio.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED
+
+    def _notify(self):
+        self.version += 1
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def set_progress(self, pages_done: int, total_pages: int):
+        # Progress can arrive after the result; never move a finished job
+        if self.finished:
+            return
+        self.status = RUNNING
+        self.pages_done = pages_done
+        self.total_pages = total_pages
+        self._notify()
+
+    def finish(self, error: Optional[str] = None, total_pages: Optional[int] = None):
+        self.status = FAILED if error else DONE
+        self.error = error
+        if total_pages is not None:
+            self.total_pages = total_pages
+        if not error and self.total_pages is not None:
+            self.pages_done = self.total_pages
+        self.finished_at = time.time()
+        self._notify()
+
+    async def wait_for_change(self, seen_version: int, timeout: float) -> bool:
+        """
+        Wait until the job is newer than ``seen_version``; False if
+        ``timeout`` passed first
+        """
+        if self.version != seen_version:
+            return True
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "pages_done": self.pages_done,
+            "total_pages": self.total_pages,
+            "error": self.error
+        }
+
+
+class JobManager:
+    """
+    In-process registry of background parse jobs.
+
+    Each job runs as an asyncio task on the event loop (the parsing itself
+    happens in the parse pool). Finished jobs are kept for ``ttl_seconds``
+    so clients can still poll them; the parsed result itself lives in the
+    session store under the same id.
+    """
+    def __init__(self, max_pending: int = JOB_MAX_PENDING,
+                 ttl_seconds: int = JOB_TTL_SECONDS,
+                 max_finished: int = JOB_MAX_FINISHED):
+        self.max_pending = max_pending
+        self.ttl_seconds = ttl_seconds
+        self.max_finished = max_finished
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        # Strong references so running tasks are not garbage collected
+        self._tasks: Set[asyncio.Task] = set()
+        self.completed = 0
+        self.failed = 0
+
+    @property
+    def pending(self) -> int:
+        return sum(1 for job in self._jobs.values() if not job.finished)
+
+    def start(self, job_id: str, run: Callable[[Job], Awaitable[None]]) -> Job:
+        """
+        Register a job and start ``run(job)`` in the background. ``run``
+        reports progress on the job; the manager marks it finished.
+        """
+        self._prune()
+        if self.pending >= self.max_pending:
+            raise JobsBusyError(f"{self.pending} jobs already pending")
+
+        job = Job(job_id)
+        self._jobs[job_id] = job
+        task = asyncio.create_task(self._run(job, run))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    async def _run(self, job: Job, run: Callable[[Job], Awaitable[None]]):
+        try:
+            await run(job)
+        except asyncio.CancelledError:
+            job.finish(error="Job cancelled")
+            self.failed += 1
+            raise
+        except Exception as e:
+            job.finish(error=str(e))
+            self.failed += 1
+        else:
+            if not job.finished:
+                job.finish()
+            self.completed += 1
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def _prune(self):
+        cutoff = time.time() - self.ttl_seconds
+        finished = [job for job in self._jobs.values() if job.finished]
+        excess = len(finished) - self.max_finished
+        for job in finished:
+            if excess > 0 or job.finished_at < cutoff:
+                del self._jobs[job.job_id]
+                excess -= 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "pending": self.pending,
+            "tracked": len(self._jobs),
+            "max_pending": self.max_pending,
+            "completed": self.completed,
+            "failed": self.failed
+        }
+
+    def cancel_all(self):
+        for task in list(self._tasks):
+            task.cancel()
+
+
+# Shared job registry used by the API routes
+job_manager = JobManager()
@@ -0,0 +1,139 @@
+import re
+from bisect import bisect_right
+from typing import Dict, List, Optional
+
+# Keyword vocabularies for each kind of syllabus line
+COURSE_NAME_KEYWORDS = ['course:', 'class:', 'subject:', 'course title:', 'course name:']
+INSTRUCTOR_KEYWORDS = ['instructor:', 'professor:', 'teacher:', 'faculty:', 'lecturer:']
+ASSIGNMENT_KEYWORDS = ['assignment', 'homework', 'project', 'essay', 'paper', 'lab', 'quiz', 'exam']
+DAYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+DATE_KEYWORDS = ['deadline', 'due', 'exam', 'test', 'final', 'midterm', 'holiday', 'break']
+
+def keyword_pattern(keywords: List[str]) -> re.Pattern:
+    """
+    Compile a keyword list into one alternation regex (longest keywords first)
+    """
+    return re.compile("|".join(re.escape(k) for k in sorted(keywords, key=len, reverse=True)))
+
+# Line categories, each classified with a single alternation over the
+# lowercased document. No keyword contains a newline, so a line belongs to a
+# category exactly when it contains one of the category's keywords.
+LINE_CATEGORIES = {
+    "course_name": keyword_pattern(COURSE_NAME_KEYWORDS),
+    "instructor": keyword_pattern(INSTRUCTOR_KEYWORDS),
+    "assignment": keyword_pattern(ASSIGNMENT_KEYWORDS),
+    "schedule": keyword_pattern(DAYS),
+    "important_date": keyword_pattern(DATE_KEYWORDS),
+}
+
+# Document-wide patterns restricted to a single line ([^\S\n] instead of \s)
+COURSE_CODE_RE = re.compile(r'([A-Z]{2,4}[^\S\n]*\d{3,4}[A-Z]?)', re.IGNORECASE)
+SEMESTER_RE = re.compile(r'(spring|summer|fall|winter)[^\S\n]*(\d{4})')
+
+
+class LineScan:
+    """
+    The document split, lowercased and classified once.
+
+    ``lines`` and ``lines_lower`` are parallel lists; ``categories`` maps each
+    category in LINE_CATEGORIES to the indices of its lines, in order.
+    """
+    def __init__(self, text: str):
+        self.text = text
+        self.lines = text.split('\n')
+        self.text_lower = text.lower()
+        self.lines_lower = self.text_lower.split('\n')
+
+        # Offsets of each line start in text_lower, for mapping matches to lines
+        self._line_starts = []
+        offset = 0
+        for line in self.lines_lower:
+            self._line_starts.append(offset)
+            offset += len(line) + 1
+
+        self.categories: Dict[str, List[int]] = {
+            name: self._matching_lines(pattern, self.text_lower)
+            for name, pattern in LINE_CATEGORIES.items()
+        }
+
+    def line_index(self, offset: int) -> int:
+        return bisect_right(self._line_starts, offset) - 1
+
+    def _matching_lines(self, pattern: re.Pattern, text: str) -> List[int]:
+        indices = []
+        last = -1
+        for match in pattern.finditer(text):
+            index = self.line_index(match.start())
+            if index != last:
+                indices.append(index)
+                last = index
+        return indices
+
+    def first_course_code(self) -> Optional[str]:
+        """
+        Course code from the first line that has one
+        """
+        match = COURSE_CODE_RE.search(self.text)
+        return match.group(1) if match else None
+
+    def last_semester(self) -> Optional[re.Match]:
+        """
+        First semester/year match on the last line that has one
+        """
+        found = None
+        found_line = -1
+        for match in SEMESTER_RE.finditer(self.text_lower):
+            index = self.line_index(match.start())
+            if index != found_line:
+                found, found_line = match, index
+        return found
+
+
+# Line categories that show a page has content for each parser section
+SECTION_CATEGORIES = {
+    "course_info": ("course_name", "instructor"),
+    "assignments": ("assignment",),
+    "schedule": ("schedule",),
+    "important_dates": ("important_date",),
+}
+
+
+class SectionCoverage:
+    """
+    Page-by-page record of which sections have found content, for stopping
+    early. A page is stale when none of its section lines is new (repeated
+    headers and footers don't count); ``stale_pages`` counts consecutive
+    stale pages once every section has been found.
+    """
+    def __init__(self, sections):
+        self.missing = set(sections)
+        self._patterns = {
+            section: [LINE_CATEGORIES[category] for category in SECTION_CATEGORIES[section]]
+            for section in self.missing
+        }
+        self._seen_lines = set()
+        self.stale_pages = 0
+
+    @property
+    def complete(self) -> bool:
+        return not self.missing
+
+    def add_page(self, text: str):
+        new_content = False
+        for line in (text or "").split("\n"):
+            line_lower = line.lower()
+            matched = False
+            for section, patterns in self._patterns.items():
+                if any(pattern.search(line_lower) for pattern in patterns) or (
+                        section == "course_info" and COURSE_CODE_RE.search(line)):
+                    matched = True
+                    self.missing.discard(section)
+            key = line_lower.strip()
+            if matched and key not in self._seen_lines:
+                self._seen_lines.add(key)
+                new_content = True
+
+        if self.missing or new_content:
+            self.stale_pages = 0
+        else:
+            self.stale_pages += 1
@@ -0,0 +1,210 @@
+import contextvars
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Default buckets (seconds) for stage and request durations
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+PAGE_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+BYTE_BUCKETS = (16 * 1024, 64 * 1024, 256 * 1024, 1024 * 1024, 4 * 1024 * 1024, 10 * 1024 * 1024, 50 * 1024 * 1024)
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labels: Iterable[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.label_names)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"] + self._samples()
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: Iterable[str] = ()):
+        super().__init__(name, help_text, labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: str):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            return [f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"
+                    for key, value in sorted(self._values.items())]
+
+
+class Gauge(_Metric):
+    """
+    Gauge read from a callback at scrape time; the callback returns
+    {label values tuple: value} (use () when there are no labels)
+    """
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, callback: Callable[[], Dict[Tuple[str, ...], float]],
+                 labels: Iterable[str] = ()):
+        super().__init__(name, help_text, labels)
+        self._callback = callback
+
+    def _samples(self) -> List[str]:
+        try:
+            values = self._callback()
+        except Exception:
+            return []
+        return [f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"
+                for key, value in sorted(values.items())]
+
+
+class CallbackCounter(Gauge):
+    """
+    Counter read from a callback at scrape time, for totals that are kept
+    elsewhere (e.g. cache hit/miss counts); values must only ever increase
+    """
+    kind = "counter"
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: Iterable[str] = (),
+                 buckets: Iterable[float] = DURATION_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> (bucket counts, sum, count)
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels: str):
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            if index < len(self.buckets):
+                series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def _samples(self) -> List[str]:
+        lines = []
+        with self._lock:
+            series_items = sorted((key, [list(s[0]), s[1], s[2]]) for key, s in self._series.items())
+        inf_label = 'le="+Inf"'
+        for key, (counts, total, count) in series_items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, key, le)} {cumulative}")
+            lines.append(f"{self.name}_bucket{_format_labels(self.label_names, key, inf_label)} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, key)} {count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """
+        Prometheus text exposition format (version 0.0.4)
+        """
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+PARSE_STAGE_SECONDS = registry.register(Histogram(
+    "syllabus_parse_stage_seconds", "Time spent in each PDF parsing stage", labels=("stage",)))
+PARSE_PAGES = registry.register(Histogram(
+    "syllabus_parse_pages", "Pages per parsed PDF", buckets=PAGE_BUCKETS))
+PARSE_BYTES = registry.register(Histogram(
+    "syllabus_parse_bytes", "Bytes per parsed PDF", buckets=BYTE_BUCKETS))
+RENDER_STAGE_SECONDS = registry.register(Histogram(
+    "syllabus_render_stage_seconds", "Time spent rasterizing and encoding each page", labels=("stage",)))
+RENDER_PAGES = registry.register(Histogram(
+    "syllabus_render_pages", "Pages rendered per conversion request", buckets=PAGE_BUCKETS))
+RENDER_BYTES = registry.register(Histogram(
+    "syllabus_render_bytes", "Bytes per PDF sent for conversion", buckets=BYTE_BUCKETS))
+REQUEST_SECONDS = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request duration until response headers",
+    labels=("method", "path", "status")))
+
+
+# Per-request stage breakdown, filled in by routes and read by the
+# slow-request log. The middleware sets a fresh dict for each request.
+_request_stages: contextvars.ContextVar[Optional[Dict[str, float]]] = contextvars.ContextVar(
+    "request_stages", default=None)
+
+
+def start_request_stages() -> Dict[str, float]:
+    stages: Dict[str, float] = {}
+    _request_stages.set(stages)
+    return stages
+
+
+def request_stages() -> Dict[str, float]:
+    """
+    The current request's stage dict (a throwaway dict outside a request).
+    Capture it on the event loop before handing work to other threads.
+    """
+    stages = _request_stages.get()
+    return stages if stages is not None else {}
+
+
+def add_stage(stages: Dict[str, float], stage: str, seconds: float):
+    stages[stage] = stages.get(stage, 0.0) + seconds
+
+
+def observe_parse(stats: Dict, stages: Optional[Dict[str, float]] = None):
+    """
+    Record a parse's stage timings, page count and size (as returned by
+    the parser) in the histograms and the request's stage breakdown
+    """
+    for stage, seconds in stats.get("stages", {}).items():
+        PARSE_STAGE_SECONDS.observe(seconds, stage=stage)
+        if stages is not None:
+            add_stage(stages, f"parse.{stage}", seconds)
+    if "pages" in stats:
+        PARSE_PAGES.observe(stats["pages"])
+    if "bytes" in stats:
+        PARSE_BYTES.observe(stats["bytes"])
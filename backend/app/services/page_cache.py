@@ -0,0 +1,96 @@
+import hashlib
+import os
+from typing import Any, Dict, Optional
+
+from pdfminer.pdftypes import PDFObjRef, PDFStream
+from pdfminer.psparser import PSKeyword, PSLiteral
+
+from app.services.parse_cache import ParseCache
+from app.services.pdf_parser import PARSER_VERSION
+
+# Page cache sizing (override with environment variables). The memory tier
+# is per process; the optional disk tier is shared by every parser process
+# on a host and is what lets a re-upload handled by another worker reuse pages.
+PAGE_CACHE_MAX_BYTES = int(os.getenv("PAGE_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+PAGE_CACHE_DIR = os.getenv("PAGE_CACHE_DIR")  # unset disables the disk tier
+PAGE_CACHE_DISK_MAX_BYTES = int(os.getenv("PAGE_CACHE_DISK_MAX_BYTES", str(256 * 1024 * 1024)))
+
+
+class PageFingerprinter:
+    """
+    Hashes pages by what their extracted text and tables depend on: the
+    content streams, the resources they draw with (fonts, XObjects, ...)
+    and the page geometry.
+
+    Indirect objects are hashed once per document, so fonts shared by
+    every page are only read once. Streams are hashed as stored
+    (undecoded), which is cheap and stable for pages a revision left alone.
+    """
+    def __init__(self):
+        self._objects: Dict[Any, bytes] = {}
+
+    def page_key(self, page, include_tables: bool) -> str:
+        page_obj = page.page_obj
+        digest = hashlib.sha256()
+        digest.update(f"{PARSER_VERSION}|{int(include_tables)}|{page.bbox}|"
+                      f"{page_obj.mediabox}|{page_obj.cropbox}|{page_obj.rotate}|".encode())
+        for stream in page_obj.contents:
+            digest.update(self._digest(stream, set()))
+        digest.update(self._digest(page_obj.resources, set()))
+        return digest.hexdigest()
+
+    def _digest(self, obj: Any, visiting: set) -> bytes:
+        if isinstance(obj, PDFObjRef):
+            key = obj.objid
+            cached = self._objects.get(key)
+            if cached is not None:
+                return cached
+            if key in visiting:
+                # Reference cycle (e.g. a /Parent link); the id is enough
+                return f"ref:{obj.objid}".encode()
+            visiting.add(key)
+            try:
+                value = self._digest(obj.resolve(), visiting)
+            finally:
+                visiting.discard(key)
+            self._objects[key] = value
+            return value
+
+        digest = hashlib.sha256()
+        if isinstance(obj, PDFStream):
+            digest.update(b"stream")
+            digest.update(self._digest(obj.attrs, visiting))
+            digest.update(obj.get_rawdata() or b"")
+        elif isinstance(obj, dict):
+            digest.update(b"dict")
+            for key in sorted(obj, key=str):
+                digest.update(str(key).encode())
+                digest.update(self._digest(obj[key], visiting))
+        elif isinstance(obj, (list, tuple)):
+            digest.update(b"list")
+            for item in obj:
+                digest.update(self._digest(item, visiting))
+        elif isinstance(obj, (PSLiteral, PSKeyword)):
+            digest.update(b"name" + str(obj.name).encode())
+        else:
+            digest.update(repr(obj).encode())
+        return digest.digest()
+
+
+def cached_page(key: str) -> Optional[tuple]:
+    """
+    (text, tables) extracted earlier for a page with this key, or None
+    """
+    entry = page_cache.get(key)
+    if entry is None:
+        return None
+    return entry["text"], entry["tables"]
+
+
+def store_page(key: str, text: str, tables: list):
+    page_cache.put(key, {"text": text, "tables": tables})
+
+
+# Per-process page cache used by the parser
+page_cache = ParseCache(max_bytes=PAGE_CACHE_MAX_BYTES, cache_dir=PAGE_CACHE_DIR,
+                        disk_max_bytes=PAGE_CACHE_DISK_MAX_BYTES)
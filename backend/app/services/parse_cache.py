@@ -0,0 +1,239 @@
+import asyncio
+import hashlib
+import orjson
+import os
+import tempfile
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.services.pdf_parser import PARSER_VERSION
+
+# Cache sizing (override with environment variables)
+PARSE_CACHE_MAX_BYTES = int(os.getenv("PARSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+PARSE_CACHE_DIR = os.getenv("PARSE_CACHE_DIR")  # unset disables the disk tier
+PARSE_CACHE_DISK_MAX_BYTES = int(os.getenv("PARSE_CACHE_DISK_MAX_BYTES", str(512 * 1024 * 1024)))
+
+# Disk eviction trims to this fraction of the budget, so the directory is
+# scanned once per batch of evictions rather than on every put
+DISK_EVICT_TO = 0.9
+
+
+def make_cache_key(content_hash: str, semester_start_date: str | None = None, *extra: str) -> str:
+    """
+    Build a cache key from the PDF's SHA-256, the semester start date and the
+    parser version, so a parser change never serves stale results
+    """
+    parts = [content_hash, semester_start_date or "", PARSER_VERSION, *extra]
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+class ParseCache:
+    """
+    Two-tier cache of parse results.
+
+    Entries are stored as encoded JSON so their size is known exactly. The
+    memory tier is an LRU bounded by ``max_bytes``; the optional disk tier
+    keeps one file per key and evicts the least recently used files once
+    ``disk_max_bytes`` is exceeded.
+    """
+    def __init__(self, max_bytes: int = PARSE_CACHE_MAX_BYTES,
+                 cache_dir: Optional[str] = PARSE_CACHE_DIR,
+                 disk_max_bytes: int = PARSE_CACHE_DISK_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+        self.disk_max_bytes = disk_max_bytes
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        # Parses currently running, so concurrent identical uploads share one
+        self._pending: Dict[str, asyncio.Future] = {}
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_evictions = 0
+        # Running estimate of the disk tier's size, from one scan plus this
+        # process's writes; rescanned whenever it goes over budget, since
+        # other processes share the directory
+        self._disk_bytes: Optional[int] = None
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached result for ``key`` or None
+        """
+        blob = self._memory.get(key)
+        if blob is not None:
+            self._memory.move_to_end(key)
+            self.memory_hits += 1
+            return orjson.loads(blob)
+
+        blob = self._disk_get(key)
+        if blob is not None:
+            self.disk_hits += 1
+            self._memory_put(key, blob)
+            return orjson.loads(blob)
+
+        self.misses += 1
+        return None
+
+    def put(self, key: str, value: Dict[str, Any]):
+        blob = orjson.dumps(value)
+        self._memory_put(key, blob)
+        self._disk_put(key, blob)
+
+    async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """
+        Return the cached result for ``key``, computing and storing it on a
+        miss. Concurrent callers with the same key wait on a single compute,
+        which runs to completion (and is cached) even if they are cancelled.
+        """
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+
+        pending = self._pending.get(key)
+        if pending is None:
+            # The compute runs in its own task, so a caller that is cancelled
+            # (e.g. its client disconnected) never cancels it for the others
+            pending = asyncio.ensure_future(self._compute(key, compute))
+            # Retrieve the outcome even if every caller has gone away
+            pending.add_done_callback(lambda task: task.cancelled() or task.exception())
+            self._pending[key] = pending
+        return await asyncio.shield(pending)
+
+    async def _compute(self, key: str, compute: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        try:
+            value = await compute()
+            self.put(key, value)
+            return value
+        finally:
+            del self._pending[key]
+
+    def clear(self):
+        self._memory.clear()
+        self._memory_bytes = 0
+        if self.cache_dir:
+            for path, _, _ in self._disk_entries():
+                self._unlink(path)
+            self._disk_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        stats = {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_ratio": round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory_bytes,
+            "memory_max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+            "disk_enabled": bool(self.cache_dir)
+        }
+        if self.cache_dir:
+            entries = self._disk_entries()
+            stats.update({
+                "disk_entries": len(entries),
+                "disk_bytes": sum(size for _, size, _ in entries),
+                "disk_max_bytes": self.disk_max_bytes,
+                "disk_evictions": self.disk_evictions
+            })
+        return stats
+
+    # Memory tier
+
+    def _memory_put(self, key: str, blob: bytes):
+        if len(blob) > self.max_bytes:
+            return
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_bytes -= len(old)
+        self._memory[key] = blob
+        self._memory_bytes += len(blob)
+        while self._memory_bytes > self.max_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+            self.evictions += 1
+
+    # Disk tier
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _disk_get(self, key: str) -> Optional[bytes]:
+        if not self.cache_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, "rb") as f:
+                blob = f.read()
+            # Bump mtime so eviction sees this entry as recently used
+            os.utime(path)
+            return blob
+        except OSError:
+            return None
+
+    def _disk_put(self, key: str, blob: bytes):
+        if not self.cache_dir or len(blob) > self.disk_max_bytes:
+            return
+        path = self._disk_path(key)
+        tmp_path = None
+        try:
+            # Created on first write, so an unused cache leaves no directory
+            os.makedirs(self.cache_dir, exist_ok=True)
+            try:
+                replaced = os.path.getsize(path)
+            except OSError:
+                replaced = 0
+            # Write atomically so readers in other processes never see partial files
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(blob)
+            os.replace(tmp_path, path)
+        except OSError:
+            if tmp_path:
+                self._unlink(tmp_path)
+            return
+        if self._disk_bytes is not None:
+            self._disk_bytes += len(blob) - replaced
+        if self._disk_bytes is None or self._disk_bytes > self.disk_max_bytes:
+            self._disk_evict()
+
+    def _disk_entries(self) -> list[tuple[str, int, float]]:
+        entries = []
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if entry.name.endswith(".json"):
+                        try:
+                            st = entry.stat()
+                        except OSError:
+                            continue
+                        entries.append((entry.path, st.st_size, st.st_mtime))
+        except OSError:
+            pass
+        return entries
+
+    def _disk_evict(self):
+        entries = self._disk_entries()
+        total = sum(size for _, size, _ in entries)
+        if total > self.disk_max_bytes:
+            target = self.disk_max_bytes * DISK_EVICT_TO
+            # Oldest first
+            for path, size, _ in sorted(entries, key=lambda e: e[2]):
+                if total <= target:
+                    break
+                self._unlink(path)
+                total -= size
+                self.disk_evictions += 1
+        self._disk_bytes = total
+
+    @staticmethod
+    def _unlink(path: str):
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+# Shared cache used by the API routes
+parse_cache = ParseCache()
@@ -0,0 +1,255 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Iterable
+
+from app.services.pdf_parser import PDFParser
+from app.services.warmup import WARMUP_ENABLED, warm_up_worker, worker_ready
+
+# Pool sizing (override with environment variables)
+PARSE_POOL_WORKERS = int(os.getenv("PARSE_POOL_WORKERS", str(os.cpu_count() or 2)))
+PARSE_POOL_QUEUE_SIZE = int(os.getenv("PARSE_POOL_QUEUE_SIZE", "16"))
+PARSE_POOL_RETRY_AFTER = int(os.getenv("PARSE_POOL_RETRY_AFTER", "5"))
+
+
+class PoolBusyError(Exception):
+    """
+    Raised when every worker is busy and the wait queue is full
+    """
+    def __init__(self, retry_after: int):
+        super().__init__("Parser pool is at capacity")
+        self.retry_after = retry_after
+
+
+def run_parser(file_path: str, semester_start_date: str | None = None,
+               sections: Iterable[str] | None = None,
+               progress_queue=None, progress_token: str | None = None,
+               page_limits: Dict[str, int] | None = None) -> Dict[str, Any]:
+    """
+    Parse a PDF inside a pool worker and return everything the routes need.
+    Page progress is reported as (token, done, total) on ``progress_queue``;
+    ``page_limits`` are passed to parse_pdf as keyword arguments.
+    """
+    progress = None
+    if progress_queue is not None:
+        def progress(done: int, total: int):
+            progress_queue.put((progress_token, done, total))
+    
+    parser = PDFParser()
+    parsed_data = parser.parse_pdf(file_path, semester_start_date, sections, progress, **(page_limits or {}))
+    return {
+        "parsed_data": parsed_data,
+        "text_content": parser.text_content,
+        "stats": parser.stats
+    }
+
+
+class ParsePool:
+    """
+    Process pool for CPU-bound PDF parsing with a bounded wait queue.
+
+    Jobs beyond ``max_workers`` wait in the queue; once ``max_queue`` jobs
+    are waiting, new submissions are rejected with ``PoolBusyError`` instead
+    of piling up behind the event loop. Background work (jobs, batches)
+    passes ``wait=True`` to wait for a free slot instead.
+    """
+    def __init__(self, max_workers: int = PARSE_POOL_WORKERS,
+                 max_queue: int = PARSE_POOL_QUEUE_SIZE,
+                 retry_after: int = PARSE_POOL_RETRY_AFTER):
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self.retry_after = retry_after
+        self._executor: ProcessPoolExecutor | None = None
+        # Progress reporting, started on first use: a manager queue workers
+        # write to, drained by a thread that calls the registered callbacks
+        self._manager = None
+        self._progress_queue = None
+        self._progress_callbacks: Dict[str, Callable[[int, int], None]] = {}
+        self._progress_lock = threading.Lock()
+        # Submitted but not yet finished; only touched from the event loop
+        self._in_flight = 0
+        # Futures of submit(wait=True) callers waiting for a slot
+        self._waiters: deque = deque()
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    @property
+    def busy_workers(self) -> int:
+        return min(self._in_flight, self.max_workers)
+
+    @property
+    def queue_depth(self) -> int:
+        return max(0, self._in_flight - self.max_workers)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Each worker parses a tiny built-in PDF before taking jobs, so
+            # the first real parse on it pays no import or first-use cost
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=warm_up_worker if WARMUP_ENABLED else None
+            )
+        return self._executor
+
+    @property
+    def _full(self) -> bool:
+        return self._in_flight >= self.max_workers + self.max_queue
+
+    async def submit(self, fn: Callable[..., Any], *args: Any, wait: bool = False) -> Any:
+        """
+        Run ``fn(*args)`` in a worker process and await its result. When the
+        pool is full, raise PoolBusyError, or with ``wait`` wait for a slot.
+        """
+        loop = asyncio.get_running_loop()
+        if self._full:
+            if not wait:
+                self.rejected += 1
+                raise PoolBusyError(self.retry_after)
+            while self._full:
+                waiter = loop.create_future()
+                self._waiters.append(waiter)
+                try:
+                    await waiter
+                except asyncio.CancelledError:
+                    # Pass on a wakeup this caller can no longer use
+                    if waiter.done() and not waiter.cancelled():
+                        self._wake_next()
+                    raise
+                finally:
+                    if waiter in self._waiters:
+                        self._waiters.remove(waiter)
+
+        executor = self._get_executor()
+        try:
+            future = executor.submit(fn, *args)
+        except BrokenProcessPool:
+            # A worker died since the last job finished; start a new pool
+            self._discard_executor(executor)
+            executor = self._get_executor()
+            future = executor.submit(fn, *args)
+        self._in_flight += 1
+        # Count the slot as busy until the worker is actually done, even if
+        # the awaiting request is cancelled (e.g. the client disconnects)
+        future.add_done_callback(lambda f: loop.call_soon_threadsafe(self._on_done, f, executor))
+        return await asyncio.wrap_future(future)
+
+    def _on_done(self, future, executor: ProcessPoolExecutor):
+        self._in_flight -= 1
+        self._wake_next()
+        if future.cancelled():
+            self.failed += 1
+        elif future.exception() is not None:
+            self.failed += 1
+            if isinstance(future.exception(), BrokenProcessPool):
+                # A worker died (e.g. out of memory on a hostile PDF); the
+                # next submit starts a new pool instead of failing forever
+                self._discard_executor(executor)
+        else:
+            self.completed += 1
+
+    def _discard_executor(self, executor: ProcessPoolExecutor):
+        if self._executor is executor:
+            self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _wake_next(self):
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+
+    async def parse(self, file_path: str, semester_start_date: str | None = None,
+                    sections: Iterable[str] | None = None,
+                    progress: Callable[[int, int], None] | None = None,
+                    wait: bool = False,
+                    page_limits: Dict[str, int] | None = None) -> Dict[str, Any]:
+        """
+        Parse in a worker; ``progress(done, total)`` is called on the event
+        loop as pages are extracted
+        """
+        if progress is None:
+            return await self.submit(run_parser, file_path, semester_start_date, sections,
+                                     None, None, page_limits, wait=wait)
+        
+        loop = asyncio.get_running_loop()
+        token = uuid.uuid4().hex
+        self._progress_callbacks[token] = lambda done, total: loop.call_soon_threadsafe(progress, done, total)
+        try:
+            queue = self._get_progress_queue()
+            return await self.submit(run_parser, file_path, semester_start_date, sections,
+                                     queue, token, page_limits, wait=wait)
+        finally:
+            self._progress_callbacks.pop(token, None)
+    
+    async def warm_up(self) -> float:
+        """
+        Start every worker process and wait until all of them have run the
+        warm-up initializer. Not counted in the job stats. Returns seconds.
+        """
+        start = time.perf_counter()
+        executor = self._get_executor()
+        # Workers are spawned per pending task, so one task each starts them all
+        futures = [asyncio.wrap_future(executor.submit(worker_ready)) for _ in range(self.max_workers)]
+        await asyncio.gather(*futures)
+        return time.perf_counter() - start
+    
+    def _get_progress_queue(self):
+        with self._progress_lock:
+            if self._progress_queue is None:
+                self._manager = multiprocessing.Manager()
+                self._progress_queue = self._manager.Queue()
+                threading.Thread(target=self._drain_progress, args=(self._progress_queue,),
+                                 name="parse-progress", daemon=True).start()
+            return self._progress_queue
+    
+    def _drain_progress(self, queue):
+        while True:
+            try:
+                item = queue.get()
+            except (EOFError, OSError):
+                return
+            if item is None:
+                return
+            token, done, total = item
+            callback = self._progress_callbacks.get(token)
+            if callback is not None:
+                try:
+                    callback(done, total)
+                except RuntimeError:
+                    # The requesting event loop has closed
+                    pass
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "busy_workers": self.busy_workers,
+            "queue_depth": self.queue_depth,
+            "waiting": len(self._waiters),
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        with self._progress_lock:
+            if self._manager is not None:
+                self._progress_queue.put(None)
+                self._manager.shutdown()
+                self._manager = None
+                self._progress_queue = None
+
+
+# Shared pool used by the API routes
+parse_pool = ParsePool()
@@ -1,64 +1,377 @@
-import pdfplumber
+import os
 import re
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Callable, Dict, Iterable, List, Any
 from collections import defaultdict
+from app.services.line_scanner import LineScan, SectionCoverage, DAYS
+from app.services.table_scanner import TableScan
+from app.services.date_resolver import find_date_token, resolve_dates
+from app.models.syllabus import SyllabusData
+
+# pdfplumber (and with it pdfminer) is imported where pages are read, so
+# processes that import this module without parsing don't pay for it
+
+# Bump whenever a change alters parse output so cached results are invalidated
+PARSER_VERSION = "6"
+
+# Sections parse_pdf can extract, and those that read tables
+SECTIONS = ("course_info", "assignments", "schedule", "important_dates")
+TABLE_SECTIONS = ("assignments", "schedule")
+
+# Page-parallel extraction: worker processes per document (1 = serial) and the
+# smallest page range worth handing to a separate worker
+PARSER_PAGE_WORKERS = int(os.getenv("PARSER_PAGE_WORKERS", "1"))
+MIN_PAGES_PER_WORKER = int(os.getenv("PARSER_MIN_PAGES_PER_WORKER", "4"))
+
+# Low-memory extraction: release each page's parsed objects as soon as it has
+# been extracted, so peak memory stays flat with page count (0 disables)
+PARSER_LOW_MEMORY = os.getenv("PARSER_LOW_MEMORY", "1") != "0"
+
+# Per-page extraction cache: pages whose content and resources hash the same
+# as a page seen before (e.g. in an earlier revision) are not re-extracted.
+# Off by default unless PAGE_CACHE_DIR is set: identical re-uploads are
+# already served by the whole-document parse cache, and without the disk tier
+# page-parallel workers throw their pages away, so hashing every page rarely
+# pays for itself.
+PARSER_PAGE_CACHE = os.getenv("PARSER_PAGE_CACHE", "1" if os.getenv("PAGE_CACHE_DIR") else "0") != "0"
+
+# Adaptive early stop: stale pages (nothing new once every section has found
+# content) to read before stopping, when a caller enables it without a value
+EARLY_STOP_PATIENCE = int(os.getenv("PARSER_EARLY_STOP_PATIENCE", "2"))
+
+# Field patterns, compiled once
+COURSE_NAME_RE = re.compile(r'(?:course|class|subject|course title|course name):\s*([^\n]+)', re.IGNORECASE)
+INSTRUCTOR_RE = re.compile(r'(?:instructor|professor|teacher|faculty|lecturer):\s*([^\n]+)', re.IGNORECASE)
+ASSIGNMENT_RE = re.compile(r'(assignment|homework|project|essay|paper|lab|quiz|exam)\s*#?\s*(\d+|[IVX]+)')
+SLASH_DATE_RE = re.compile(r'(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})')
+
+# Tried in order; the first pattern that matches wins
+ASSIGNMENT_DATE_PATTERNS = [
+    re.compile(r'due\s*:\s*(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})', re.IGNORECASE),
+    re.compile(r'due\s*date\s*:\s*(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})', re.IGNORECASE),
+    re.compile(r'(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})', re.IGNORECASE),
+    re.compile(r'(\d{4}-\d{2}-\d{2})', re.IGNORECASE)
+]
+TIME_PATTERNS = [
+    re.compile(r'(\d{1,2}:\d{2}\s*[AP]M)', re.IGNORECASE),
+    re.compile(r'(\d{1,2}:\d{2})', re.IGNORECASE),
+    re.compile(r'(\d{1,2}[AP]M)', re.IGNORECASE)
+]
+LOCATION_PATTERNS = [
+    re.compile(r'room\s*(\d+)', re.IGNORECASE),
+    re.compile(r'building\s*([A-Z]+)', re.IGNORECASE),
+    re.compile(r'([A-Z]+\s*\d+)', re.IGNORECASE),  # Common room format like "HSS 101"
+]
+IMPORTANT_DATE_PATTERNS = [
+    re.compile(r'(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})', re.IGNORECASE),
+    re.compile(r'(\d{4}-\d{2}-\d{2})', re.IGNORECASE),
+    re.compile(r'(\w+\s+\d{1,2},?\s+\d{4})', re.IGNORECASE),  # "January 15, 2024"
+]
+TABLE_TIME_RE = re.compile(r'(\d{1,2}:\d{2}\s*[AP]M)', re.IGNORECASE)
+TABLE_LOCATION_RE = re.compile(r'([A-Z]+\s*\d+)')
+
+def _first_group(patterns: List[re.Pattern], text: str) -> str:
+    """
+    Group 1 of the first pattern that matches text, or ""
+    """
+    for pattern in patterns:
+        match = pattern.search(text)
+        if match:
+            return match.group(1)
+    return ""
+
+def _first_day(text_lower: str) -> str:
+    """
+    First weekday (in calendar order) mentioned in a lowercased string
+    """
+    for day in DAYS:
+        if day in text_lower:
+            return day.capitalize()
+    return ""
+
+def _page_cache():
+    # Imported on first use: page_cache builds on parse_cache, which imports this module
+    from app.services import page_cache
+    return page_cache
+
+def _extract_page(page, include_tables: bool = True, low_memory: bool = False,
+                  fingerprinter=None) -> tuple:
+    """
+    Extract (text, tables, text seconds, tables seconds, hash seconds,
+    reused) from one pdfplumber page. With a ``fingerprinter`` the page
+    cache is tried first and fresh results are stored in it. With
+    low_memory the page's char/object caches (and pdfplumber's text map
+    cache) are flushed afterwards.
+    """
+    key = None
+    hash_seconds = 0.0
+    if fingerprinter is not None:
+        start = time.perf_counter()
+        key = fingerprinter.page_key(page, include_tables)
+        cached = _page_cache().cached_page(key)
+        hash_seconds = time.perf_counter() - start
+        if cached is not None:
+            if low_memory:
+                page.close()
+            return cached[0], cached[1], 0.0, 0.0, hash_seconds, True
+    
+    start = time.perf_counter()
+    text = page.extract_text()
+    text_done = time.perf_counter()
+    tables = page.extract_tables() if include_tables else []
+    tables_done = time.perf_counter()
+    if low_memory:
+        page.close()
+    if key is not None:
+        _page_cache().store_page(key, text, tables)
+    return text, tables, text_done - start, tables_done - text_done, hash_seconds, False
+
+def _extract_page_range(file_path: str, start: int, stop: int, include_tables: bool = True,
+                        low_memory: bool = False, use_page_cache: bool = False) -> List[tuple]:
+    """
+    Extract pages [start, stop) as _extract_page does; runs in worker
+    processes, each of which opens the file itself
+    """
+    import pdfplumber
+    fingerprinter = _page_cache().PageFingerprinter() if use_page_cache else None
+    with pdfplumber.open(file_path) as pdf:
+        return [_extract_page(page, include_tables, low_memory, fingerprinter) for page in pdf.pages[start:stop]]
+
+def _split_page_range(page_count: int, workers: int) -> List[tuple[int, int]]:
+    """
+    Split pages into contiguous, near-equal ranges, one per worker
+    """
+    workers = max(1, min(workers, page_count // MIN_PAGES_PER_WORKER))
+    size, extra = divmod(page_count, workers)
+    ranges = []
+    start = 0
+    for i in range(workers):
+        stop = start + size + (1 if i < extra else 0)
+        ranges.append((start, stop))
+        start = stop
+    return ranges
+
+class PageRangeError(ValueError):
+    """
+    Requested pages are not in the document (e.g. first_page past the last page)
+    """
 
 class PDFParser:
-    def __init__(self):
+    def __init__(self, page_workers: int = PARSER_PAGE_WORKERS, low_memory: bool = PARSER_LOW_MEMORY,
+                 page_cache: bool = PARSER_PAGE_CACHE):
         self.text_content = ""
         self.tables = []
         self.parsed_data = {}
+        self.page_workers = page_workers
+        self.low_memory = low_memory
+        self.page_cache = page_cache
+        self._scan = None
+        self._tables_index = None
+        # Source lines referenced by items ("line" is an index into these),
+        # each stored once however many items point at it
+        self.source_lines = []
+        self._source_index = {}
+        # Filled in by parse_pdf: seconds per stage, pages read (of
+        # page_count) and how many came from the page cache, whether it
+        # stopped early, and bytes
+        self.stats = {}
         
-    def parse_pdf(self, file_path: str, semester_start_date: str | None = None) -> Dict[str, Any]:
+    def parse_pdf(self, file_path: str, semester_start_date: str | None = None,
+                  sections: Iterable[str] | None = None,
+                  progress: Callable[[int, int], None] | None = None,
+                  first_page: int | None = None, last_page: int | None = None,
+                  max_pages: int | None = None,
+                  early_stop_patience: int | None = None) -> Dict[str, Any]:
         """
         Parse a PDF file and extract structured syllabus data using pdfplumber
+        
+        Only the requested ``sections`` (default: all of SECTIONS) are
+        extracted; table extraction is skipped when no requested section
+        reads tables. ``raw_text`` is always included. ``progress`` is
+        called with (pages done, total pages) as pages are extracted.
+        
+        Reading can be limited to pages ``first_page``..``last_page``
+        (1-based, inclusive) and to at most ``max_pages`` of them. With
+        ``early_stop_patience``, pages are read in order and reading stops
+        once every requested section has found content and that many pages
+        in a row have added nothing new.
         """
+        sections = SECTIONS if sections is None else tuple(sections)
+        unknown = set(sections) - set(SECTIONS)
+        if unknown:
+            raise ValueError(f"Unknown sections: {', '.join(sorted(unknown))}")
+        for name, value in (("first_page", first_page), ("last_page", last_page),
+                            ("max_pages", max_pages), ("early_stop_patience", early_stop_patience)):
+            if value is not None and value < 1:
+                raise ValueError(f"{name} must be at least 1")
+        if first_page and last_page and last_page < first_page:
+            raise ValueError("last_page must not be before first_page")
+        
+        parse_start = time.perf_counter()
+        self.stats = {"stages": {}, "pages": 0, "page_count": 0, "pages_reused": 0,
+                      "stopped_early": False, "bytes": os.path.getsize(file_path)}
+        
+        # Page indices to read (0-based, end exclusive), clipped to the document later
+        start_index = (first_page or 1) - 1
+        stop_index = last_page
+        if max_pages:
+            stop_index = min(stop_index or start_index + max_pages, start_index + max_pages)
+        coverage = SectionCoverage(sections) if early_stop_patience else None
+        
         try:
-            # Extract text and tables
-            self.text_content, self.tables = self._extract_text_and_tables(file_path)
+            # Extract text, and tables only when a requested section uses them
+            include_tables = any(section in TABLE_SECTIONS for section in sections)
+            self.text_content, self.tables = self._extract_text_and_tables(
+                file_path, include_tables, progress, start_index, stop_index, coverage, early_stop_patience
+            )
             
             # Store semester start date for reference
             self.semester_start_date = semester_start_date
             
-            # Parse different sections with improved algorithms
-            self.parsed_data = {
-                "course_info": self._extract_course_info_improved(),
-                "assignments": self._extract_assignments_improved(),
-                "schedule": self._extract_schedule_improved(),
-                "important_dates": self._extract_important_dates_improved(),
-                "raw_text": self.text_content[:1000] + "..." if len(self.text_content) > 1000 else self.text_content
+            # Parse the requested sections with improved algorithms
+            extractors = {
+                "course_info": self._extract_course_info_improved,
+                "assignments": self._extract_assignments_improved,
+                "schedule": self._extract_schedule_improved,
+                "important_dates": self._extract_important_dates_improved
             }
+            self.parsed_data = {}
+            self.source_lines = []
+            self._source_index = {}
+            for section, extractor in extractors.items():
+                if section in sections:
+                    start = time.perf_counter()
+                    self.parsed_data[section] = extractor()
+                    self.stats["stages"][section] = time.perf_counter() - start
+            
+            # ISO dates for every dated item, resolved in one pass
+            start = time.perf_counter()
+            resolve_dates(self.parsed_data, semester_start_date)
+            self.stats["stages"]["resolve_dates"] = time.perf_counter() - start
+            
+            self.parsed_data["source_lines"] = self.source_lines
+            self.parsed_data["raw_text"] = self.text_content[:1000] + "..." if len(self.text_content) > 1000 else self.text_content
             
+            # Validate the result shape once, here, rather than in every consumer
+            start = time.perf_counter()
+            SyllabusData.model_validate(self.parsed_data)
+            self.stats["stages"]["validate"] = time.perf_counter() - start
+            
+            self.stats["stages"]["total"] = time.perf_counter() - parse_start
             return self.parsed_data
             
+        except PageRangeError:
+            raise
         except Exception as e:
             raise Exception(f"Error parsing PDF: {str(e)}")
     
-    def _extract_text_and_tables(self, file_path: str) -> tuple[str, List]:
+    def _extract_text_and_tables(self, file_path: str, include_tables: bool = True,
+                                 progress: Callable[[int, int], None] | None = None,
+                                 start_index: int = 0, stop_index: int | None = None,
+                                 coverage: SectionCoverage | None = None,
+                                 patience: int | None = None) -> tuple[str, List]:
         """
-        Extract text content and tables from PDF file
+        Extract text content and (optionally) tables from pages
+        [start_index, stop_index) of a PDF file, stopping early once
+        ``coverage`` has seen ``patience`` stale pages
         """
-        text = ""
+        text_parts = []
         tables = []
+        stages = self.stats.setdefault("stages", {})
         
         try:
+            start = time.perf_counter()
+            import pdfplumber
             with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    # Extract text
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-                    
-                    # Extract tables
-                    page_tables = page.extract_tables()
-                    if page_tables:
-                        tables.extend(page_tables)
+                page_count = len(pdf.pages)
+                stages["open"] = time.perf_counter() - start
+                if start_index and start_index >= page_count:
+                    raise PageRangeError(f"first_page {start_index + 1} is past the end of the document "
+                                         f"({page_count} pages)")
+                selected = pdf.pages[start_index:stop_index]
+                fingerprinter = _page_cache().PageFingerprinter() if self.page_cache else None
+                # Early stop needs pages in order, so it always runs serially
+                ranges = [(0, len(selected))] if coverage else _split_page_range(len(selected), self.page_workers)
+                if len(ranges) == 1:
+                    pages = []
+                    for page in selected:
+                        pages.append(_extract_page(page, include_tables, self.low_memory, fingerprinter))
+                        if progress:
+                            progress(len(pages), len(selected))
+                        if coverage:
+                            coverage.add_page(pages[-1][0])
+                            if coverage.complete and coverage.stale_pages >= patience:
+                                self.stats["stopped_early"] = len(pages) < len(selected)
+                                break
             
+            if len(ranges) > 1:
+                # Page-parallel mode: each worker extracts a contiguous range
+                base = min(start_index, page_count)
+                with ProcessPoolExecutor(max_workers=len(ranges)) as executor:
+                    futures = [executor.submit(_extract_page_range, file_path, base + start, base + stop, include_tables, self.low_memory, self.page_cache) for start, stop in ranges]
+                    pages = []
+                    for future in futures:
+                        pages.extend(future.result())
+                        if progress:
+                            progress(len(pages), len(selected))
+            
+            # Merge in page order; identical for serial and parallel modes.
+            # Text/table times are summed across pages (CPU time in parallel mode)
+            stages["extract_text"] = 0.0
+            stages["extract_tables"] = 0.0
+            stages["page_hash"] = 0.0
+            pages_reused = 0
+            for page_text, page_tables, text_seconds, tables_seconds, hash_seconds, reused in pages:
+                if page_text:
+                    text_parts.append(page_text + "\n")
+                
+                if page_tables:
+                    tables.extend(page_tables)
+                
+                stages["extract_text"] += text_seconds
+                stages["extract_tables"] += tables_seconds
+                stages["page_hash"] += hash_seconds
+                pages_reused += reused
+            self.stats["pages"] = len(pages)
+            self.stats["pages_reused"] = pages_reused
+            self.stats["page_count"] = page_count
+            
+        except PageRangeError:
+            raise
         except Exception as e:
             raise Exception(f"Error reading PDF file: {str(e)}")
         
-        return text, tables
+        return "".join(text_parts), tables
+    
+    def _source_ref(self, text: str) -> int:
+        """
+        Index of text in source_lines, adding it the first time
+        """
+        index = self._source_index.get(text)
+        if index is None:
+            index = self._source_index[text] = len(self.source_lines)
+            self.source_lines.append(text)
+        return index
+    
+    def _line_scan(self) -> LineScan:
+        """
+        Split, lowercase and classify the document once and share the result
+        between the section extractors
+        """
+        if self._scan is None or self._scan.text is not self.text_content:
+            self._scan = LineScan(self.text_content)
+        return self._scan
+    
+    def _table_scan(self) -> TableScan:
+        """
+        Normalize and index the tables once and share the result between
+        the section extractors
+        """
+        if self._tables_index is None or self._tables_index.source is not self.tables:
+            self._tables_index = TableScan(self.tables)
+        return self._tables_index
     
     def _extract_course_info_improved(self) -> Dict[str, str]:
         """
@@ -72,35 +385,32 @@ class PDFParser:
             "year": ""
         }
         
-        # Look for course info in text
-        lines = self.text_content.split('\n')
+        scan = self._line_scan()
         
-        for line in lines:
-            line_lower = line.lower().strip()
-            
-            # Course name patterns (more comprehensive)
-            if any(keyword in line_lower for keyword in ['course:', 'class:', 'subject:', 'course title:', 'course name:']):
-                # Extract the part after the colon
-                match = re.search(r'(?:course|class|subject|course title|course name):\s*([^\n]+)', line, re.IGNORECASE)
-                if match:
-                    course_info["course_name"] = match.group(1).strip()
-            
-            # Course code patterns (more flexible)
-            code_match = re.search(r'([A-Z]{2,4}\s*\d{3,4}[A-Z]?)', line, re.IGNORECASE)
-            if code_match and not course_info["course_code"]:
-                course_info["course_code"] = code_match.group(1).upper()
-            
-            # Instructor patterns
-            if any(keyword in line_lower for keyword in ['instructor:', 'professor:', 'teacher:', 'faculty:', 'lecturer:']):
-                match = re.search(r'(?:instructor|professor|teacher|faculty|lecturer):\s*([^\n]+)', line, re.IGNORECASE)
-                if match:
-                    course_info["instructor"] = match.group(1).strip()
-            
-            # Semester/Year patterns
-            semester_match = re.search(r'(spring|summer|fall|winter)\s*(\d{4})', line_lower)
-            if semester_match:
-                course_info["semester"] = semester_match.group(1).capitalize()
-                course_info["year"] = semester_match.group(2)
+        # Course name patterns (the last matching line wins)
+        for index in reversed(scan.categories["course_name"]):
+            match = COURSE_NAME_RE.search(scan.lines[index])
+            if match:
+                course_info["course_name"] = match.group(1).strip()
+                break
+        
+        # Course code patterns (the first matching line wins)
+        course_code = scan.first_course_code()
+        if course_code:
+            course_info["course_code"] = course_code.upper()
+        
+        # Instructor patterns (the last matching line wins)
+        for index in reversed(scan.categories["instructor"]):
+            match = INSTRUCTOR_RE.search(scan.lines[index])
+            if match:
+                course_info["instructor"] = match.group(1).strip()
+                break
+        
+        # Semester/Year patterns (the last matching line wins)
+        semester_match = scan.last_semester()
+        if semester_match:
+            course_info["semester"] = semester_match.group(1).capitalize()
+            course_info["year"] = semester_match.group(2)
         
         return course_info
     
@@ -110,67 +420,53 @@ class PDFParser:
         """
         assignments = []
         
-        # Look for assignment sections in text
-        assignment_keywords = ['assignment', 'homework', 'project', 'essay', 'paper', 'lab', 'quiz', 'exam']
-        
-        lines = self.text_content.split('\n')
+        scan = self._line_scan()
         
-        for line in lines:
-            line_lower = line.lower().strip()
+        # Lines containing assignment-related content
+        for index in scan.categories["assignment"]:
+            line = scan.lines[index]
             
-            # Check if this line contains assignment-related content
-            if any(keyword in line_lower for keyword in assignment_keywords):
-                # Extract assignment number/title
-                assignment_match = re.search(r'(assignment|homework|project|essay|paper|lab|quiz|exam)\s*#?\s*(\d+|[IVX]+)', line_lower)
+            # Extract assignment number/title
+            assignment_match = ASSIGNMENT_RE.search(scan.lines_lower[index])
+            
+            if assignment_match:
+                assignment_type = assignment_match.group(1)
+                assignment_num = assignment_match.group(2)
+                
+                # Extract due date (multiple formats, then the date grammar)
+                due_date = _first_group(ASSIGNMENT_DATE_PATTERNS, line) or find_date_token(line)
                 
-                if assignment_match:
-                    assignment_type = assignment_match.group(1)
-                    assignment_num = assignment_match.group(2)
-                    
-                    # Extract due date (multiple formats)
-                    date_patterns = [
-                        r'due\s*:\s*(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})',
-                        r'due\s*date\s*:\s*(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})',
-                        r'(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})',
-                        r'(\d{4}-\d{2}-\d{2})'
-                    ]
-                    
-                    due_date = ""
-                    for pattern in date_patterns:
-                        date_match = re.search(pattern, line, re.IGNORECASE)
-                        if date_match:
-                            due_date = date_match.group(1)
-                            break
-                    
-                    assignment = {
-                        "title": f"{assignment_type.capitalize()} {assignment_num}",
-                        "due_date": due_date,
-                        "description": line[:200] + "..." if len(line) > 200 else line
-                    }
-                    assignments.append(assignment)
+                assignment = {
+                    "title": f"{assignment_type.capitalize()} {assignment_num}",
+                    "due_date": due_date,
+                    "line": self._source_ref(line)
+                }
+                assignments.append(assignment)
         
-        # Also check tables for assignments
-        for table in self.tables:
-            for row in table:
-                if row and any(cell and any(keyword in str(cell).lower() for keyword in assignment_keywords) for cell in row):
-                    # Process table row as assignment
-                    row_text = " ".join([str(cell) for cell in row if cell])
-                    if any(keyword in row_text.lower() for keyword in assignment_keywords):
-                        assignment_match = re.search(r'(assignment|homework|project|essay|paper|lab|quiz|exam)\s*#?\s*(\d+|[IVX]+)', row_text.lower())
-                        if assignment_match:
-                            assignment_type = assignment_match.group(1)
-                            assignment_num = assignment_match.group(2)
-                            
-                            # Extract due date
-                            date_match = re.search(r'(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})', row_text)
-                            due_date = date_match.group(1) if date_match else ""
-                            
-                            assignment = {
-                                "title": f"{assignment_type.capitalize()} {assignment_num}",
-                                "due_date": due_date,
-                                "description": row_text
-                            }
-                            assignments.append(assignment)
+        # Also check tables for assignments: the due date comes from the due
+        # or date column when the table has one, else from the row, and
+        # falls back to the row's week ("Week 3") in week-by-week schedules
+        for table, row in self._table_scan().categories["assignment"]:
+            assignment_match = ASSIGNMENT_RE.search(row.text_lower)
+            if assignment_match:
+                assignment_type = assignment_match.group(1)
+                assignment_num = assignment_match.group(2)
+                
+                due_date = ""
+                for cell in (row.cell("due"), row.cell("date"), row.text):
+                    date_match = SLASH_DATE_RE.search(cell)
+                    due_date = date_match.group(1) if date_match else find_date_token(cell)
+                    if due_date:
+                        break
+                if not due_date and row.week is not None:
+                    due_date = f"Week {row.week}"
+                
+                assignment = {
+                    "title": f"{assignment_type.capitalize()} {assignment_num}",
+                    "due_date": due_date,
+                    "line": self._source_ref(row.text)
+                }
+                assignments.append(assignment)
         
         return assignments
     
@@ -180,85 +476,49 @@ class PDFParser:
         """
         schedule = []
         
-        # Look for schedule patterns in text
-        days = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
-        
-        lines = self.text_content.split('\n')
+        scan = self._line_scan()
         
-        for line in lines:
-            line_lower = line.lower().strip()
+        # Lines containing a day name
+        for index in scan.categories["schedule"]:
+            line = scan.lines[index]
             
-            # Check if this line contains schedule information
-            if any(day in line_lower for day in days):
-                # Extract day
-                day_found = ""
-                for day in days:
-                    if day in line_lower:
-                        day_found = day.capitalize()
-                        break
-                
-                # Extract time (multiple formats)
-                time_patterns = [
-                    r'(\d{1,2}:\d{2}\s*[AP]M)',
-                    r'(\d{1,2}:\d{2})',
-                    r'(\d{1,2}[AP]M)'
-                ]
-                
-                time_found = ""
-                for pattern in time_patterns:
-                    time_match = re.search(pattern, line, re.IGNORECASE)
-                    if time_match:
-                        time_found = time_match.group(1)
-                        break
-                
-                # Extract location (room/building)
-                location_patterns = [
-                    r'room\s*(\d+)',
-                    r'building\s*([A-Z]+)',
-                    r'([A-Z]+\s*\d+)',  # Common room format like "HSS 101"
-                ]
-                
-                location_found = ""
-                for pattern in location_patterns:
-                    location_match = re.search(pattern, line, re.IGNORECASE)
-                    if location_match:
-                        location_found = location_match.group(1)
-                        break
-                
-                schedule_item = {
-                    "day": day_found,
-                    "time": time_found,
-                    "location": location_found,
-                    "description": line
-                }
-                schedule.append(schedule_item)
+            # Extract day
+            day_found = _first_day(scan.lines_lower[index])
+            
+            # Extract time (multiple formats)
+            time_found = _first_group(TIME_PATTERNS, line)
+            
+            # Extract location (room/building)
+            location_found = _first_group(LOCATION_PATTERNS, line)
+            
+            schedule_item = {
+                "day": day_found,
+                "time": time_found,
+                "location": location_found,
+                "line": self._source_ref(line)
+            }
+            schedule.append(schedule_item)
         
-        # Also check tables for schedule
-        for table in self.tables:
-            for row in table:
-                if row and any(cell and any(day in str(cell).lower() for day in days) for cell in row):
-                    row_text = " ".join([str(cell) for cell in row if cell])
-                    if any(day in row_text.lower() for day in days):
-                        # Extract schedule info from table row
-                        day_found = ""
-                        for day in days:
-                            if day in row_text.lower():
-                                day_found = day.capitalize()
-                                break
-                        
-                        time_match = re.search(r'(\d{1,2}:\d{2}\s*[AP]M)', row_text, re.IGNORECASE)
-                        time_found = time_match.group(1) if time_match else ""
-                        
-                        location_match = re.search(r'([A-Z]+\s*\d+)', row_text)
-                        location_found = location_match.group(1) if location_match else ""
-                        
-                        schedule_item = {
-                            "day": day_found,
-                            "time": time_found,
-                            "location": location_found,
-                            "description": row_text
-                        }
-                        schedule.append(schedule_item)
+        # Also check tables for schedule, preferring the date and room
+        # columns over searching the whole row
+        for table, row in self._table_scan().categories["schedule"]:
+            day_found = _first_day(row.cell("date").lower()) or _first_day(row.text_lower)
+            
+            time_match = TABLE_TIME_RE.search(row.text)
+            time_found = time_match.group(1) if time_match else ""
+            
+            location_found = row.cell("room").strip()
+            if not location_found:
+                location_match = TABLE_LOCATION_RE.search(row.text)
+                location_found = location_match.group(1) if location_match else ""
+            
+            schedule_item = {
+                "day": day_found,
+                "time": time_found,
+                "location": location_found,
+                "line": self._source_ref(row.text)
+            }
+            schedule.append(schedule_item)
         
         return schedule
     
@@ -268,38 +528,23 @@ class PDFParser:
         """
         important_dates = []
         
-        # Keywords for important dates
-        date_keywords = ['deadline', 'due', 'exam', 'test', 'final', 'midterm', 'holiday', 'break', 'deadline']
-        
-        lines = self.text_content.split('\n')
+        scan = self._line_scan()
         
-        for line in lines:
-            line_lower = line.lower().strip()
+        # Lines containing important date information
+        for index in scan.categories["important_date"]:
+            line = scan.lines[index]
             
-            # Check if this line contains important date information
-            if any(keyword in line_lower for keyword in date_keywords):
-                # Extract the event title
-                event_title = line.strip()
-                
-                # Extract date (multiple formats)
-                date_patterns = [
-                    r'(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})',
-                    r'(\d{4}-\d{2}-\d{2})',
-                    r'(\w+\s+\d{1,2},?\s+\d{4})',  # "January 15, 2024"
-                ]
-                
-                date_found = ""
-                for pattern in date_patterns:
-                    date_match = re.search(pattern, line, re.IGNORECASE)
-                    if date_match:
-                        date_found = date_match.group(1)
-                        break
-                
-                date_item = {
-                    "title": event_title,
-                    "date": date_found,
-                    "description": line
-                }
-                important_dates.append(date_item)
+            # Extract the event title
+            event_title = line.strip()
+            
+            # Extract date (multiple formats, then the date grammar)
+            date_found = _first_group(IMPORTANT_DATE_PATTERNS, line) or find_date_token(line)
+            
+            date_item = {
+                "title": event_title,
+                "date": date_found,
+                "line": self._source_ref(line)
+            }
+            important_dates.append(date_item)
         
-        return important_dates 
\ No newline at end of file
+        return important_dates
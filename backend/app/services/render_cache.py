@@ -0,0 +1,198 @@
+import hashlib
+import os
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+from app.services.image_renderer import (
+    RenderOptions, FORMATS, iter_rendered_pages, render_page, DEFAULT_RENDER_THREADS, RENDER_VERSION
+)
+
+# Cache location and size budget (override with environment variables)
+RENDER_CACHE_DIR = os.getenv("RENDER_CACHE_DIR", "render_cache")
+RENDER_CACHE_MAX_BYTES = int(os.getenv("RENDER_CACHE_MAX_BYTES", str(1024 * 1024 * 1024)))
+
+# Page counts remembered per PDF hash, so a repeat conversion skips pdfinfo
+PAGE_COUNT_ENTRIES = 1024
+
+# Cache file names as served by the static route: <64 hex chars>.<extension>
+CACHE_NAME_RE = re.compile(r'^([0-9a-f]{64})\.(' + "|".join(ext for _, _, ext in FORMATS.values()) + r')$')
+
+
+def render_key(pdf_sha256: str, page_number: int, options: RenderOptions) -> str:
+    """
+    Content address of one rendered page: the renderer version, the PDF's
+    hash, the page and every option that changes the encoded image
+    """
+    parts = [RENDER_VERSION, pdf_sha256, str(page_number), str(options.dpi), options.fmt, str(options.quality),
+             str(options.max_dimension or 0), "gray" if options.grayscale else "color"]
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+class RenderCache:
+    """
+    Content-addressed store of rendered page images on disk.
+
+    Files are named by ``render_key`` and never change once written, so
+    the name doubles as a strong ETag. Total size is bounded by
+    ``max_bytes``; the least recently used files (by mtime, bumped on every
+    hit) are evicted first. Safe to share between worker processes.
+    """
+    def __init__(self, cache_dir: str = RENDER_CACHE_DIR, max_bytes: int = RENDER_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._page_counts: "OrderedDict[str, int]" = OrderedDict()
+        # Running size estimate; rescanned from disk before evicting, since
+        # other processes write to the same directory
+        self._bytes: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def file_name(self, key: str, options: RenderOptions) -> str:
+        return f"{key}.{options.extension}"
+
+    def path(self, name: str) -> Optional[str]:
+        """
+        Filesystem path for a cache file name, or None if the name is not
+        one this cache could have produced
+        """
+        match = CACHE_NAME_RE.match(name)
+        if not match:
+            return None
+        return os.path.join(self.cache_dir, match.group(1)[:2], name)
+
+    def get(self, name: str) -> Optional[str]:
+        """
+        Path of a cached file, marking it recently used, or None
+        """
+        path = self.path(name)
+        try:
+            os.utime(path)
+        except (OSError, TypeError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return path
+
+    def put(self, name: str, data: bytes) -> str:
+        path = self.path(name)
+        # The cache directory is created here, on first use, not at import
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write atomically so concurrent readers never see partial files
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            _unlink(tmp_path)
+            raise
+        with self._lock:
+            if self._bytes is not None:
+                self._bytes += len(data)
+            over = self._bytes is None or self._bytes > self.max_bytes
+        if over:
+            self._evict(keep=path)
+        return path
+
+    def page_count(self, pdf_sha256: str) -> Optional[int]:
+        with self._lock:
+            count = self._page_counts.get(pdf_sha256)
+            if count is not None:
+                self._page_counts.move_to_end(pdf_sha256)
+            return count
+
+    def set_page_count(self, pdf_sha256: str, count: int):
+        with self._lock:
+            self._page_counts[pdf_sha256] = count
+            while len(self._page_counts) > PAGE_COUNT_ENTRIES:
+                self._page_counts.popitem(last=False)
+
+    def iter_pages(self, pdf_path: str, pdf_sha256: str, page_numbers: Iterable[int],
+                   options: RenderOptions, threads: int = DEFAULT_RENDER_THREADS,
+                   stages: Optional[Dict[str, float]] = None) -> Iterator[tuple[int, str, bool]]:
+        """
+        Yield (page number, cache file name, was cached) in page order,
+        rendering only the pages that are not cached yet
+        """
+        names = {page: self.file_name(render_key(pdf_sha256, page, options), options)
+                 for page in page_numbers}
+        missing = {page for page, name in names.items() if self.get(name) is None}
+        # Rendered in page order, so they line up with the pages below
+        rendered = iter_rendered_pages(pdf_path, sorted(missing), options, threads, stages)
+        try:
+            for page, name in names.items():
+                if page in missing:
+                    _, data = next(rendered)
+                    self.put(name, data)
+                    yield page, name, False
+                elif os.path.exists(self.path(name)):
+                    yield page, name, True
+                else:
+                    # Evicted since the lookup above, to make room for this
+                    # conversion's own pages
+                    self.put(name, render_page(pdf_path, page, options))
+                    yield page, name, False
+        finally:
+            rendered.close()
+
+    def _entries(self) -> list[tuple[str, int, float]]:
+        entries = []
+        for dirpath, _, filenames in os.walk(self.cache_dir):
+            for filename in filenames:
+                if not CACHE_NAME_RE.match(filename):
+                    continue
+                try:
+                    st = os.stat(os.path.join(dirpath, filename))
+                except OSError:
+                    continue
+                entries.append((os.path.join(dirpath, filename), st.st_size, st.st_mtime))
+        return entries
+
+    def _evict(self, keep: str):
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        evicted = 0
+        # Oldest first, never the file just written
+        for path, size, _ in sorted(entries, key=lambda e: e[2]):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            _unlink(path)
+            total -= size
+            evicted += 1
+        with self._lock:
+            self._bytes = total
+            self.evictions += evicted
+
+    def stats(self) -> Dict[str, Any]:
+        entries = self._entries()
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "entries": len(entries),
+                "bytes": sum(size for _, size, _ in entries),
+                "max_bytes": self.max_bytes,
+                "evictions": self.evictions
+            }
+
+
+def _unlink(path: str):
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+# Shared render cache used by the API routes
+render_cache = RenderCache()
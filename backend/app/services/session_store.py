@@ -0,0 +1,451 @@
+import orjson
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+# Session limits (override with environment variables)
+SESSION_BACKEND = os.getenv("SESSION_BACKEND", "memory")
+SESSION_MAX_ENTRIES = int(os.getenv("SESSION_MAX_ENTRIES", "1000"))
+SESSION_MAX_BYTES = int(os.getenv("SESSION_MAX_BYTES", str(512 * 1024 * 1024)))
+SESSION_TTL_SECONDS = int(os.getenv("SESSION_TTL_SECONDS", str(6 * 60 * 60)))
+SESSION_SWEEP_INTERVAL = int(os.getenv("SESSION_SWEEP_INTERVAL", "60"))
+SESSION_DATA_DIR = os.getenv("SESSION_DATA_DIR", "session_data")  # sqlite backend only
+
+
+def _unlink(path: Optional[str]):
+    if not path:
+        return
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+class SessionStore:
+    """
+    Interface for session backends.
+
+    A session record is a dict; ``raw_pdf_path`` (if present) names a file
+    owned by the store, which is deleted when the session is evicted,
+    expires or is deleted.
+    """
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def put(self, session_id: str, record: Dict[str, Any]):
+        raise NotImplementedError
+
+    def delete(self, session_id: str) -> bool:
+        raise NotImplementedError
+
+    def exists(self, session_id: str) -> bool:
+        """
+        Whether a live session is stored, without necessarily loading it
+        """
+        return self.get(session_id) is not None
+
+    def sweep(self) -> int:
+        """
+        Drop expired sessions and return how many were removed
+        """
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def start_sweeper(self, interval: int = SESSION_SWEEP_INTERVAL):
+        """
+        Run sweep() every ``interval`` seconds on a daemon thread
+        """
+        if getattr(self, "_sweeper", None) is not None:
+            return
+        self._sweeper_stop = threading.Event()
+
+        def run():
+            while not self._sweeper_stop.wait(interval):
+                try:
+                    self.sweep()
+                except Exception:
+                    pass
+
+        self._sweeper = threading.Thread(target=run, name="session-sweeper", daemon=True)
+        self._sweeper.start()
+
+    def stop_sweeper(self):
+        if getattr(self, "_sweeper", None) is None:
+            return
+        self._sweeper_stop.set()
+        self._sweeper.join(timeout=5)
+        self._sweeper = None
+
+    def close(self):
+        self.stop_sweeper()
+
+
+class MemorySessionStore(SessionStore):
+    """
+    In-process session store bounded by entry count, bytes and idle TTL.
+
+    The byte budget counts each record's JSON size plus the size of its PDF
+    on disk. When a limit is exceeded the least recently used sessions are
+    evicted and their PDFs unlinked.
+    """
+    def __init__(self, max_entries: int = SESSION_MAX_ENTRIES,
+                 max_bytes: int = SESSION_MAX_BYTES,
+                 ttl_seconds: int = SESSION_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        # session_id -> (record, size in bytes, last access time)
+        self._entries: "OrderedDict[str, tuple[Dict[str, Any], int, float]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def _record_size(record: Dict[str, Any]) -> int:
+        size = len(orjson.dumps(record, default=str))
+        pdf_path = record.get("raw_pdf_path")
+        if pdf_path:
+            try:
+                size += os.path.getsize(pdf_path)
+            except OSError:
+                pass
+        return size
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None:
+                return None
+            record, size, last_access = entry
+            now = time.monotonic()
+            if now - last_access > self.ttl_seconds:
+                self._remove(session_id)
+                self.expirations += 1
+                return None
+            self._entries[session_id] = (record, size, now)
+            self._entries.move_to_end(session_id)
+            return record
+
+    def put(self, session_id: str, record: Dict[str, Any]):
+        size = self._record_size(record)
+        with self._lock:
+            if session_id in self._entries:
+                self._remove(session_id, keep_file=record.get("raw_pdf_path"))
+            self._entries[session_id] = (record, size, time.monotonic())
+            self._bytes += size
+            # Evict least recently used sessions, but never the one just added
+            while len(self._entries) > 1 and (
+                len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            if session_id not in self._entries:
+                return False
+            self._remove(session_id)
+            return True
+
+    def sweep(self) -> int:
+        cutoff = time.monotonic() - self.ttl_seconds
+        removed = 0
+        with self._lock:
+            # Entries are kept in access order, so expired ones come first
+            while self._entries:
+                session_id, (_, _, last_access) = next(iter(self._entries.items()))
+                if last_access >= cutoff:
+                    break
+                self._remove(session_id)
+                removed += 1
+            self.expirations += removed
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "backend": "memory",
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "evictions": self.evictions,
+                "expirations": self.expirations
+            }
+
+    def close(self):
+        super().close()
+        with self._lock:
+            for session_id in list(self._entries):
+                self._remove(session_id)
+
+    def _remove(self, session_id: str, keep_file: Optional[str] = None):
+        """
+        Drop a session and its PDF; caller holds the lock
+        """
+        record, size, _ = self._entries.pop(session_id)
+        self._bytes -= size
+        pdf_path = record.get("raw_pdf_path")
+        if pdf_path != keep_file:
+            _unlink(pdf_path)
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    Session store shared by every worker process on a host.
+
+    Records live in a SQLite database in WAL mode; PDFs are stored once per
+    SHA-256 under ``<data_dir>/blobs`` and deleted when no session refers to
+    them. Limits match MemorySessionStore, with the byte budget counting
+    record JSON plus each distinct PDF once.
+    """
+    def __init__(self, data_dir: str = SESSION_DATA_DIR,
+                 max_entries: int = SESSION_MAX_ENTRIES,
+                 max_bytes: int = SESSION_MAX_BYTES,
+                 ttl_seconds: int = SESSION_TTL_SECONDS):
+        self.data_dir = data_dir
+        self.blob_dir = os.path.join(data_dir, "blobs")
+        self.db_path = os.path.join(data_dir, "sessions.db")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._local = threading.local()
+        self.evictions = 0
+        self.expirations = 0
+
+        os.makedirs(self.blob_dir, exist_ok=True)
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS sessions (
+                session_id TEXT PRIMARY KEY,
+                record TEXT NOT NULL,
+                pdf_sha256 TEXT,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS sessions_last_access ON sessions (last_access);
+            CREATE INDEX IF NOT EXISTS sessions_pdf ON sessions (pdf_sha256);
+            CREATE TABLE IF NOT EXISTS blobs (
+                sha256 TEXT PRIMARY KEY,
+                size INTEGER NOT NULL
+            );
+        """)
+
+    def _conn(self) -> sqlite3.Connection:
+        """
+        One connection per thread (the event loop and the sweeper)
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _blob_path(self, sha256: str) -> str:
+        return os.path.join(self.blob_dir, sha256[:2], f"{sha256}.pdf")
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        conn = self._conn()
+        row = conn.execute(
+            "SELECT record, last_access FROM sessions WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        record, last_access = row
+        now = time.time()
+        if now - last_access > self.ttl_seconds:
+            with self._write(conn):
+                self._delete_rows(conn, [session_id])
+                self._collect_blobs(conn)
+            self.expirations += 1
+            return None
+        conn.execute("UPDATE sessions SET last_access = ? WHERE session_id = ?", (now, session_id))
+        return orjson.loads(record)
+
+    def exists(self, session_id: str) -> bool:
+        row = self._conn().execute(
+            "SELECT last_access FROM sessions WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        return row is not None and time.time() - row[0] <= self.ttl_seconds
+
+    def put(self, session_id: str, record: Dict[str, Any]):
+        record = dict(record)
+        pdf_sha256 = record.get("pdf_sha256")
+        temp_path = record.get("raw_pdf_path")
+        conn = self._conn()
+        moved = False
+        try:
+            with self._write(conn):
+                if pdf_sha256 and temp_path:
+                    # Move the upload into content-addressed storage (or drop it
+                    # if an identical PDF is already stored); done under the
+                    # write lock so blob garbage collection cannot race it
+                    blob_path = self._blob_path(pdf_sha256)
+                    if os.path.exists(blob_path):
+                        # An updated record already points at the stored blob
+                        if temp_path != blob_path:
+                            _unlink(temp_path)
+                    else:
+                        os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+                        shutil.move(temp_path, blob_path)
+                        moved = True
+                    conn.execute(
+                        "INSERT OR IGNORE INTO blobs (sha256, size) VALUES (?, ?)",
+                        (pdf_sha256, os.path.getsize(blob_path))
+                    )
+                    for key in ("raw_pdf_path", "file_path"):
+                        if record.get(key) == temp_path:
+                            record[key] = blob_path
+                encoded = orjson.dumps(record, default=str)
+                conn.execute(
+                    "INSERT OR REPLACE INTO sessions (session_id, record, pdf_sha256, size, last_access) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (session_id, encoded, pdf_sha256, len(encoded), time.time())
+                )
+                self._evict(conn, keep=session_id)
+                self._collect_blobs(conn)
+        except BaseException:
+            # Rolled back, so no row refers to a blob this put created; give
+            # the upload back to the caller rather than leave it orphaned
+            if moved and os.path.exists(blob_path):
+                shutil.move(blob_path, temp_path)
+            raise
+
+    def delete(self, session_id: str) -> bool:
+        conn = self._conn()
+        with self._write(conn):
+            deleted = self._delete_rows(conn, [session_id])
+            self._collect_blobs(conn)
+        return deleted > 0
+
+    def sweep(self) -> int:
+        conn = self._conn()
+        with self._write(conn):
+            expired = [row[0] for row in conn.execute(
+                "SELECT session_id FROM sessions WHERE last_access < ?",
+                (time.time() - self.ttl_seconds,)
+            )]
+            removed = self._delete_rows(conn, expired)
+            self._collect_blobs(conn)
+        self.expirations += removed
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        conn = self._conn()
+        entries, record_bytes = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM sessions"
+        ).fetchone()
+        blobs, blob_bytes = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM blobs"
+        ).fetchone()
+        return {
+            "backend": "sqlite",
+            "entries": entries,
+            "bytes": record_bytes + blob_bytes,
+            "pdf_blobs": blobs,
+            "pdf_bytes": blob_bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            # Counted by this worker process only
+            "evictions": self.evictions,
+            "expirations": self.expirations
+        }
+
+    def close(self):
+        super().close()
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _write(self, conn: sqlite3.Connection):
+        return _WriteTransaction(conn)
+
+    def _delete_rows(self, conn: sqlite3.Connection, session_ids: list) -> int:
+        deleted = 0
+        for session_id in session_ids:
+            deleted += conn.execute(
+                "DELETE FROM sessions WHERE session_id = ?", (session_id,)
+            ).rowcount
+        return deleted
+
+    def _evict(self, conn: sqlite3.Connection, keep: str):
+        """
+        Drop least recently used sessions until within limits
+        """
+        while True:
+            entries, record_bytes = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM sessions"
+            ).fetchone()
+            blob_bytes = conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM blobs "
+                "WHERE sha256 IN (SELECT pdf_sha256 FROM sessions)"
+            ).fetchone()[0]
+            if entries <= 1 or (entries <= self.max_entries and record_bytes + blob_bytes <= self.max_bytes):
+                return
+            oldest = conn.execute(
+                "SELECT session_id FROM sessions WHERE session_id != ? ORDER BY last_access LIMIT 1",
+                (keep,)
+            ).fetchone()
+            if oldest is None:
+                return
+            self._delete_rows(conn, [oldest[0]])
+            self.evictions += 1
+
+    def _collect_blobs(self, conn: sqlite3.Connection):
+        """
+        Delete PDFs no session refers to; caller holds the write lock
+        """
+        orphans = [row[0] for row in conn.execute(
+            "SELECT sha256 FROM blobs WHERE sha256 NOT IN "
+            "(SELECT pdf_sha256 FROM sessions WHERE pdf_sha256 IS NOT NULL)"
+        )]
+        for sha256 in orphans:
+            conn.execute("DELETE FROM blobs WHERE sha256 = ?", (sha256,))
+            _unlink(self._blob_path(sha256))
+
+
+class _WriteTransaction:
+    """
+    BEGIN IMMEDIATE ... COMMIT, rolling back on error
+    """
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.conn.execute("COMMIT")
+        else:
+            self.conn.execute("ROLLBACK")
+        return False
+
+
+def create_session_store(backend: str = SESSION_BACKEND) -> SessionStore:
+    """
+    Build the session store selected by SESSION_BACKEND
+    """
+    if backend == "memory":
+        return MemorySessionStore()
+    if backend == "sqlite":
+        return SQLiteSessionStore()
+    raise ValueError(f"Unknown session backend: {backend}")
+
+
+# Shared store used by the API routes
+session_store = create_session_store()
@@ -0,0 +1,138 @@
+import re
+from typing import Dict, List, Optional
+
+from app.services.line_scanner import ASSIGNMENT_KEYWORDS, DAYS, keyword_pattern
+
+# Header vocabulary for each column role. A header cell takes the role of
+# the first keyword it contains as a whole word, plurals included
+# ("Assignments Due" is a due column; "Monday" is not a day column).
+HEADER_ROLES = {
+    "date": ['date', 'day', 'when'],
+    "week": ['week', 'wk'],
+    "topic": ['topic', 'lecture', 'subject', 'content', 'reading'],
+    "due": ['due', 'assignment', 'homework', 'deliverable'],
+    "room": ['room', 'location', 'where', 'building'],
+}
+HEADER_RE = re.compile("|".join(
+    rf"\b(?P<{role}>" + "|".join(re.escape(k) for k in sorted(keywords, key=len, reverse=True)) + r")s?\b"
+    for role, keywords in HEADER_ROLES.items()
+))
+
+# Headers can span several rows (e.g. "Readings from" / "Assignments" /
+# "Week  Topic(s)  Book or" / "Due"); they are the leading digit-free rows in
+# which at least half of the non-empty cells are header words
+HEADER_MAX_ROWS = 6
+DIGIT_RE = re.compile(r'\d')
+WEEK_NUMBER_RE = re.compile(r'\d{1,2}')
+
+# Roles whose cells are often merged down across continuation rows
+CARRIED_ROLES = ("week", "date")
+
+# Row categories, matched against each row's lowercased text once
+ROW_CATEGORIES = {
+    "assignment": keyword_pattern(ASSIGNMENT_KEYWORDS),
+    "schedule": keyword_pattern(DAYS),
+}
+
+
+class TableRow:
+    """
+    One data row: its cells, the joined text the extractors match against,
+    and the cell (if any) in each header role
+    """
+    __slots__ = ("cells", "text", "text_lower", "roles")
+
+    def __init__(self, cells: List[str], roles: Dict[str, str]):
+        self.cells = cells
+        self.text = " ".join(cell for cell in cells if cell)
+        self.text_lower = self.text.lower()
+        self.roles = roles
+
+    def cell(self, role: str) -> str:
+        return self.roles.get(role, "")
+
+    @property
+    def week(self) -> Optional[int]:
+        match = WEEK_NUMBER_RE.search(self.cell("week"))
+        return int(match.group(0)) if match else None
+
+
+class NormalizedTable:
+    """
+    A pdfplumber table with cells as strings, header rows detected and
+    merged, and a column index of header roles (role -> column)
+    """
+    def __init__(self, table: List[List[Optional[str]]]):
+        rows = [[str(cell) if cell else "" for cell in row] for row in table if row]
+        header_rows = self._header_rows(rows)
+        self.header = self._merge_header(rows[:header_rows])
+        self.columns = self._column_index(self.header)
+        self.rows = self._data_rows(rows[header_rows:])
+
+    @staticmethod
+    def _header_rows(rows: List[List[str]]) -> int:
+        """
+        Number of leading rows that form the header (0 if none). A row that
+        is mostly data ("Monday", "Intro lecture", "TBA") ends the header.
+        """
+        count = 0
+        for index, row in enumerate(rows[:HEADER_MAX_ROWS]):
+            cells = [cell for cell in row if cell.strip()]
+            if not cells:
+                # Blank spacer rows belong to the header only if one follows
+                continue
+            if any(DIGIT_RE.search(cell) for cell in cells):
+                break
+            matches = sum(1 for cell in cells if HEADER_RE.search(cell.lower()))
+            if matches * 2 < len(cells):
+                break
+            count = index + 1
+        return count
+
+    @staticmethod
+    def _merge_header(rows: List[List[str]]) -> List[str]:
+        width = max((len(row) for row in rows), default=0)
+        return [
+            " ".join(row[column].strip() for row in rows if column < len(row) and row[column].strip())
+            for column in range(width)
+        ]
+
+    @staticmethod
+    def _column_index(header: List[str]) -> Dict[str, int]:
+        columns: Dict[str, int] = {}
+        for column, cell in enumerate(header):
+            match = HEADER_RE.search(cell.lower())
+            if match and match.lastgroup not in columns:
+                columns[match.lastgroup] = column
+        return columns
+
+    def _data_rows(self, rows: List[List[str]]) -> List[TableRow]:
+        data_rows = []
+        carried: Dict[str, str] = {}
+        for cells in rows:
+            roles = {}
+            for role, column in self.columns.items():
+                value = cells[column].strip() if column < len(cells) else ""
+                if role in CARRIED_ROLES:
+                    # A blank week/date cell continues the one above it
+                    value = carried[role] = value or carried.get(role, "")
+                roles[role] = value
+            data_rows.append(TableRow(cells, roles))
+        return data_rows
+
+
+class TableScan:
+    """
+    Every extracted table normalized once and shared between the section
+    extractors. ``categories`` maps each category in ROW_CATEGORIES to the
+    (table, row) pairs whose text matches it, in document order.
+    """
+    def __init__(self, tables: List[List[List[Optional[str]]]]):
+        self.source = tables
+        self.tables = [NormalizedTable(table) for table in tables]
+        self.categories: Dict[str, List[tuple]] = {name: [] for name in ROW_CATEGORIES}
+        for table in self.tables:
+            for row in table.rows:
+                for name, pattern in ROW_CATEGORIES.items():
+                    if pattern.search(row.text_lower):
+                        self.categories[name].append((table, row))
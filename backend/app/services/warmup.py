@@ -0,0 +1,143 @@
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+# Warm parser processes (and pre-import the rendering stack) at startup,
+# and report not-ready until that is done (0 disables it)
+WARMUP_ENABLED = os.getenv("WARMUP", "1") != "0"
+
+logger = logging.getLogger("syllabus_parser.startup")
+
+# Lines of the built-in warm-up document; one of each kind the parser looks
+# for, so every extractor and the date resolver run
+WARMUP_LINES = [
+    "Course: Warm-up 101",
+    "Instructor: Dr. Smith",
+    "Spring 2024",
+    "Monday 9:00 AM Room 101",
+    "Assignment 1 due: 01/15/2024",
+    "Final exam: March 18",
+]
+
+
+def _minimal_pdf(lines: List[str]) -> bytes:
+    """
+    A one-page PDF showing ``lines`` in Helvetica, built by hand so no PDF
+    writer is needed at runtime
+    """
+    text = "".join(f"({line}) Tj 0 -16 Td " for line in lines)
+    stream = f"BT /F1 11 Tf 72 720 Td {text}ET".encode("latin-1")
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+        b"/Resources << /Font << /F1 5 0 R >> >> /Contents 4 0 R >>",
+        b"<< /Length " + str(len(stream)).encode() + b" >>\nstream\n" + stream + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    pdf = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(pdf))
+        pdf += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref = len(pdf)
+    pdf += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    pdf += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    pdf += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return pdf
+
+
+WARMUP_PDF = _minimal_pdf(WARMUP_LINES)
+
+
+def warm_up_parser() -> float:
+    """
+    Import the PDF stack and parse the built-in document once, so the
+    first real parse in this process skips import and first-use costs.
+    Returns the seconds taken; never raises.
+    """
+    from app.services.pdf_parser import PDFParser
+
+    start = time.perf_counter()
+    fd, path = tempfile.mkstemp(suffix=".pdf")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(WARMUP_PDF)
+        PDFParser(page_workers=1, page_cache=False).parse_pdf(path, "2024-01-08")
+    except Exception:
+        logger.exception("Parser warm-up failed")
+    finally:
+        os.unlink(path)
+    return time.perf_counter() - start
+
+
+def warm_up_worker():
+    """
+    Parse pool worker initializer
+    """
+    warm_up_parser()
+
+
+def worker_ready() -> int:
+    """
+    Trivial pool task; returns once a (warmed) worker has picked it up
+    """
+    return os.getpid()
+
+
+def preload_rendering() -> float:
+    """
+    Import the page rendering stack (pdf2image, PIL) in this process
+    """
+    start = time.perf_counter()
+    try:
+        import pdf2image  # noqa: F401
+        from PIL import Image  # noqa: F401
+    except ImportError:
+        logger.exception("Rendering warm-up failed")
+    return time.perf_counter() - start
+
+
+class StartupReport:
+    """
+    Cold-start timings for this API process: module import, warm-up, time
+    until ready, and the latency of the first request to each route
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.process_start = time.time()
+        self.import_seconds: Optional[float] = None
+        self.warmup: Dict[str, float] = {}
+        self.ready_seconds: Optional[float] = None
+        self.ready = not WARMUP_ENABLED
+        self.first_requests: Dict[str, float] = {}
+
+    def mark_ready(self, warmup: Dict[str, float]):
+        with self._lock:
+            self.warmup = {stage: round(seconds, 4) for stage, seconds in warmup.items()}
+            self.ready_seconds = round(time.time() - self.process_start, 4)
+            self.ready = True
+
+    def observe_request(self, path: str, seconds: float):
+        if path in self.first_requests:
+            return
+        with self._lock:
+            self.first_requests.setdefault(path, round(seconds, 4))
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "ready": self.ready,
+                "warmup_enabled": WARMUP_ENABLED,
+                "import_seconds": self.import_seconds,
+                "warmup_seconds": self.warmup,
+                "ready_seconds": self.ready_seconds,
+                "first_request_seconds": dict(self.first_requests)
+            }
+
+
+# Startup timings of this process, reported by /ready
+startup_report = StartupReport()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Cold start cost of the API process.
+
+Starts the app in a fresh interpreter, with and without warm-up, and
+records how long importing app.main takes, which heavy modules that import
+pulls in, how long until /ready reports ready, and the latency of the
+first request to each endpoint (including a first upload). Writes JSON that
+can be compared against a saved baseline.
+
+Usage:
+  python3 -m benchmarks.cold_start --output cold.json
+  python3 -m benchmarks.cold_start --baseline cold.json   # exits 1 on regression
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Nothing heavy is imported at module level: spawned children re-import this
+# module before measuring, and would count its imports as the app's
+
+# Modules that should only load when first needed
+HEAVY_MODULES = ["pdfplumber", "pdfminer", "pdf2image", "PIL", "reportlab", "orjson", "fastapi", "pydantic"]
+
+# Give up waiting for /ready after this many seconds
+READY_TIMEOUT = 60
+
+# Timings faster than this (ms) are too noisy to flag as regressions
+NOISE_FLOOR_MS = 5.0
+
+def measure_cold_start(warmup: bool, pdf_path: str, workers: int) -> dict:
+    """
+    Import the app and serve its first requests; runs in its own (spawned)
+    process so nothing is imported beforehand
+    """
+    os.environ["WARMUP"] = "1" if warmup else "0"
+    os.environ["PARSE_POOL_WORKERS"] = str(workers)
+    # Keep caches from earlier runs out of the first parse
+    os.environ["PARSER_PAGE_CACHE"] = "0"
+    os.environ.pop("PARSE_CACHE_DIR", None)
+    os.environ["RENDER_CACHE_DIR"] = tempfile.mkdtemp(prefix="cold_start_render_")
+
+    start = time.perf_counter()
+    import app.main
+    import_ms = (time.perf_counter() - start) * 1000
+    loaded = [name for name in HEAVY_MODULES if name in sys.modules]
+
+    from fastapi.testclient import TestClient
+
+    first_requests = {}
+    def timed(name: str, method: str, url: str, **kwargs):
+        request_start = time.perf_counter()
+        response = client.request(method, url, **kwargs)
+        first_requests[name] = round((time.perf_counter() - request_start) * 1000, 3)
+        return response
+
+    with TestClient(app.main.app) as client:
+        startup_start = time.perf_counter()
+        while client.get("/ready").status_code != 200:
+            if time.perf_counter() - startup_start > READY_TIMEOUT:
+                raise RuntimeError("API did not report ready")
+            time.sleep(0.01)
+        ready_ms = (time.perf_counter() - startup_start) * 1000
+
+        timed("health", "GET", "/health")
+        with open(pdf_path, "rb") as f:
+            response = timed("upload", "POST", "/api/upload-syllabus",
+                             files={"file": ("syllabus.pdf", f, "application/pdf")})
+        response.raise_for_status()
+        with open(pdf_path, "rb") as f:
+            timed("extract_text", "POST", "/api/extract-text",
+                  files={"file": ("syllabus.pdf", f, "application/pdf")})
+        report = client.get("/ready").json()
+
+    return {
+        "import_ms": round(import_ms, 3),
+        "modules_loaded_at_import": loaded,
+        "ready_ms": round(ready_ms, 3),
+        "warmup_seconds": report["warmup_seconds"],
+        "first_request_ms": first_requests
+    }
+
+def run_benchmarks(pdf_path: str, workers: int) -> dict:
+    import fastapi
+
+    modes = {}
+    spawn = multiprocessing.get_context("spawn")
+    for mode, warmup in (("cold", False), ("warm", True)):
+        with ProcessPoolExecutor(max_workers=1, mp_context=spawn) as executor:
+            modes[mode] = executor.submit(measure_cold_start, warmup, pdf_path, workers).result()
+        print(f"{mode}: import {modes[mode]['import_ms']:.1f} ms, ready {modes[mode]['ready_ms']:.1f} ms, "
+              f"first upload {modes[mode]['first_request_ms']['upload']:.1f} ms", file=sys.stderr)
+
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "fastapi": fastapi.__version__,
+            "document": os.path.basename(pdf_path),
+            "parse_pool_workers": workers
+        },
+        "modes": modes
+    }
+
+def _metrics(mode: dict) -> dict:
+    return dict({f"first_{name}_ms": ms for name, ms in mode["first_request_ms"].items()},
+                import_ms=mode["import_ms"], ready_ms=mode["ready_ms"])
+
+def compare(current: dict, baseline: dict, threshold: float) -> list:
+    """
+    Print current vs baseline per timing and return the regressions
+    """
+    regressions = []
+    for mode, timings in current["modes"].items():
+        base_mode = baseline.get("modes", {}).get(mode)
+        if not base_mode:
+            continue
+        base_metrics = _metrics(base_mode)
+        for metric, value in _metrics(timings).items():
+            base_value = base_metrics.get(metric)
+            if not base_value:
+                continue
+            ratio = value / base_value
+            flag = ""
+            if ratio > threshold and base_value >= NOISE_FLOOR_MS:
+                flag = "  REGRESSION"
+                regressions.append((mode, metric, base_value, value))
+            print(f"{mode:6} {metric:24} {base_value:10.3f} -> {value:10.3f}  x{ratio:.2f}{flag}")
+    return regressions
+
+def main():
+    from benchmarks.corpus import BUNDLED_SYLLABI
+
+    arg_parser = argparse.ArgumentParser(description="Benchmark API import and first-request latency")
+    arg_parser.add_argument("--pdf", default=BUNDLED_SYLLABI[0], help="document for the first upload")
+    arg_parser.add_argument("--workers", type=int, default=1, help="parse pool workers to start")
+    arg_parser.add_argument("--output", help="write results JSON here (default: stdout)")
+    arg_parser.add_argument("--baseline", help="compare against a saved results JSON")
+    arg_parser.add_argument("--threshold", type=float, default=1.25,
+                            help="flag timings slower than baseline by more than this factor")
+    args = arg_parser.parse_args()
+
+    results = run_benchmarks(args.pdf, args.workers)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    elif not args.baseline:
+        print(json.dumps(results, indent=2))
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) beyond x{args.threshold}", file=sys.stderr)
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Synthetic syllabus corpus for the parser benchmarks
+"""
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from create_test_pdf import create_test_pdf
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The two real syllabi checked into backend/
+BUNDLED_SYLLABI = [
+    os.path.join(BACKEND_DIR, "CS64 Syllabus W25_v0.pdf"),
+    os.path.join(BACKEND_DIR, "Pstat120A_W25_2PM_Syllabus.pdf"),
+]
+
+# name -> create_test_pdf arguments; a fixed seed keeps every build identical
+SYNTHETIC_SPECS = {
+    "synthetic_1p": {"pages": 1},
+    "synthetic_10p": {"pages": 10, "lines_per_page": 40, "table_density": 0.2},
+    "synthetic_10p_tables": {"pages": 10, "lines_per_page": 20, "table_density": 1.0},
+    "synthetic_50p": {"pages": 50, "lines_per_page": 40, "table_density": 0.2},
+    "synthetic_50p_dense": {"pages": 50, "lines_per_page": 60, "table_density": 0.0},
+    "synthetic_150p": {"pages": 150, "lines_per_page": 40, "table_density": 0.2},
+}
+
+def build_corpus(out_dir: str, specs: dict = None, include_bundled: bool = True,
+                 rebuild: bool = False) -> dict:
+    """
+    Write the synthetic PDFs to out_dir (reusing existing files unless
+    rebuild is set) and return {name: path}, including the bundled syllabi
+    when requested
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    corpus = {}
+    if include_bundled:
+        for path in BUNDLED_SYLLABI:
+            corpus[os.path.splitext(os.path.basename(path))[0]] = path
+
+    for name, spec in (specs or SYNTHETIC_SPECS).items():
+        path = os.path.join(out_dir, f"{name}.pdf")
+        if rebuild or not os.path.exists(path):
+            create_test_pdf(path, seed=0, **spec)
+        corpus[name] = path
+    return corpus
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Time the section extractors on already-extracted text and tables.
+
+Usage: python3 -m benchmarks.extractors [pdf ...]
+(defaults to the syllabi bundled in backend/)
+"""
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.pdf_parser import PDFParser
+from benchmarks.corpus import BUNDLED_SYLLABI
+
+def bench_extractors(pdf_path: str, repeat: int = 200) -> float:
+    """
+    Average milliseconds to run all four section extractors on one document
+    """
+    source = PDFParser()
+    text, tables = source._extract_text_and_tables(pdf_path)
+    
+    start = time.perf_counter()
+    for _ in range(repeat):
+        # Fresh parser each round so the line scan is rebuilt every time
+        parser = PDFParser()
+        parser.text_content, parser.tables = text, tables
+        parser._extract_course_info_improved()
+        parser._extract_assignments_improved()
+        parser._extract_schedule_improved()
+        parser._extract_important_dates_improved()
+    return (time.perf_counter() - start) / repeat * 1000
+
+if __name__ == "__main__":
+    for path in sys.argv[1:] or BUNDLED_SYLLABI:
+        print(f"{os.path.basename(path)}: {bench_extractors(path):.3f} ms")
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Response size and encoding cost of parse results.
+
+Compares the older result shape (a ``description`` copy of the source line on
+every item, rendered as starlette's JSONResponse does) against the current one
+(items reference ``source_lines`` by index, encoded with orjson) for every
+document in the benchmark corpus.
+
+Usage:
+  python3 -m benchmarks.responses
+  python3 -m benchmarks.responses --repeat 200
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import orjson
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import build_corpus
+from app.models.syllabus import inline_descriptions
+from app.services.pdf_parser import PDFParser
+
+def _json_response_body(content) -> bytes:
+    # What starlette's JSONResponse renders
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None,
+                      separators=(",", ":")).encode("utf-8")
+
+def _median_ms(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return round(statistics.median(timings) * 1000, 3)
+
+def measure(path: str, repeat: int) -> dict:
+    data = PDFParser().parse_pdf(path)
+    legacy = inline_descriptions(data)
+    return {
+        "legacy_bytes": len(_json_response_body(legacy)),
+        "bytes": len(orjson.dumps(data)),
+        "legacy_encode_ms": _median_ms(lambda: _json_response_body(legacy), repeat),
+        "encode_ms": _median_ms(lambda: orjson.dumps(data), repeat)
+    }
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Measure parse result size and encoding time")
+    arg_parser.add_argument("--corpus-dir", default=os.path.join(tempfile.gettempdir(), "syllabus_bench_corpus"))
+    arg_parser.add_argument("--repeat", type=int, default=50, help="encodes per document (median is reported)")
+    args = arg_parser.parse_args()
+
+    corpus = build_corpus(args.corpus_dir)
+    print(f"{'document':32} {'bytes':>18} {'encode ms':>20}")
+    for name, path in corpus.items():
+        m = measure(path, args.repeat)
+        print(f"{name:32} {m['legacy_bytes']:8} -> {m['bytes']:7} "
+              f"{m['legacy_encode_ms']:9.3f} -> {m['encode_ms']:8.3f}  "
+              f"(x{m['bytes'] / m['legacy_bytes']:.2f} bytes, x{m['encode_ms'] / m['legacy_encode_ms']:.2f} CPU)")
+
+if __name__ == "__main__":
+    main()
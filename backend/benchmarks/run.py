@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Reproducible PDFParser benchmark.
+
+Builds the synthetic corpus (plus the bundled syllabi), times each parsing
+stage per document in a fresh process, records peak RSS, and writes JSON
+that can be compared against a saved baseline.
+
+Usage:
+  python3 -m benchmarks.run --output bench.json
+  python3 -m benchmarks.run --baseline bench.json   # exits 1 on regression
+  python3 -m benchmarks.run --memory-mode full      # parser without page cache flushing
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import build_corpus, SYNTHETIC_SPECS
+
+STAGES = [
+    "open", "text", "tables",
+    "course_info", "assignments", "schedule", "important_dates",
+    "parse_pdf"
+]
+
+# Stages faster than this (ms) are too noisy to flag as regressions
+NOISE_FLOOR_MS = 1.0
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+def measure_parse_rss(path: str, low_memory: bool) -> float:
+    """
+    Peak RSS of a single parse_pdf call; runs in its own process
+    """
+    from app.services.pdf_parser import PDFParser
+    PDFParser(page_workers=1, low_memory=low_memory, page_cache=False).parse_pdf(path)
+    return _peak_rss_mb()
+
+def measure_document(path: str, repeat: int, low_memory: bool = True) -> dict:
+    """
+    Time every stage of one document; runs in its own process so peak RSS
+    belongs to this document alone
+    """
+    import pdfplumber
+    from app.services.pdf_parser import PDFParser
+
+    timings = {stage: [] for stage in STAGES}
+    page_count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with pdfplumber.open(path) as pdf:
+            pages = pdf.pages
+            page_count = len(pages)
+            timings["open"].append(time.perf_counter() - start)
+
+            # Text then tables, the order the parser uses (tables reuse the
+            # page objects text extraction already parsed)
+            start = time.perf_counter()
+            page_texts = [page.extract_text() for page in pages]
+            timings["text"].append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            page_tables = [page.extract_tables() for page in pages]
+            timings["tables"].append(time.perf_counter() - start)
+
+        parser = PDFParser()
+        parser.text_content = "".join(text + "\n" for text in page_texts if text)
+        parser.tables = [table for tables in page_tables for table in tables]
+        for section in ("course_info", "assignments", "schedule", "important_dates"):
+            extractor = getattr(parser, f"_extract_{section}_improved")
+            start = time.perf_counter()
+            extractor()
+            timings[section].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        # Without the page cache, so every round measures real extraction
+        PDFParser(low_memory=low_memory, page_cache=False).parse_pdf(path)
+        timings["parse_pdf"].append(time.perf_counter() - start)
+
+    return {
+        "pages": page_count,
+        "bytes": os.path.getsize(path),
+        "stages_ms": {stage: round(statistics.median(values) * 1000, 3) for stage, values in timings.items()},
+        "peak_rss_mb": _peak_rss_mb()
+    }
+
+def run_benchmarks(corpus: dict, repeat: int, low_memory: bool = True) -> dict:
+    from app.services.pdf_parser import PARSER_VERSION
+    import pdfplumber
+
+    documents = {}
+    spawn = multiprocessing.get_context("spawn")
+    for name, path in corpus.items():
+        # A fresh process per document keeps peak RSS figures independent.
+        # The stage breakdown holds every page at once, so the parser's own
+        # peak is measured separately in another fresh process
+        with ProcessPoolExecutor(max_workers=1, mp_context=spawn) as executor:
+            documents[name] = executor.submit(measure_document, path, repeat, low_memory).result()
+        with ProcessPoolExecutor(max_workers=1, mp_context=spawn) as executor:
+            documents[name]["parse_peak_rss_mb"] = executor.submit(measure_parse_rss, path, low_memory).result()
+        print(f"{name}: {documents[name]['stages_ms']['parse_pdf']:.1f} ms, "
+              f"{documents[name]['parse_peak_rss_mb']} MB parse peak", file=sys.stderr)
+
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "pdfplumber": pdfplumber.__version__,
+            "parser_version": PARSER_VERSION,
+            "repeat": repeat,
+            "memory_mode": "low" if low_memory else "full",
+            "synthetic_specs": SYNTHETIC_SPECS
+        },
+        "documents": documents
+    }
+
+def compare(current: dict, baseline: dict, threshold: float) -> list:
+    """
+    Print current vs baseline per stage and return the regressions
+    """
+    regressions = []
+    for name, doc in current["documents"].items():
+        base_doc = baseline.get("documents", {}).get(name)
+        if not base_doc:
+            continue
+        metrics = dict(doc["stages_ms"], peak_rss_mb=doc["peak_rss_mb"],
+                       parse_peak_rss_mb=doc.get("parse_peak_rss_mb"))
+        base_metrics = dict(base_doc["stages_ms"], peak_rss_mb=base_doc["peak_rss_mb"],
+                            parse_peak_rss_mb=base_doc.get("parse_peak_rss_mb"))
+        for metric, value in metrics.items():
+            base_value = base_metrics.get(metric)
+            if not base_value or value is None:
+                continue
+            ratio = value / base_value
+            flag = ""
+            if ratio > threshold and (metric.endswith("rss_mb") or base_value >= NOISE_FLOOR_MS):
+                flag = "  REGRESSION"
+                regressions.append((name, metric, base_value, value))
+            print(f"{name:32} {metric:18} {base_value:10.3f} -> {value:10.3f}  x{ratio:.2f}{flag}")
+    return regressions
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Benchmark PDFParser stages")
+    arg_parser.add_argument("--corpus-dir", default=os.path.join(tempfile.gettempdir(), "syllabus_bench_corpus"))
+    arg_parser.add_argument("--rebuild", action="store_true", help="regenerate the synthetic corpus")
+    arg_parser.add_argument("--no-bundled", action="store_true", help="skip the bundled real syllabi")
+    arg_parser.add_argument("--repeat", type=int, default=3, help="runs per document (median is reported)")
+    arg_parser.add_argument("--memory-mode", choices=["low", "full"], default="low",
+                            help="parse with page caches flushed as it goes (low) or kept (full)")
+    arg_parser.add_argument("--output", help="write results JSON here (default: stdout)")
+    arg_parser.add_argument("--baseline", help="compare against a saved results JSON")
+    arg_parser.add_argument("--threshold", type=float, default=1.25,
+                            help="flag stages slower than baseline by more than this factor")
+    args = arg_parser.parse_args()
+
+    corpus = build_corpus(args.corpus_dir, include_bundled=not args.no_bundled, rebuild=args.rebuild)
+    results = run_benchmarks(corpus, args.repeat, args.memory_mode == "low")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    elif not args.baseline:
+        print(json.dumps(results, indent=2))
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) beyond x{args.threshold}", file=sys.stderr)
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -2,13 +2,88 @@
 """
 Create a test PDF for testing the syllabus parser
 """
+import argparse
+import random
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.units import inch
 
-def create_test_pdf():
-    """Create a test syllabus PDF"""
-    filename = "test_syllabus.pdf"
+# Filler line templates for generated pages, roughly in syllabus proportions
+FILLER_LINES = [
+    "Week {week}: Lecture on topic {n} and discussion section",
+    "Homework {n} due: {month:02d}/{day:02d}/2024",
+    "Lab {n} due date: {month:02d}/{day:02d}/2024",
+    "Quiz {n} covers chapters {n} and {n2}",
+    "{weekday} {hour}:00 AM - {hour2}:30 AM Room {room}",
+    "Midterm Exam {n}: {month:02d}/{day:02d}/2024",
+    "Reading: Chapter {n}, pages {page}-{page2}",
+    "Office hours are held after lecture; see the course website for updates.",
+    "Project {n} milestone deadline {month_name} {day}, 2024",
+]
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+MONTHS = ["January", "February", "March", "April", "May", "June"]
+
+def _filler_line(rng: random.Random) -> str:
+    n = rng.randint(1, 12)
+    hour = rng.randint(8, 11)
+    page = rng.randint(1, 400)
+    month = rng.randint(1, 6)
+    return rng.choice(FILLER_LINES).format(
+        week=rng.randint(1, 10), n=n, n2=n + 1, month=month, day=rng.randint(1, 28),
+        weekday=rng.choice(WEEKDAYS), hour=hour, hour2=hour + 1, room=rng.randint(100, 499),
+        page=page, page2=page + rng.randint(5, 30), month_name=MONTHS[month - 1]
+    )
+
+def _draw_schedule_table(c, rng: random.Random, top: float, rows: int) -> float:
+    """
+    Draw a ruled schedule table and return the y position below it
+    """
+    col_x = [1*inch, 2*inch, 3.5*inch, 6*inch, 7.5*inch]
+    row_h = 0.3*inch
+    row_y = [top - i*row_h for i in range(rows + 2)]
+    c.grid(col_x, row_y)
+
+    c.setFont("Helvetica-Bold", 9)
+    for x, header in zip(col_x, ["Week", "Date", "Topic", "Due"]):
+        c.drawString(x + 4, row_y[0] - row_h + 6, header)
+
+    c.setFont("Helvetica", 9)
+    for i in range(rows):
+        y = row_y[i + 1] - row_h + 6
+        month, day = rng.randint(1, 6), rng.randint(1, 28)
+        c.drawString(col_x[0] + 4, y, str(i + 1))
+        c.drawString(col_x[1] + 4, y, f"{rng.choice(WEEKDAYS)} {month}/{day}")
+        c.drawString(col_x[2] + 4, y, f"Topic {rng.randint(1, 30)}")
+        c.drawString(col_x[3] + 4, y, f"Homework {i + 1}" if rng.random() < 0.5 else "")
+    return row_y[-1] - 0.3*inch
+
+def _draw_generated_page(c, rng: random.Random, lines: int, table_density: float):
+    """
+    Fill one page with filler lines and, with probability table_density,
+    a schedule table
+    """
+    width, height = letter
+    y = 10*inch
+    if rng.random() < table_density:
+        y = _draw_schedule_table(c, rng, y, rows=rng.randint(4, 10))
+
+    c.setFont("Helvetica", 10)
+    for _ in range(lines):
+        if y < 1*inch:
+            break
+        c.drawString(1*inch, y, _filler_line(rng))
+        y -= 0.2*inch
+
+def create_test_pdf(filename: str = "test_syllabus.pdf", pages: int = 1,
+                    lines_per_page: int = 40, table_density: float = 0.0,
+                    seed: int = 0):
+    """Create a test syllabus PDF
+
+    The first page is always the fixed sample syllabus. Each of the extra
+    ``pages - 1`` pages gets up to ``lines_per_page`` generated lines and,
+    with probability ``table_density``, a ruled schedule table. Output is
+    deterministic for a given ``seed``.
+    """
     c = canvas.Canvas(filename, pagesize=letter)
     width, height = letter
     
@@ -47,8 +122,24 @@ def create_test_pdf():
     c.drawString(1*inch, 5.3*inch, "Final Exam: 05/10/2024")
     c.drawString(1*inch, 5.1*inch, "Spring Break: 03/15/2024")
     
+    # Generated pages
+    rng = random.Random(seed)
+    for _ in range(pages - 1):
+        c.showPage()
+        _draw_generated_page(c, rng, lines_per_page, table_density)
+
     c.save()
-    print(f"✅ Test PDF created: {filename}")
+    return filename
 
 if __name__ == "__main__":
-    create_test_pdf() 
\ No newline at end of file
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("filename", nargs="?", default="test_syllabus.pdf")
+    arg_parser.add_argument("--pages", type=int, default=1)
+    arg_parser.add_argument("--lines-per-page", type=int, default=40)
+    arg_parser.add_argument("--table-density", type=float, default=0.0)
+    arg_parser.add_argument("--seed", type=int, default=0)
+    args = arg_parser.parse_args()
+
+    filename = create_test_pdf(args.filename, args.pages, args.lines_per_page,
+                               args.table_density, args.seed)
+    print(f"✅ Test PDF created: {filename}")
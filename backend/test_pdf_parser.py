@@ -30,7 +30,8 @@ def test_pdf_parser(pdf_path):
         
         print(f"\n📅 Schedule items found: {len(result['schedule'])}")
         for i, item in enumerate(result["schedule"], 1):
-            print(f"  {i}. {item['day']} {item['time']} - {item['description']}")
+            source_line = result["source_lines"][item["line"]] if item.get("line") is not None else ""
+            print(f"  {i}. {item['day']} {item['time']} - {source_line}")
         
         print(f"\n📆 Important dates found: {len(result['important_dates'])}")
         for i, date_item in enumerate(result["important_dates"], 1):
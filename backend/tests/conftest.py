@@ -0,0 +1,35 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Read by the app modules at import: no warm-up, a single parse worker, and
+# rendered pages kept out of the working directory
+os.environ.setdefault("WARMUP", "0")
+os.environ.setdefault("PARSE_POOL_WORKERS", "1")
+os.environ.setdefault("RENDER_CACHE_DIR", tempfile.mkdtemp(prefix="test_render_cache_"))
+
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def make_pdf():
+    """
+    One-page PDF showing the given lines; distinct lines give distinct
+    files, so tests do not share parse cache entries
+    """
+    from app.services.warmup import _minimal_pdf
+
+    def make(*lines: str) -> bytes:
+        return _minimal_pdf(list(lines))
+    return make
@@ -0,0 +1,109 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from app.services.calendar_export import ICSWriter, SessionExport, _ics_line
+from app.services.session_store import session_store
+
+SEMESTER_START = "2025-01-06"
+
+
+def _schedule_ics(lines, items):
+    record = {
+        "parsed_data": {"course_info": {"course_code": "STAT 120A"}, "schedule": items, "source_lines": lines},
+        "semester_start_date": SEMESTER_START
+    }
+    return ICSWriter("test").session(SessionExport("s1", record, ["schedule"]))
+
+
+def test_weekly_meeting_repeats():
+    ics = _schedule_ics(["Lecture Monday 2:00 PM CHEM 1179"],
+                        [{"day": "Monday", "time": "2:00 PM", "location": "CHEM 1179", "line": 0}])
+    assert "DTSTART:20250106T140000\r\n" in ics
+    assert "RRULE:FREQ=WEEKLY;COUNT=10\r\n" in ics
+
+
+def test_dated_schedule_line_is_a_single_event():
+    ics = _schedule_ics(["The final exam will take place on Saturday, March 15th, 12-3PM"],
+                        [{"day": "Saturday", "time": "3PM", "location": "March 15", "line": 0}])
+    assert "RRULE" not in ics
+    assert "LOCATION" not in ics
+    assert "DTSTART;VALUE=DATE:20250315\r\n" in ics
+
+
+def test_relative_day_is_not_a_weekly_event():
+    ics = _schedule_ics(["The revision is due the following Sunday at 11:59pm"],
+                        [{"day": "Sunday", "time": "11:59pm", "location": "", "line": 0}])
+    assert ics == ""
+
+
+def _unfold(ics: str) -> list:
+    return ics.replace("\r\n ", "").split("\r\n")
+
+
+@pytest.mark.parametrize("value", ["short", "x" * 74, "x" * 200, "é" * 100, "日本語の説明" * 20])
+def test_ics_lines_fold_at_75_octets(value):
+    line = _ics_line("DESCRIPTION", value)
+    assert line.endswith("\r\n")
+    physical = line[:-2].split("\r\n")
+    assert all(len(part.encode("utf-8")) <= 75 for part in physical)
+    assert all(part.startswith(" ") for part in physical[1:])
+    assert _unfold(line)[0] == f"DESCRIPTION:{value}"
+
+
+LONG_LINE = "Assignment 1: write a report on the history of computing, with citations; due 01/15/2025"
+
+
+@pytest.fixture
+def session_id():
+    session_store.put("export-test", {
+        "parsed_data": {
+            "course_info": {"course_code": "CS 64", "course_name": "Computer Organization"},
+            "assignments": [{"title": "Assignment 1", "due_date": "01/15/2025", "due_date_iso": "2025-01-15", "line": 0},
+                            {"title": "Essay", "due_date": "", "due_date_iso": None, "line": 1}],
+            "schedule": [{"day": "Tuesday", "time": "10:30 AM", "location": "Room 101", "line": 2}],
+            "important_dates": [{"title": "Final exam", "date": "March 18", "date_iso": "2025-03-18", "line": 3}],
+            "source_lines": [LONG_LINE, "Essay due at the end of term", "Lectures Tuesday 10:30 AM Room 101",
+                             "Final exam: March 18"]
+        },
+        "semester_start_date": SEMESTER_START
+    })
+    yield "export-test"
+    session_store.delete("export-test")
+
+
+def test_ics_export_events(client, session_id):
+    response = client.get(f"/api/export/{session_id}", params={"schedule_weeks": 12})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/calendar")
+    assert 'filename="CS_64.ics"' in response.headers["content-disposition"]
+
+    ics = response.text
+    assert ics.startswith("BEGIN:VCALENDAR\r\n") and ics.endswith("END:VCALENDAR\r\n")
+    assert all(len(line.encode("utf-8")) <= 75 for line in ics.split("\r\n"))
+
+    lines = _unfold(ics)
+    # The undated essay cannot be placed on a calendar
+    assert lines.count("BEGIN:VEVENT") == 3
+    assert "SUMMARY:CS 64: Assignment 1 due" in lines
+    assert "DTSTART;VALUE=DATE:20250115" in lines
+    assert "DESCRIPTION:" + LONG_LINE.replace(",", "\\,").replace(";", "\\;") in lines
+    assert "DTSTART:20250107T103000" in lines
+    assert "RRULE:FREQ=WEEKLY;COUNT=12" in lines
+    assert "LOCATION:Room 101" in lines
+    assert "SUMMARY:CS 64: Final exam" in lines
+
+
+def test_ics_export_sections(client, session_id):
+    response = client.get(f"/api/export/{session_id}", params={"sections": "schedule"})
+    assert _unfold(response.text).count("BEGIN:VEVENT") == 1
+    assert client.get(f"/api/export/{session_id}", params={"sections": "grades"}).status_code == 400
+
+
+def test_bulk_export_reports_missing_sessions(client, session_id):
+    response = client.post("/api/export", json={"session_ids": [session_id, "missing"], "format": "ics"})
+    assert response.status_code == 404
+    assert response.json()["detail"]["session_ids"] == ["missing"]
@@ -0,0 +1,29 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.date_resolver import find_date_token, resolve_date
+
+SEMESTER_START = "2025-01-06"
+
+
+def test_lowercase_may_after_number_is_not_a_date():
+    assert find_date_token("Quiz 2 may be dropped") == ""
+    assert find_date_token("the lowest 3 mar your average") == ""
+
+
+def test_capitalized_or_ordinal_may_is_a_date():
+    assert resolve_date(find_date_token("Quiz 2 May"), SEMESTER_START) == "2025-05-02"
+    assert resolve_date(find_date_token("due the 2nd may"), SEMESTER_START) == "2025-05-02"
+    assert resolve_date(find_date_token("12 Mar 2025"), SEMESTER_START) == "2025-03-12"
+
+
+def test_fraction_is_not_a_date():
+    assert find_date_token("Homework is 1/3 of the grade") == ""
+    assert find_date_token("Labs count 1/4%") == ""
+
+
+def test_slash_dates_still_resolve():
+    assert resolve_date(find_date_token("due 1/3"), SEMESTER_START) == "2025-01-03"
+    assert resolve_date(find_date_token("Assignment 1 due: 01/15/2024"), SEMESTER_START) == "2024-01-15"
@@ -0,0 +1,22 @@
+import asyncio
+import os
+import sys
+
+import orjson
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.api.routes.upload import _job_events
+
+
+def test_expired_session_ends_the_stream_with_failed():
+    async def collect():
+        return [chunk async for chunk in _job_events("no-such-job", None)]
+
+    chunks = asyncio.run(collect())
+    assert len(chunks) == 1
+    event, data = chunks[0].decode().strip().split("\n")
+    assert event == "event: failed"
+    payload = orjson.loads(data[len("data: "):])
+    assert payload["status"] == "failed"
+    assert payload["error"] == "Session expired"
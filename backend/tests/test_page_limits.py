@@ -0,0 +1,31 @@
+import os
+import sys
+
+import pytest
+from fastapi import HTTPException
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.api.routes.upload import _page_limits
+from app.services.pdf_parser import EARLY_STOP_PATIENCE
+
+
+def test_no_limits():
+    assert _page_limits(None, None, None, False, None) is None
+
+
+def test_adaptive_uses_default_or_given_patience():
+    assert _page_limits(None, None, None, True, None) == {"early_stop_patience": EARLY_STOP_PATIENCE}
+    assert _page_limits(2, 5, None, True, 3) == {"first_page": 2, "last_page": 5, "early_stop_patience": 3}
+
+
+@pytest.mark.parametrize("args", [
+    (None, None, None, False, 3),  # patience without adaptive
+    (None, None, None, True, 0),
+    (0, None, None, False, None),
+    (5, 2, None, False, None),
+])
+def test_invalid_limits_are_rejected(args):
+    with pytest.raises(HTTPException) as error:
+        _page_limits(*args)
+    assert error.value.status_code == 400
@@ -0,0 +1,31 @@
+import asyncio
+import os
+import sys
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.parse_pool import ParsePool
+
+
+def _crash():
+    os._exit(1)
+
+
+def test_pool_recovers_after_a_worker_dies():
+    async def run():
+        pool = ParsePool(max_workers=1, max_queue=0)
+        try:
+            with pytest.raises(BrokenProcessPool):
+                await pool.submit(_crash)
+            # Let the done callback run on the loop
+            await asyncio.sleep(0)
+            assert await pool.submit(os.getpid) != os.getpid()
+            assert pool.stats()["failed"] == 1
+            assert pool.stats()["completed"] == 1
+        finally:
+            pool.shutdown()
+
+    asyncio.run(run())
@@ -0,0 +1,72 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.render_cache import render_cache
+
+KEY = "ab" * 32
+IMAGE = bytes(range(256)) * 4
+
+
+@pytest.fixture
+def page_url():
+    # Stands in for a page the renderer wrote; poppler is not needed
+    render_cache.put(f"{KEY}.png", IMAGE)
+    return f"/api/rendered/{KEY}.png"
+
+
+def test_full_page_is_cacheable(client, page_url):
+    response = client.get(page_url)
+    assert response.status_code == 200
+    assert response.content == IMAGE
+    assert response.headers["content-type"] == "image/png"
+    assert response.headers["etag"] == f'"{KEY}"'
+    assert "immutable" in response.headers["cache-control"]
+    assert response.headers["accept-ranges"] == "bytes"
+
+
+@pytest.mark.parametrize("if_none_match", [f'"{KEY}"', f'W/"{KEY}"', f'"other", "{KEY}"', "*"])
+def test_matching_etag_is_not_modified(client, page_url, if_none_match):
+    response = client.get(page_url, headers={"If-None-Match": if_none_match})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == f'"{KEY}"'
+
+
+def test_other_etag_gets_the_page(client, page_url):
+    response = client.get(page_url, headers={"If-None-Match": '"other"'})
+    assert response.status_code == 200
+    assert response.content == IMAGE
+
+
+@pytest.mark.parametrize("range_header, start, end", [
+    ("bytes=10-19", 10, 19),
+    ("bytes=1000-", 1000, 1023),
+    ("bytes=-4", 1020, 1023),
+    ("bytes=1020-5000", 1020, 1023),
+])
+def test_byte_range(client, page_url, range_header, start, end):
+    response = client.get(page_url, headers={"Range": range_header})
+    assert response.status_code == 206
+    assert response.content == IMAGE[start:end + 1]
+    assert response.headers["content-range"] == f"bytes {start}-{end}/{len(IMAGE)}"
+
+
+def test_unsatisfiable_range(client, page_url):
+    response = client.get(page_url, headers={"Range": "bytes=2000-"})
+    assert response.status_code == 416
+    assert response.headers["content-range"] == f"bytes */{len(IMAGE)}"
+
+
+def test_range_ignored_when_if_range_does_not_match(client, page_url):
+    response = client.get(page_url, headers={"Range": "bytes=0-9", "If-Range": '"other"'})
+    assert response.status_code == 200
+    assert response.content == IMAGE
+
+
+@pytest.mark.parametrize("name", ["cd" * 32 + ".png", "not-a-cache-name.png", KEY + ".gif"])
+def test_unknown_page_is_not_found(client, page_url, name):
+    assert client.get(f"/api/rendered/{name}").status_code == 404
@@ -0,0 +1,44 @@
+import hashlib
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.session_store import SQLiteSessionStore
+
+PDF = b"%PDF-1.4 test"
+PDF_SHA256 = hashlib.sha256(PDF).hexdigest()
+
+
+def _upload(tmp_path) -> str:
+    path = tmp_path / "upload.pdf"
+    path.write_bytes(PDF)
+    return str(path)
+
+
+def test_put_moves_upload_into_blob_storage(tmp_path):
+    store = SQLiteSessionStore(str(tmp_path / "sessions"))
+    upload = _upload(tmp_path)
+    store.put("s1", {"pdf_sha256": PDF_SHA256, "raw_pdf_path": upload})
+    assert not os.path.exists(upload)
+    assert store.get("s1")["raw_pdf_path"] == store._blob_path(PDF_SHA256)
+    assert store.stats()["pdf_blobs"] == 1
+    store.close()
+
+
+def test_failed_put_leaves_no_orphaned_blob(tmp_path, monkeypatch):
+    store = SQLiteSessionStore(str(tmp_path / "sessions"))
+    upload = _upload(tmp_path)
+
+    def fail(conn, keep):
+        raise RuntimeError("eviction failed")
+
+    monkeypatch.setattr(store, "_evict", fail)
+    with pytest.raises(RuntimeError):
+        store.put("s1", {"pdf_sha256": PDF_SHA256, "raw_pdf_path": upload})
+    assert os.path.exists(upload)
+    assert not os.path.exists(store._blob_path(PDF_SHA256))
+    assert store.get("s1") is None
+    store.close()
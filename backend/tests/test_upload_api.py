@@ -0,0 +1,126 @@
+import asyncio
+import io
+import os
+import sys
+import zipfile
+
+import orjson
+from fastapi import FastAPI, File, UploadFile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.api import uploads
+from app.api.uploads import UploadLimitMiddleware
+from app.services.parse_pool import parse_pool
+
+BOUNDARY = "testboundary"
+
+
+def _multipart_chunks(filename: str, size: int, chunk_size: int = 16 * 1024):
+    yield (f"--{BOUNDARY}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"{filename}\"\r\n"
+           "Content-Type: application/pdf\r\n\r\n%PDF-1.4\n").encode()
+    for _ in range(size // chunk_size):
+        yield b"0" * chunk_size
+    yield f"\r\n--{BOUNDARY}--\r\n".encode()
+
+
+def test_streamed_upload_over_limit_is_rejected(client, monkeypatch):
+    monkeypatch.setattr(uploads, "MAX_UPLOAD_BYTES", 1024)
+    # A generator body is sent chunked, without Content-Length
+    response = client.post("/api/upload-syllabus", content=_multipart_chunks("big.pdf", 256 * 1024),
+                           headers={"Content-Type": f"multipart/form-data; boundary={BOUNDARY}"})
+    assert response.status_code == 413
+    assert response.json()["detail"] == "File size too large. Maximum 1024 bytes allowed"
+
+
+def test_declared_length_over_limit_is_rejected_before_reading(client, monkeypatch):
+    monkeypatch.setattr(uploads, "MAX_UPLOAD_BYTES", 1024)
+    response = client.post("/api/upload-syllabus", content=b"".join(_multipart_chunks("big.pdf", 256 * 1024)),
+                           headers={"Content-Type": f"multipart/form-data; boundary={BOUNDARY}"})
+    assert response.status_code == 413
+    assert response.headers["connection"] == "close"
+
+
+def test_middleware_stops_reading_once_over_limit(monkeypatch):
+    monkeypatch.setattr(uploads, "MAX_UPLOAD_BYTES", 1024)
+    inner = FastAPI()
+
+    @inner.post("/upload")
+    async def upload(file: UploadFile = File(...)):
+        return {"size": len(await file.read())}
+
+    chunks = list(_multipart_chunks("big.pdf", 1024 * 1024))
+    read = 0
+    sent = []
+
+    async def receive():
+        nonlocal read
+        read += 1
+        if read <= len(chunks):
+            return {"type": "http.request", "body": chunks[read - 1], "more_body": read < len(chunks)}
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": "POST", "path": "/upload", "raw_path": b"/upload",
+             "query_string": b"", "root_path": "", "scheme": "http", "server": ("test", 80),
+             "http_version": "1.1",
+             "headers": [(b"content-type", f"multipart/form-data; boundary={BOUNDARY}".encode())]}
+    asyncio.run(UploadLimitMiddleware(inner)(scope, receive, send))
+
+    assert sent[0]["status"] == 413
+    # Limit plus multipart overhead is 65 KB; the 1 MB body is not read
+    assert read < len(chunks) // 2
+
+
+def test_full_pool_returns_503_with_retry_after(client, monkeypatch, make_pdf):
+    monkeypatch.setattr(parse_pool, "_in_flight", parse_pool.max_workers + parse_pool.max_queue)
+    pdf = make_pdf("Course: Busy Pool 101")
+    response = client.post("/api/upload-syllabus", files={"file": ("busy.pdf", pdf, "application/pdf")})
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == str(parse_pool.retry_after)
+    assert parse_pool.stats()["rejected"] >= 1
+
+
+def _zip(members: dict) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+def test_batch_parses_duplicates_once_and_reports_zip_members(client, make_pdf):
+    first = make_pdf("Course: Batch 101", "Assignment 1 due: 01/15/2024")
+    second = make_pdf("Course: Batch 202")
+    archive = _zip({"inner/copy.pdf": second, "notes.pdf": b"not a pdf", "readme.txt": b"ignored"})
+    response = client.post("/api/upload-syllabi", files=[
+        ("files", ("a.pdf", first, "application/pdf")),
+        ("files", ("b.pdf", first, "application/pdf")),
+        ("files", ("c.pdf", second, "application/pdf")),
+        ("files", ("bundle.zip", archive, "application/zip")),
+    ])
+    assert response.status_code == 200
+    lines = [orjson.loads(line) for line in response.text.splitlines()]
+
+    assert lines[0] == {"total_files": 5, "unique_files": 2}
+    assert lines[-1] == {"done": True, "succeeded": 4, "failed": 1}
+    files = {line["index"]: line for line in lines[1:-1]}
+    assert sorted(files) == [0, 1, 2, 3, 4]
+
+    # Zip members are reported by their base name, after the uploaded files
+    assert files[3]["filename"] == "copy.pdf"
+    assert files[4] == {"index": 4, "filename": "notes.pdf", "success": False,
+                        "error": "Only PDF files are allowed"}
+
+    assert files[0]["duplicate_of"] is None
+    assert files[1]["duplicate_of"] == 0
+    assert files[2]["duplicate_of"] is None
+    assert files[3]["duplicate_of"] == 2
+    assert files[0]["sha256"] == files[1]["sha256"]
+    assert files[0]["data"] == files[1]["data"]
+    # Every file still gets its own session
+    session_ids = {files[index]["session_id"] for index in range(4)}
+    assert len(session_ids) == 4
+    assert client.get(f"/api/session/{files[3]['session_id']}").status_code == 200